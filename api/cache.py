@@ -0,0 +1,138 @@
+# --- Cache disque des réponses LLM (adressé par contenu) ---
+from __future__ import annotations
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_TTL = 7 * 24 * 3600          # 7 jours
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024  # 64 Mo
+
+
+class ResponseCache:
+    """
+    Cache clé -> texte sur disque : <root>/<k[:2]>/<k>.json.
+    - TTL sur la date de création de l'entrée
+    - éviction LRU (mtime rafraîchi à chaque hit) quand la taille dépasse max_bytes
+    - compteurs hits/misses ; `enabled=False` (ou PYRETO_NO_CACHE=1) = bypass
+    """
+
+    def __init__(self, root: Path, *, ttl: float | None = DEFAULT_TTL,
+                 max_bytes: int = DEFAULT_MAX_BYTES, enabled: bool = True) -> None:
+        self.root = root
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.enabled = enabled and not os.getenv("PYRETO_NO_CACHE")
+        self.hits = 0
+        self.misses = 0
+        self._size: int | None = None  # calculé paresseusement au premier put
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(**parts) -> str:
+        raw = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> str | None:
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        if self.ttl is not None and time.time() - entry.get("created", 0) > self.ttl:
+            size = self._file_size(path)
+            self._remove(path)
+            with self._lock:
+                self.misses += 1
+                if self._size is not None:
+                    self._size -= size
+            return None
+        try:
+            os.utime(path)  # LRU : dernier accès = mtime
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return entry.get("text")
+
+    def put(self, key: str, text: str, **meta) -> None:
+        if not self.enabled:
+            return
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps({"created": time.time(), "text": text, **meta}, ensure_ascii=False)
+        tmp = None
+        try:
+            with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=path.parent,
+                                             suffix=".tmp", delete=False) as tf:
+                tmp = tf.name
+                tf.write(data)
+            with self._lock:
+                old = self._file_size(path)  # réécriture d'une clé : l'ancienne entrée ne compte plus
+                os.replace(tmp, path)
+                tmp = None
+                if self._size is None:
+                    # une entrée supprimée entre-temps (éviction, expiration ailleurs) compte pour 0
+                    self._size = sum(self._file_size(p) for p in self._entries())
+                else:
+                    self._size += len(data.encode("utf-8")) - old
+                if self._size > self.max_bytes:
+                    self._evict()
+        finally:
+            if tmp is not None:  # écriture ou remplacement échoué : pas de .tmp orphelin
+                self._remove(Path(tmp))
+
+    def _entries(self) -> list[Path]:
+        return list(self.root.glob("*/*.json")) if self.root.exists() else []
+
+    def _evict(self) -> None:
+        """Supprime les entrées les moins récemment utilisées jusqu'à repasser sous ~90 % du quota."""
+        stats = []
+        for p in self._entries():
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            stats.append((st.st_mtime, st.st_size, p))
+        stats.sort()
+        total = sum(size for _, size, _ in stats)
+        target = int(self.max_bytes * 0.9)
+        for _, size, p in stats:
+            if total <= target:
+                break
+            self._remove(p)
+            total -= size
+        self._size = total
+
+    @staticmethod
+    def _file_size(path: Path) -> int:
+        try:
+            return path.stat().st_size
+        except OSError:
+            return 0
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+    def clear(self) -> None:
+        with self._lock:
+            for p in self._entries():
+                self._remove(p)
+            self._size = 0
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "enabled": self.enabled}
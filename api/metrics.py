@@ -0,0 +1,90 @@
+# --- Métriques des appels LLM (latence, tokens, cache) ---
+from __future__ import annotations
+import json
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+# Étiquettes de l'appel en cours (topic, task, size…), posées par les services
+_tags: ContextVar[dict] = ContextVar("pyreto_llm_tags", default={})
+
+
+@contextmanager
+def tagged(**tags):
+    """Associe des étiquettes aux appels LLM faits dans ce bloc (même thread / contexte)."""
+    token = _tags.set({**_tags.get(), **tags})
+    try:
+        yield
+    finally:
+        _tags.reset(token)
+
+
+def current_tags() -> dict:
+    return dict(_tags.get())
+
+
+# Modèles réellement servis (après routage et repli) dans un bloc recording_models()
+_models: ContextVar[list | None] = ContextVar("pyreto_llm_models", default=None)
+
+
+@contextmanager
+def recording_models():
+    """
+    Liste des modèles ayant répondu aux appels LLM du bloc, y compris depuis des threads
+    lancés avec une copie du contexte (même liste partagée).
+    """
+    used: list[str] = []
+    token = _models.set(used)
+    try:
+        yield used
+    finally:
+        _models.reset(token)
+
+
+def note_model(model: str) -> None:
+    used = _models.get()
+    if used is not None:
+        used.append(model)
+
+
+def usage_of(resp) -> dict:
+    """Compteurs de tokens de resp.usage (Responses API), 0 si absents."""
+    usage = getattr(resp, "usage", None)
+    in_details = getattr(usage, "input_tokens_details", None)
+    out_details = getattr(usage, "output_tokens_details", None)
+    return {
+        "input_tokens": getattr(usage, "input_tokens", 0) or 0,
+        "output_tokens": getattr(usage, "output_tokens", 0) or 0,
+        "cached_tokens": getattr(in_details, "cached_tokens", 0) or 0,
+        "reasoning_tokens": getattr(out_details, "reasoning_tokens", 0) or 0,
+    }
+
+
+class MetricsSink:
+    """Journal JSONL append-only, une ligne par appel LLM (thread-safe)."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    def record(self, **fields) -> None:
+        row = {"ts": round(time.time(), 3), **current_tags(), **fields}
+        line = json.dumps(row, ensure_ascii=False) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(line)
+
+    def read(self):
+        try:
+            f = self.path.open("r", encoding="utf-8")
+        except OSError:
+            return
+        with f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
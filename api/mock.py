@@ -0,0 +1,341 @@
+# --- LLM factice (hors réseau) : en processus ou serveur HTTP « Responses API » ---
+# En processus : MockResponder = OpenAIResponder complet (cache, métriques, routage, repli)
+# branché sur un SDK factice. Serveur : python -m api.mock --port 8765, puis
+# OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=mock pour le vrai SDK.
+from __future__ import annotations
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Iterator
+
+from api.openai import OpenAIConfig, OpenAIResponder
+
+_CHARS_PER_TOKEN = 4
+_TICK = 0.02  # pas d'émission minimal en streaming (s)
+_WORDS = (
+    "cache latence débit verrou index journal requête réponse fichier dossier thread pool "
+    "processus mémoire disque réseau paquet socket tampon flux lot tâche file priorité quota "
+    "erreur reprise délai budget métrique percentile trace profil sonde alerte seuil "
+    "client serveur proxy route modèle schéma clé valeur table colonne ligne page bloc "
+    "commande script shell variable option drapeau argument sortie entrée format encodage"
+).split()
+_TYPES = ("GÉNÉRATION", "DIAGNOSTIC", "TRANSFORMATION", "COMPARAISON", "STRESS TEST")
+_RANGE_RE = re.compile(r"\*\*EX(\d{2})\.\.EX(\d{2})\*\*")
+_TOPIC_RE = re.compile(r'Sujet : "([^"]*)"')
+
+
+@dataclass
+class MockConfig:
+    latency: float = 0.2           # s avant le premier token
+    jitter: float = 0.0            # variation aléatoire ± (fraction de latency)
+    tokens_per_sec: float = 0.0    # débit de sortie ; 0 = réponse instantanée
+    error_rate: float = 0.0        # probabilité d'une panne par appel
+    errors: tuple = ("rate_limit", "server", "timeout")
+    retry_after: float | None = None  # en-tête Retry-After des 429
+    hang: float = 60.0             # durée d'un « timeout » côté serveur HTTP (s)
+    canned: dict = field(default_factory=dict)  # sous-chaîne du prompt -> réponse imposée
+    seed: int | None = None
+
+
+class MockLLM:
+    """Cœur partagé : texte de réponse, usage, calendrier d'émission et pannes injectées."""
+
+    def __init__(self, cfg: MockConfig) -> None:
+        self.cfg = cfg
+        self.calls = 0
+        self._rng = random.Random(cfg.seed)
+        self._lock = threading.Lock()
+
+    def _random(self) -> random.Random:
+        with self._lock:
+            self.calls += 1
+            return random.Random(self._rng.random())
+
+    def fault(self, rng: random.Random) -> str | None:
+        if self.cfg.error_rate and rng.random() < self.cfg.error_rate:
+            return rng.choice(self.cfg.errors)
+        return None
+
+    def first_token_delay(self, rng: random.Random) -> float:
+        spread = self.cfg.latency * self.cfg.jitter
+        return max(0.0, self.cfg.latency + rng.uniform(-spread, spread))
+
+    def reply(self, kwargs: dict, rng: random.Random) -> str:
+        prompt = kwargs.get("input") or json.dumps(kwargs.get("prompt") or {})
+        for needle, text in self.cfg.canned.items():
+            if needle in prompt:
+                return text
+        topic = (_TOPIC_RE.search(prompt) or [None, "sujet"])[1]
+        rng_range = _RANGE_RE.search(prompt)
+        if rng_range:
+            first, last = int(rng_range.group(1)), int(rng_range.group(2))
+            structured = "json_schema" in json.dumps(kwargs.get("text") or {})
+            exercises = [_exercise(topic, i, rng) for i in range(first, last + 1)]
+            if structured:
+                return json.dumps({"exercises": exercises}, ensure_ascii=False)
+            return "\n\n".join(_exercise_markdown(ex) for ex in exercises)
+        if "CHEAT SHEET" in prompt.upper():
+            return _cheatsheet(topic, rng)
+        return "OK"
+
+    @staticmethod
+    def usage(kwargs: dict, text: str) -> dict:
+        prompt = kwargs.get("input") or ""
+        return {
+            "input_tokens": max(1, len(prompt) // _CHARS_PER_TOKEN),
+            "input_tokens_details": {"cached_tokens": 0},
+            "output_tokens": max(1, len(text) // _CHARS_PER_TOKEN),
+            "output_tokens_details": {"reasoning_tokens": 0},
+        }
+
+    def chunks(self, text: str) -> Iterator[tuple[float, str]]:
+        """(attente avant le morceau, morceau) au débit configuré, par pas d'au moins _TICK."""
+        tps = self.cfg.tokens_per_sec
+        tokens = max(1, round(tps * _TICK)) if tps else 16
+        size = tokens * _CHARS_PER_TOKEN
+        delay = tokens / tps if tps else 0.0
+        for i in range(0, len(text), size):
+            yield delay, text[i:i + size]
+
+    def generation_time(self, text: str) -> float:
+        tps = self.cfg.tokens_per_sec
+        return len(text) / _CHARS_PER_TOKEN / tps if tps else 0.0
+
+
+def _sentence(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(n)).capitalize() + "."
+
+
+def _exercise(topic: str, i: int, rng: random.Random) -> dict:
+    return {
+        "id": f"EX{i:02d}",
+        "title": f"{topic} — {_sentence(rng, 4)[:-1]}",
+        "objective": _sentence(rng, 12),
+        "context": " ".join(_sentence(rng, 10) for _ in range(3)),
+        "type": rng.choice(_TYPES),
+        "resources": _sentence(rng, 6),
+        "input": "\n".join(_sentence(rng, 8) for _ in range(4)),
+        "deliverables": [_sentence(rng, 6)],
+        "criteria": [_sentence(rng, 7), _sentence(rng, 7)],
+        "pitfalls": [_sentence(rng, 6), _sentence(rng, 6)],
+    }
+
+
+def _exercise_markdown(ex: dict) -> str:
+    from utils.helpers import render_exercise
+    return render_exercise(ex, int(ex["id"][2:]))
+
+
+def _cheatsheet(topic: str, rng: random.Random) -> str:
+    rule = "# " + "=" * 46
+    parts = [rule, f"# {topic.upper()} 80/20 CHEAT SHEET", rule, ""]
+    for k in range(8):
+        parts += [f"## 🔹 {_sentence(rng, 3)[:-1]}", _sentence(rng, 14),
+                  "```bash", f"{rng.choice(_WORDS)} --{rng.choice(_WORDS)} {k}", "```", "---", ""]
+    parts += ["## ⚡ 5 Commandes Pareto ultra-utiles ⚡"]
+    parts += [f"{k}. `{rng.choice(_WORDS)} {rng.choice(_WORDS)}`" for k in range(1, 6)]
+    return "\n".join(parts)
+
+
+# ---------- SDK factice (en processus) ----------
+
+def _sdk_error(kind: str, retry_after: float | None = None) -> Exception:
+    """Exception du SDK openai de la classe attendue par api.openai (_is_timeout)."""
+    import openai
+    cls = {"timeout": openai.APITimeoutError, "rate_limit": openai.RateLimitError,
+           "server": openai.InternalServerError}[kind]
+    exc = cls.__new__(cls)  # sans requête httpx réelle
+    Exception.__init__(exc, f"mock {kind}")
+    exc.message, exc.request, exc.body = f"mock {kind}", None, None
+    if kind != "timeout":
+        exc.status_code = 429 if kind == "rate_limit" else 500
+        headers = {"retry-after": str(retry_after)} if retry_after is not None else {}
+        exc.response = SimpleNamespace(status_code=exc.status_code, headers=headers)
+    return exc
+
+
+def _ns(obj):
+    if isinstance(obj, dict):
+        return SimpleNamespace(**{k: _ns(v) for k, v in obj.items()})
+    return obj
+
+
+class _Responses:
+    def __init__(self, llm: MockLLM, timeout: float | None) -> None:
+        self.llm, self.timeout = llm, timeout
+
+    def create(self, *, stream: bool = False, **kwargs):
+        rng = self.llm._random()
+        fault = self.llm.fault(rng)
+        delay = self.llm.first_token_delay(rng)
+        text = self.llm.reply(kwargs, rng)
+        total = delay if stream else delay + self.llm.generation_time(text)
+        if fault == "timeout" or (self.timeout is not None and total > self.timeout):
+            time.sleep(min(total, self.timeout) if self.timeout is not None else 0)
+            raise _sdk_error("timeout")
+        if fault:
+            raise _sdk_error(fault, self.llm.cfg.retry_after)
+        usage = _ns(self.llm.usage(kwargs, text))
+        if stream:
+            return self._events(delay, text, usage)
+        time.sleep(total)
+        return SimpleNamespace(output_text=text, usage=usage, model=kwargs.get("model"))
+
+    def _events(self, delay: float, text: str, usage) -> Iterator[SimpleNamespace]:
+        time.sleep(delay)
+        for wait, piece in self.llm.chunks(text):
+            if wait:
+                time.sleep(wait)
+            yield SimpleNamespace(type="response.output_text.delta", delta=piece)
+        yield SimpleNamespace(type="response.completed",
+                              response=SimpleNamespace(output_text=text, usage=usage))
+
+
+class MockOpenAI:
+    """Sous-ensemble du client openai.OpenAI utilisé par OpenAIResponder."""
+
+    def __init__(self, llm: MockLLM, timeout: float | None = None) -> None:
+        self._llm = llm
+        self.responses = _Responses(llm, timeout)
+        self.models = SimpleNamespace(retrieve=lambda model: SimpleNamespace(id=model))
+
+    def with_options(self, *, timeout: float | None = None, **_options) -> "MockOpenAI":
+        return MockOpenAI(self._llm, timeout)
+
+
+class MockResponder(OpenAIResponder):
+    """Même interface qu'OpenAIResponder (generate/stream/use_cache/schema), sans clé ni réseau."""
+
+    def __init__(self, mock: MockConfig | None = None, cfg: OpenAIConfig | None = None, *,
+                 cache=None, metrics=None, router=None, limiter=None) -> None:
+        self.llm = MockLLM(mock or MockConfig())
+        super().__init__(cfg or OpenAIConfig(), cache=cache, metrics=metrics, router=router, limiter=limiter)
+
+    def _credentials(self) -> str:
+        return "mock"
+
+    def _new_client(self):
+        return MockOpenAI(self.llm)
+
+
+# ---------- Serveur HTTP (forme Responses API) ----------
+
+def _response_body(kwargs: dict, text: str, usage: dict) -> dict:
+    return {
+        "id": f"resp_mock_{time.time_ns()}", "object": "response", "created_at": int(time.time()),
+        "status": "completed", "model": kwargs.get("model"),
+        "output": [{
+            "type": "message", "id": "msg_mock", "status": "completed", "role": "assistant",
+            "content": [{"type": "output_text", "text": text, "annotations": []}],
+        }],
+        "usage": {**usage, "total_tokens": usage["input_tokens"] + usage["output_tokens"]},
+    }
+
+
+def make_server(cfg: MockConfig, host: str = "127.0.0.1", port: int = 8765):
+    """ThreadingHTTPServer : POST /v1/responses (JSON ou SSE), GET /v1/models/<id>."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    llm = MockLLM(cfg)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, fmt, *args) -> None:  # silencieux (benchmarks)
+            pass
+
+        def _json(self, status: int, body: dict, headers: dict | None = None) -> None:
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self) -> None:
+            if self.path.startswith("/v1/models/"):
+                model = self.path.rsplit("/", 1)[-1]
+                self._json(200, {"id": model, "object": "model", "created": 0, "owned_by": "mock"})
+            else:
+                self._json(404, {"error": {"message": "not found", "type": "invalid_request_error"}})
+
+        def do_POST(self) -> None:
+            if self.path.rstrip("/") != "/v1/responses":
+                self._json(404, {"error": {"message": "not found", "type": "invalid_request_error"}})
+                return
+            kwargs = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+            rng = llm._random()
+            fault = llm.fault(rng)
+            if fault == "timeout":
+                time.sleep(cfg.hang)
+                self.close_connection = True
+                return
+            if fault:
+                status = 429 if fault == "rate_limit" else 500
+                headers = {"Retry-After": str(cfg.retry_after)} if cfg.retry_after is not None else {}
+                self._json(status, {"error": {"message": f"mock {fault}", "type": fault}}, headers)
+                return
+            delay = llm.first_token_delay(rng)
+            text = llm.reply(kwargs, rng)
+            usage = llm.usage(kwargs, text)
+            if not kwargs.get("stream"):
+                time.sleep(delay + llm.generation_time(text))
+                self._json(200, _response_body(kwargs, text, usage))
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+            time.sleep(delay)
+            seq = 0
+            for wait, piece in llm.chunks(text):
+                if wait:
+                    time.sleep(wait)
+                self._event({"type": "response.output_text.delta", "item_id": "msg_mock", "output_index": 0,
+                             "content_index": 0, "delta": piece, "sequence_number": seq})
+                seq += 1
+            self._event({"type": "response.completed", "response": _response_body(kwargs, text, usage),
+                         "sequence_number": seq})
+
+        def _event(self, event: dict) -> None:
+            self.wfile.write(f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+                             .encode("utf-8"))
+            self.wfile.flush()
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Serveur LLM factice (forme Responses API)")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency", type=float, default=0.2, help="s avant le premier token")
+    ap.add_argument("--jitter", type=float, default=0.0, help="variation ± (fraction de la latence)")
+    ap.add_argument("--tps", type=float, default=0.0, help="tokens/s en sortie (0 = instantané)")
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--retry-after", type=float, default=None)
+    ap.add_argument("--seed", type=int, default=None)
+    args = ap.parse_args()
+    cfg = MockConfig(latency=args.latency, jitter=args.jitter, tokens_per_sec=args.tps,
+                     error_rate=args.error_rate, retry_after=args.retry_after, seed=args.seed)
+    server = make_server(cfg, args.host, args.port)
+    print(f"Mock LLM sur http://{args.host}:{server.server_address[1]}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,8 +1,17 @@
 # --- OpenAI (Responses API) ---
-from openai import OpenAI
+# Le SDK `openai` n'est importé qu'à la création effective du client (démarrage rapide).
 from dataclasses import dataclass
 from enum import Enum
 import os
+import threading
+import time
+from typing import Generator, Iterator
+
+from api.cache import ResponseCache
+from api.metrics import MetricsSink, current_tags, note_model, usage_of
+from api.prompt import PROMPT_VERSIONS, estimate_tokens
+from api.ratelimit import RateLimiter
+from api.singleflight import SingleFlight
 
 
 class ModelOPENAI(Enum):
@@ -20,26 +29,130 @@ class OpenAIConfig:
     instructions: str | None = "Tu es concis, précis, et technique."
 
 
+def _api_key() -> str:
+    # Préfère OPENAI_API_KEY ; fallback sur OPENAI_KEY
+    api_key = os.getenv("OPENAI_API_KEY") or os.getenv("OPENAI_KEY")
+    if not api_key:
+        raise RuntimeError(
+            "La clé API OpenAI est manquante. "
+            "Définis OPENAI_API_KEY (ou OPENAI_KEY) dans l'environnement."
+        )
+    return api_key
+
+
 class OpenAIResponder:
 
-    def __init__(self, cfg: OpenAIConfig) -> None:
-        # Préfère OPENAI_API_KEY ; fallback sur OPENAI_KEY
-        api_key = os.getenv("OPENAI_API_KEY") or os.getenv("OPENAI_KEY")
-        if not api_key:
-            raise RuntimeError(
-                "La clé API OpenAI est manquante. "
-                "Définis OPENAI_API_KEY (ou OPENAI_KEY) dans l'environnement."
-            )
-        # Passe explicitement la clé au client
-        self.client = OpenAI(api_key=api_key)
+    def __init__(self, cfg: OpenAIConfig, *, cache: ResponseCache | None = None,
+                 metrics: MetricsSink | None = None, router=None,
+                 limiter: RateLimiter | None = None) -> None:
+        self._api_key = self._credentials()
+        self._client = None
+        self._client_lock = threading.Lock()
         self.cfg = cfg
+        self.cache = cache
+        self.metrics = metrics
+        self.router = router  # api.routing.ModelRouter : remplace cfg.model si présent
+        self.limiter = limiter  # RPM/TPM partagés par tous les appels de ce client
+        # Cumul des tokens consommés (tous appels confondus)
+        self.usage = {"input_tokens": 0, "output_tokens": 0, "cached_tokens": 0}
+        self._usage_lock = threading.Lock()
+        self._flights = SingleFlight()
 
-    def generate(self, *, input_text: str | None = None) -> str:
+    def _credentials(self) -> str:
+        return _api_key()
+
+    def _new_client(self):
+        from openai import OpenAI
+        # Passe explicitement la clé au client
+        return OpenAI(api_key=self._api_key)
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = self._new_client()
+        return self._client
+
+    def _routes(self) -> list[tuple[str, float | None]]:
         """
-        Utilise soit un prompt réutilisable du dashboard (prompt=id/version/variables),
-        soit un input text classique. Retourne response.output_text.
+        [(modèle, timeout)] à essayer dans l'ordre. Sans routeur : cfg.model seul.
+        Avec routeur : modèle choisi pour la tâche courante puis tiers plus rapides ;
+        chaque essai sauf le dernier est borné par le budget de latence de la tâche.
+        """
+        if self.router is None:
+            return [(getattr(self.cfg.model, "value", self.cfg.model), None)]
+        tags = current_tags()
+        first = self.router.pick(tags.get("task"), tags.get("size"))
+        models = [first, *self.router.fallbacks(first)]
+        budget = self.router.budget(tags.get("task"))
+        return [(m.value, budget if i + 1 < len(models) else None) for i, m in enumerate(models)]
+
+    def _observe_route(self, model: str, start: float, *, timed_out: bool = False) -> None:
+        if self.router is not None:
+            latency = float("inf") if timed_out else time.perf_counter() - start
+            self.router.observe(current_tags().get("task"), model, latency)
+
+    @staticmethod
+    def _request_key(kwargs: dict) -> str:
+        """Requête normalisée ; la version du gabarit en fait partie (un prompt modifié invalide le cache)."""
+        task = current_tags().get("task")
+        return ResponseCache.make_key(template=(task, PROMPT_VERSIONS.get(task)), **kwargs)
+
+    def _lookup(self, kwargs: dict, use_cache: bool) -> tuple[str | None, str | None, str]:
+        """(clé, texte en cache, statut hit|miss|off)."""
+        if not (use_cache and self.cache and self.cache.enabled):
+            return None, None, "off"
+        key = self._request_key(kwargs)
+        cached = self.cache.get(key)
+        return key, cached, "hit" if cached is not None else "miss"
+
+    def _estimate(self, kwargs: dict) -> int:
+        return estimate_tokens(kwargs.get("instructions"), kwargs.get("input"))
+
+    def _throttle(self, kwargs: dict) -> tuple[int, float | None]:
+        """Attend le feu vert du limiteur (voie = étiquette lane, interactive par défaut) ; (estimation, attente)."""
+        if self.limiter is None:
+            return 0, None
+        estimate = self._estimate(kwargs)
+        return estimate, self.limiter.acquire(estimate, current_tags().get("lane", "interactive"))
+
+    def _settle(self, estimate: int, resp) -> None:
+        if self.limiter is not None:
+            usage = usage_of(resp)
+            self.limiter.settle(estimate, usage["input_tokens"] + usage["output_tokens"] or None)
+
+    def _refund(self, estimate: int) -> None:
+        """Appel échoué sans réponse (timeout…) : les tokens estimés sont rendus au limiteur."""
+        if self.limiter is not None:
+            self.limiter.settle(estimate, 0)
+
+    def _store(self, key: str | None, kwargs: dict, text: str) -> None:
+        if key and text:
+            self.cache.put(key, text, model=kwargs["model"])
+
+    def _observe(self, kwargs: dict, start: float, *, resp=None, cache: str = "off",
+                 ttft: float | None = None, stream: bool = False, error: str | None = None,
+                 queued: float | None = None) -> None:
+        """
+        Cumule les tokens et écrit une ligne de métriques (si un sink est configuré).
+        queued : attente dans le limiteur de débit (s), hors latence de l'appel.
         """
-        kwargs: dict = {"model": self.cfg.model}
+        usage = usage_of(resp)
+        with self._usage_lock:
+            self.usage["input_tokens"] += usage["input_tokens"]
+            self.usage["output_tokens"] += usage["output_tokens"]
+            self.usage["cached_tokens"] += usage["cached_tokens"]
+        if self.metrics:
+            self.metrics.record(
+                model=kwargs["model"], latency_s=round(time.perf_counter() - start, 4),
+                ttft_s=round(ttft, 4) if ttft is not None else None,
+                queue_s=round(queued, 4) if queued is not None else None,
+                cache=cache, stream=stream, error=error, **usage,
+            )
+
+    def _build_kwargs(self, input_text: str | None, schema: dict | None = None) -> dict:
+        kwargs: dict = {"model": getattr(self.cfg.model, "value", self.cfg.model)}
 
         if self.cfg.instructions:
             kwargs["instructions"] = self.cfg.instructions
@@ -58,7 +171,145 @@ class OpenAIResponder:
                     "Aucun input_text fourni et aucun prompt réutilisable configuré."
                 )
             kwargs["input"] = input_text
+            task = current_tags().get("task")
+            if task in PROMPT_VERSIONS:
+                # même préfixe statique => même clé : maximise les hits du cache de prompt fournisseur
+                kwargs["prompt_cache_key"] = f"pyreto-{task}-v{PROMPT_VERSIONS[task]}"
+        if schema:
+            # Structured Outputs : schema = {"name": …, "schema": {…}} ; le texte produit est du JSON
+            kwargs["text"] = {"format": {"type": "json_schema", "strict": True, **schema}}
+        return kwargs
+
+    def generate(self, *, input_text: str | None = None, use_cache: bool = True,
+                 schema: dict | None = None) -> str:
+        """
+        Utilise soit un prompt réutilisable du dashboard (prompt=id/version/variables),
+        soit un input text classique. Retourne response.output_text.
+        Passe par le cache disque si configuré (use_cache=False pour le contourner).
+        schema : sortie structurée (JSON conforme au schéma) au lieu de texte libre.
+        Des appels identiques simultanés partagent un seul appel LLM (sauf use_cache=False,
+        qui demande une réponse neuve).
+        """
+        base_kwargs = self._build_kwargs(input_text, schema)
+        if not use_cache:
+            text, model = self._generate(base_kwargs, use_cache)
+        else:
+            start = time.perf_counter()
+            (text, model), shared = self._flights.do(self._request_key(base_kwargs),
+                                                     lambda: self._generate(base_kwargs, use_cache))
+            if shared:
+                self._observe(base_kwargs, start, cache="shared")
+        note_model(model)
+        return text
+
+    def _generate(self, base_kwargs: dict, use_cache: bool) -> tuple[str, str]:
+        """(texte, modèle qui a répondu)."""
+        routes = self._routes()
+        for i, (model, timeout) in enumerate(routes):
+            kwargs = {**base_kwargs, "model": model}
+            start = time.perf_counter()
+            key, cached, status = self._lookup(kwargs, use_cache)
+            if cached is not None:
+                self._observe(kwargs, start, cache=status)
+                return cached, model
+
+            client = self.client.with_options(timeout=timeout) if timeout else self.client
+            estimate, queued = self._throttle(kwargs)
+            start = time.perf_counter()  # latence mesurée hors file d'attente
+            try:
+                resp = client.responses.create(**kwargs)
+            except Exception as e:
+                self._refund(estimate)
+                self._observe(kwargs, start, cache=status, error=type(e).__name__, queued=queued)
+                self._observe_route(model, start, timed_out=_is_timeout(e))
+                if _is_timeout(e) and i + 1 < len(routes):
+                    continue  # repli sur un tier plus rapide
+                raise
+            self._settle(estimate, resp)
+            self._observe(kwargs, start, resp=resp, cache=status, queued=queued)
+            self._observe_route(model, start)
+            # Agrégation sûre du texte produit
+            text = getattr(resp, "output_text", "").strip()
+            self._store(key, kwargs, text)
+            return text, model
+
+    def stream(self, *, input_text: str | None = None, use_cache: bool = True) -> Iterator[str]:
+        """
+        Variante streaming de generate : produit les deltas de texte au fil de l'eau.
+        Un hit de cache est restitué en un seul morceau. Comme generate, un appel identique
+        déjà en cours (flux ou non) est partagé : le texte complet arrive en un seul morceau.
+        """
+        base_kwargs = self._build_kwargs(input_text)
+        if not use_cache:
+            _text, model = yield from self._stream(base_kwargs, use_cache)
+            note_model(model)
+            return
+        key = self._request_key(base_kwargs)
+        start = time.perf_counter()
+        flight, leader = self._flights.begin(key)
+        if not leader:
+            text, model = flight.result()
+            self._observe(base_kwargs, start, cache="shared", ttft=time.perf_counter() - start, stream=True)
+            note_model(model)
+            if text:
+                yield text
+            return
+        try:
+            result = yield from self._stream(base_kwargs, use_cache)
+        except GeneratorExit:  # flux abandonné par l'appelant : les suiveurs n'ont pas de texte complet
+            self._flights.finish(key, error=RuntimeError("flux interrompu par l'appelant"))
+            raise
+        except BaseException as e:
+            self._flights.finish(key, error=e)
+            raise
+        self._flights.finish(key, result)
+        note_model(result[1])
+
+    def _stream(self, base_kwargs: dict, use_cache: bool) -> Generator[str, None, tuple[str, str]]:
+        """Deltas de texte ; valeur de retour (texte complet, modèle qui a répondu)."""
+        routes = self._routes()
+        for i, (model, timeout) in enumerate(routes):
+            kwargs = {**base_kwargs, "model": model}
+            start = time.perf_counter()
+            key, cached, status = self._lookup(kwargs, use_cache)
+            if cached is not None:
+                self._observe(kwargs, start, cache=status, ttft=time.perf_counter() - start, stream=True)
+                yield cached
+                return cached, model
+
+            client = self.client.with_options(timeout=timeout) if timeout else self.client
+            estimate, queued = self._throttle(kwargs)
+            start = time.perf_counter()
+            parts: list[str] = []
+            ttft = final = None
+            try:
+                for event in client.responses.create(stream=True, **kwargs):
+                    etype = getattr(event, "type", "")
+                    if etype == "response.output_text.delta":
+                        if ttft is None:
+                            ttft = time.perf_counter() - start
+                        parts.append(event.delta)
+                        yield event.delta
+                    elif etype == "response.completed":
+                        final = event.response
+            except Exception as e:
+                if not parts:  # rien reçu : l'estimation est rendue au limiteur
+                    self._refund(estimate)
+                self._observe(kwargs, start, cache=status, ttft=ttft, stream=True, error=type(e).__name__,
+                              queued=queued)
+                self._observe_route(model, start, timed_out=_is_timeout(e))
+                # repli possible tant que rien n'a été émis
+                if _is_timeout(e) and not parts and i + 1 < len(routes):
+                    continue
+                raise
+            self._settle(estimate, final)
+            self._observe(kwargs, start, resp=final, cache=status, ttft=ttft, stream=True, queued=queued)
+            self._observe_route(model, start)
+            text = "".join(parts).strip()
+            self._store(key, kwargs, text)
+            return text, model
+
 
-        resp = self.client.responses.create(**kwargs)
-        # Agrégation sûre du texte produit
-        return getattr(resp, "output_text", "").strip()
+def _is_timeout(exc: Exception) -> bool:
+    from openai import APITimeoutError
+    return isinstance(exc, APITimeoutError)
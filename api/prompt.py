@@ -1,13 +1,16 @@
 import textwrap
 
 # ================== Prompts (LLM) ==================
+#
+# Chaque prompt = préfixe statique versionné + suffixe variable court (sujet, nombre…).
+# Le préfixe identique d'un appel à l'autre profite du cache de prompt côté fournisseur ;
+# toute modification du texte d'un préfixe DOIT incrémenter sa version (clé du cache local).
 
+PROMPT_VERSIONS = {"cheatsheet": 2, "exercises": 2}
 
-def build_cheatsheet_prompt(topic: str) -> str:
-
-    return textwrap.dedent(f"""\
+CHEATSHEET_PREFIX = textwrap.dedent("""\
     Tu es un expert pédagogique.
-    Ta tâche : produire un **cheat sheet Pareto (20/80)** en **français** sur le sujet "{topic}", au **format EXACT** ci-dessous.
+    Ta tâche : produire un **cheat sheet Pareto (20/80)** en **français** sur le sujet indiqué à la fin, au **format EXACT** ci-dessous.
 
     **Règles impératives :**
     - En-tête sur 3 lignes avec `# ==============================================`
@@ -21,18 +24,16 @@ def build_cheatsheet_prompt(topic: str) -> str:
     - Terminer par un bloc final **⚡ 5 Commandes Pareto ultra-utiles ⚡** avec 5 lignes numérotées
     - Les commandes doivent être directement exécutables ou immédiatement applicables
     - Si possible, utiliser des séparateurs visuels (`---`) entre sections
-    """).strip()
-
+    """)
 
-def build_exercises_prompt(topic: str, n: int) -> str:
-    return textwrap.dedent(f"""\
+EXERCISES_PREFIX = textwrap.dedent("""\
     🎮 Contexte :
     Tu es un maître stratège dans un univers inspiré de *Warcraft 3*.
     Les étudiants sont des héros en campagne, et chaque exercice est une **quête** progressive pour
-    gagner en puissance (maîtrise de "{topic}").
+    gagner en puissance (maîtrise du sujet indiqué dans la **Mission** à la fin).
 
     ## ⚔️ Règles de la campagne
-    - Génère {n} quêtes numérotées : **EX01..EX{n:02d}**
+    - Génère exactement les quêtes demandées dans la **Mission**, avec sa numérotation **EXnn**
     - Jamais de solution donnée
     - Difficulté **croissante**
     - Alterner les types de quêtes :
@@ -69,5 +70,76 @@ def build_exercises_prompt(topic: str, n: int) -> str:
     - [erreur typique #2]
 
     ## 🧭 Rendu attendu
-    Les {n} quêtes au format ci-dessus, de **EX01** à **EX{n:02d}**.
-    """).strip()
+    Uniquement les quêtes de la Mission, au format ci-dessus.
+    """)
+
+
+# Sortie structurée des exercices (Structured Outputs) : un objet par quête, rendu en Markdown localement
+EXERCISE_TYPES = ["GÉNÉRATION", "DIAGNOSTIC", "TRANSFORMATION", "COMPARAISON", "STRESS TEST"]
+_STR_LIST = {"type": "array", "items": {"type": "string"}}
+EXERCISE_FIELDS = {
+    "id": {"type": "string", "description": "EXnn"},
+    "title": {"type": "string"},
+    "objective": {"type": "string"},
+    "context": {"type": "string"},
+    "type": {"type": "string", "enum": EXERCISE_TYPES},
+    "resources": {"type": "string"},
+    "input": {"type": "string", "description": "contenu du bloc ```text, sans les balises"},
+    "deliverables": _STR_LIST,
+    "criteria": _STR_LIST,
+    "pitfalls": _STR_LIST,
+}
+EXERCISES_SCHEMA = {
+    "name": "exercises",
+    "schema": {
+        "type": "object",
+        "properties": {
+            "exercises": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": EXERCISE_FIELDS,
+                    "required": list(EXERCISE_FIELDS),
+                    "additionalProperties": False,
+                },
+            },
+        },
+        "required": ["exercises"],
+        "additionalProperties": False,
+    },
+}
+
+
+def build_cheatsheet_prompt(topic: str) -> str:
+    return f"{CHEATSHEET_PREFIX}\nSujet : \"{topic}\""
+
+
+def build_exercises_prompt(topic: str, n: int, *, start: int = 1, band: str | None = None,
+                           structured: bool = False, avoid: list[str] | None = None) -> str:
+    """
+    start/band servent à la génération par lots : le lot couvre EX{start}..EX{start+n-1}
+    et reste dans un niveau de difficulté donné.
+    structured : réponse JSON (EXERCISES_SCHEMA), un objet par quête avec les champs du format.
+    avoid : titres de quêtes existantes, à ne pas reprendre (régénération d'un doublon).
+    """
+    first, last = f"EX{start:02d}", f"EX{start + n - 1:02d}"
+    mission = [
+        "## 🎯 Mission",
+        f"- Sujet : \"{topic}\"",
+        f"- {n} quêtes numérotées : **{first}..{last}**",
+    ]
+    if band:
+        mission.append(f"- Niveau de ce lot : **{band}** (reste dans ce niveau)")
+    if avoid:
+        mission.append("- Quêtes déjà couvertes, à ne PAS reprendre : " + " ; ".join(avoid))
+    if structured:
+        mission.append("- Réponds en JSON : un objet par quête dans `exercises`, un champ par rubrique du format")
+    return EXERCISES_PREFIX + "\n" + "\n".join(mission)
+
+
+CHARS_PER_TOKEN = 4  # ordre de grandeur (français/Markdown) ; l'usage réel corrige ensuite
+
+
+def estimate_tokens(*texts: str | None) -> int:
+    """Estimation grossière des tokens d'entrée d'un appel (limiteur de débit)."""
+    return sum(-(-len(t) // CHARS_PER_TOKEN) for t in texts if t)
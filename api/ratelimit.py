@@ -0,0 +1,119 @@
+# --- Limitation de débit côté client (requêtes et tokens par minute) ---
+from __future__ import annotations
+import threading
+import time
+from collections import deque
+
+LANES = ("interactive", "batch")  # par priorité décroissante
+
+
+def _percentile(values: list[float], q: float) -> float | None:
+    return values[min(len(values) - 1, int(q * len(values)))] if values else None
+
+
+class _Bucket:
+    """Seau à jetons : capacité = débit par minute, rempli en continu ; peut passer en négatif (dette)."""
+
+    def __init__(self, per_minute: float) -> None:
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.stamp = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.stamp) * self.rate)
+        self.stamp = now
+
+    def delay(self, amount: float) -> float:
+        """Attente (s) avant de pouvoir prélever amount (borné à la capacité : un gros appel passe seul)."""
+        missing = min(amount, self.capacity) - self.level
+        return missing / self.rate if missing > 0 else 0.0
+
+
+class RateLimiter:
+    """
+    RPM/TPM partagés par tous les appels d'un client (threads, pools).
+    acquire() attend son tour : FIFO dans une voie, la voie interactive passe toujours
+    avant le batch. Les tokens sont estimés avant l'appel puis corrigés par settle().
+    """
+
+    def __init__(self, rpm: float | None = None, tpm: float | None = None, *, window: int = 200) -> None:
+        self.rpm, self.tpm = rpm, tpm
+        self._buckets = [_Bucket(rpm) if rpm else None, _Bucket(tpm) if tpm else None]  # [requêtes, tokens]
+        self._cond = threading.Condition()
+        self._queues: dict[str, deque] = {lane: deque() for lane in LANES}
+        self._waits: dict[str, deque] = {lane: deque(maxlen=window) for lane in LANES}
+        self._calls = dict.fromkeys(LANES, 0)
+        self.max_depth = 0
+
+    @property
+    def enabled(self) -> bool:
+        return any(self._buckets)
+
+    def _head(self) -> object | None:
+        for lane in LANES:
+            if self._queues[lane]:
+                return self._queues[lane][0]
+        return None
+
+    def _delay(self, tokens: int) -> float:
+        now = time.monotonic()
+        delay = 0.0
+        for bucket, amount in zip(self._buckets, (1, tokens)):
+            if bucket:
+                bucket.refill(now)
+                delay = max(delay, bucket.delay(amount))
+        return delay
+
+    def acquire(self, tokens: int, lane: str = "interactive") -> float:
+        """Bloque jusqu'à disposer d'une requête et de tokens ; retourne l'attente (s)."""
+        if not self.enabled:
+            return 0.0
+        lane = lane if lane in self._queues else LANES[0]
+        start = time.monotonic()
+        ticket = object()
+        with self._cond:
+            queue = self._queues[lane]
+            queue.append(ticket)
+            self.max_depth = max(self.max_depth, sum(len(q) for q in self._queues.values()))
+            try:
+                while True:
+                    timeout = None  # pas en tête : réveillé quand la file avance
+                    if self._head() is ticket:
+                        timeout = self._delay(tokens)
+                        if timeout <= 0:
+                            break
+                    self._cond.wait(timeout)
+                for bucket, amount in zip(self._buckets, (1, tokens)):
+                    if bucket:
+                        bucket.level -= amount
+            finally:
+                queue.remove(ticket)
+                self._cond.notify_all()
+            waited = time.monotonic() - start
+            self._waits[lane].append(waited)
+            self._calls[lane] += 1
+        return waited
+
+    def settle(self, estimated: int, actual: int | None) -> None:
+        """
+        Corrige le seau de tokens avec l'usage réel (entrée + sortie) une fois l'appel terminé.
+        actual=None : usage inconnu, l'estimation reste prélevée ; 0 (appel échoué) : remboursée.
+        """
+        bucket = self._buckets[1]
+        if bucket is None or actual is None:
+            return
+        with self._cond:
+            bucket.level = min(bucket.capacity, bucket.level - (actual - estimated))
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        """Profondeur des files et attentes récentes par voie (p50/p95/max en s)."""
+        with self._cond:
+            lanes = {}
+            for lane in LANES:
+                waits = sorted(self._waits[lane])
+                lanes[lane] = {"depth": len(self._queues[lane]), "calls": self._calls[lane],
+                               "wait_p50_s": _percentile(waits, 0.5), "wait_p95_s": _percentile(waits, 0.95),
+                               "wait_max_s": waits[-1] if waits else None}
+            return {"rpm": self.rpm, "tpm": self.tpm, "max_depth": self.max_depth, "lanes": lanes}
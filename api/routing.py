@@ -0,0 +1,80 @@
+# --- Routage du modèle par tâche (latence prévisible) ---
+from __future__ import annotations
+import threading
+import time
+from collections import deque
+
+from api.openai import ModelOPENAI
+
+# Du plus capable (lent) au plus rapide
+TIERS = (ModelOPENAI.GPT_5, ModelOPENAI.GPT_5_MINI, ModelOPENAI.GPT_5_NANO)
+
+DEFAULT_ROUTES = {
+    "cheatsheet": ModelOPENAI.GPT_5_MINI,
+    "exercises": ModelOPENAI.GPT_5_MINI,
+    "validation": ModelOPENAI.GPT_5_NANO,
+}
+# Budget de latence (s) par tâche : p95 observé au-delà => tier plus rapide
+DEFAULT_BUDGETS = {"cheatsheet": 45.0, "exercises": 60.0, "validation": 10.0}
+LARGE_SIZE = 20  # au-delà (nb d'exercices demandés), on part un tier plus rapide
+
+
+class ModelRouter:
+    """
+    Choisit le modèle par tâche et par taille, puis descend d'un tier tant que
+    le p95 récent du modèle pour cette tâche dépasse le budget.
+    fallbacks() fournit la suite de modèles plus rapides en cas de timeout.
+    """
+
+    def __init__(self, routes: dict | None = None, budgets: dict | None = None,
+                 *, default: ModelOPENAI = ModelOPENAI.GPT_5_NANO, window: int = 20,
+                 max_age: float = 600.0) -> None:
+        self.routes = {**DEFAULT_ROUTES, **(routes or {})}
+        self.budgets = {**DEFAULT_BUDGETS, **(budgets or {})}
+        self.default = default
+        self.window = window
+        self.max_age = max_age  # observations plus anciennes ignorées : un tier rétrogradé est réessayé
+        self._samples: dict[tuple[str, str], deque] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _faster(model: ModelOPENAI) -> ModelOPENAI | None:
+        i = TIERS.index(model)
+        return TIERS[i + 1] if i + 1 < len(TIERS) else None
+
+    def p95(self, task: str | None, model: ModelOPENAI) -> float | None:
+        horizon = time.monotonic() - self.max_age
+        with self._lock:
+            samples = sorted(lat for ts, lat in self._samples.get((task or "-", model.value), ()) if ts >= horizon)
+        if len(samples) < 5:
+            return None  # pas assez d'observations
+        return samples[min(len(samples) - 1, int(0.95 * len(samples)))]
+
+    def budget(self, task: str | None) -> float | None:
+        return self.budgets.get(task or "")
+
+    def pick(self, task: str | None = None, size: int | None = None) -> ModelOPENAI:
+        model = self.routes.get(task or "", self.default)
+        if size and size >= LARGE_SIZE and self._faster(model):
+            model = self._faster(model)
+        budget = self.budget(task)
+        while budget is not None:
+            p95 = self.p95(task, model)
+            faster = self._faster(model)
+            if p95 is None or p95 <= budget or faster is None:
+                break
+            model = faster
+        return model
+
+    def fallbacks(self, model: ModelOPENAI) -> list[ModelOPENAI]:
+        out = []
+        while (model := self._faster(model)) is not None:
+            out.append(model)
+        return out
+
+    def observe(self, task: str | None, model: ModelOPENAI | str, latency: float) -> None:
+        """Enregistre une latence (inf pour un timeout)."""
+        name = getattr(model, "value", model)
+        with self._lock:
+            q = self._samples.setdefault((task or "-", name), deque(maxlen=self.window))
+            q.append((time.monotonic(), latency))
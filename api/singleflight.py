@@ -0,0 +1,53 @@
+# --- Coalescence des appels identiques simultanés (single-flight) ---
+from __future__ import annotations
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    do(key, fn) : le premier appelant exécute fn, les appelants concurrents de même clé
+    attendent et reçoivent le même résultat (ou la même exception). Rien n'est gardé
+    après la fin de l'appel : ce n'est pas un cache.
+    begin()/finish() : même chose pour un meneur qui ne tient pas dans un appel (flux).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+        self.shared = 0  # appels servis par un vol déjà en cours
+
+    def begin(self, key: str) -> Tuple[Future, bool]:
+        """(future du vol, meneur) ; le meneur doit appeler finish(key, …) quoi qu'il arrive."""
+        with self._lock:
+            fut = self._calls.get(key)
+            if fut is None:
+                fut = self._calls[key] = Future()
+                return fut, True
+            self.shared += 1
+            return fut, False
+
+    def finish(self, key: str, result: object = None, error: BaseException | None = None) -> None:
+        """Libère la clé puis transmet le résultat (ou l'erreur) aux appelants en attente."""
+        with self._lock:
+            fut = self._calls.pop(key)
+        if error is not None:
+            fut.set_exception(error)
+        else:
+            fut.set_result(result)
+
+    def do(self, key: str, fn: Callable[[], T]) -> Tuple[T, bool]:
+        """(résultat, partagé) ; partagé = True si l'appel a rejoint un vol en cours."""
+        fut, leader = self.begin(key)
+        if not leader:
+            return fut.result(), True
+        try:
+            result = fn()
+        except BaseException as e:
+            self.finish(key, error=e)
+            raise
+        self.finish(key, result)
+        return result, False
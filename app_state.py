@@ -1,8 +1,11 @@
 from __future__ import annotations
+from concurrent.futures import Future
 from dataclasses import dataclass, field
 from pathlib import Path
-from rich.text import Text
-from views.rich_ui import RichUI
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from views.rich_ui import RichUI
 
 PATH_DIR = "Developer/exercise/pyreto"
 
@@ -11,9 +14,29 @@ PATH_DIR = "Developer/exercise/pyreto"
 class AppState:
     base: Path
     client: object | None = None
+    client_future: Future | None = None  # client OpenAI en cours de construction
+    srs: object | None = None  # SRSEngine chargé au premier passage en mode pratique
     last_topic: str | None = None
     recent_topics: list[str] = field(default_factory=list)
     last_action: str | None = None  # "course" | "cheat" | "ex"
+    search_synced: bool = False  # index de recherche rattrapé sur le disque cette session
+
+    def get_client(self, ui: RichUI | None = None) -> object | None:
+        """Attend (au besoin) le client construit en arrière-plan ; None = placeholders."""
+        fut, self.client_future = self.client_future, None
+        if fut is not None:
+            try:
+                if not fut.done() and ui is not None:
+                    with ui.spinner("Initialisation du client OpenAI…"):
+                        self.client = fut.result()
+                else:
+                    self.client = fut.result()
+            except Exception as e:
+                self.client = None
+                if ui is not None:
+                    ui.console.print(f"[yellow]Client OpenAI non initialisé:[/yellow] {e}\n"
+                                     "[yellow]Le script créera des placeholders.[/yellow]")
+        return self.client
 
     def remember_topic(self, topic: str) -> None:
         topic = topic.strip()
@@ -27,6 +50,7 @@ class AppState:
 
 
 def header(ui: RichUI, state: AppState) -> None:
+    from rich.text import Text
     recent = ", ".join(state.recent_topics[:3]) or "-"
     cur = state.last_topic or "-"
     ui.console.rule(Text(f"Menu — topic: {cur} | récents: {recent}", style="cyan"))
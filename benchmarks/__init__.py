@@ -0,0 +1 @@
+"""Benchmarks hors réseau (python -m benchmarks.<module>) ; résultats JSON comparables entre runs."""
@@ -0,0 +1,147 @@
+"""
+Micro-benchmarks des chemins disque : list_topics, build_schedule, update_topic/update_schedule,
+create_exercise_files, ensure_dirs, create_launcher_script, sur des bases synthétiques
+(10 / 1k / 100k sujets).
+
+    python -m benchmarks.bench_fs --out fs.json
+    python -m benchmarks.bench_fs --sizes 10,1000,100000 --compare fs.json
+"""
+from __future__ import annotations
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+from benchmarks.common import compare, print_table, save, summarize
+from services.index_service import index_path, update_schedule, update_topic
+from services.schedule_service import build_schedule
+from services.topics_service import list_topics
+from utils.helpers import create_exercise_files, create_launcher_script, ensure_dirs
+
+_DATES = ("2026-01-05", "2026-01-12", "2026-01-19", "2026-01-26")
+
+
+def synthesize(base: Path, topics: int, files_per_topic: int) -> None:
+    """Arborescence réaliste : une fiche, files_per_topic exercices (4 dates) et un lanceur par sujet."""
+    cheats, exercises = base / "cheatsheets", base / "exercises"
+    body = "### EX01 — Quête\n**Objectif (1 phrase) :**\n" + "lorem ipsum " * 60 + "\n"
+    for t in range(topics):
+        slug = f"topic-{t:06d}"
+        (cheats / slug).mkdir(parents=True)
+        (cheats / slug / f"{slug}.md").write_text(f"# {slug}\n" + body, encoding="utf-8")
+        ex_dir = exercises / slug
+        ex_dir.mkdir(parents=True)
+        for i in range(files_per_topic):
+            (ex_dir / f"{_DATES[i % len(_DATES)]}-ex{i + 1:02d}.md").write_text(body, encoding="utf-8")
+        create_launcher_script(ex_dir, slug)
+
+
+def measure(fn: Callable[[int], object], *, budget: float, min_runs: int = 3,
+            max_runs: int = 10_000, setup: Callable[[int], object] | None = None) -> dict:
+    """
+    Répète fn(i) jusqu'à épuiser budget (s) ; setup(i) éventuel hors chrono.
+    Allocations : un appel de plus sous tracemalloc (pic et blocs restants).
+    """
+    samples: list[float] = []
+    spent = 0.0
+    i = 0
+    while i < max_runs and (i < min_runs or spent < budget):
+        if setup:
+            setup(i)
+        start = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - start)
+        spent += samples[-1]
+        i += 1
+    if setup:
+        setup(i)
+    tracemalloc.start()
+    blocks0 = sys.getallocatedblocks()
+    fn(i)
+    blocks = sys.getallocatedblocks() - blocks0
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return summarize(samples, ops_per_s=round(len(samples) / spent, 1),
+                     alloc_peak_kb=round(peak / 1024, 1), alloc_blocks=blocks)
+
+
+def bench_size(results: dict, topics: int, files_per_topic: int, budget: float) -> None:
+    with tempfile.TemporaryDirectory(prefix="pyreto-fs-") as tmp:
+        base = Path(tmp)
+        start = time.perf_counter()
+        synthesize(base, topics, files_per_topic)
+        print(f"[{topics} sujets] base synthétisée en {time.perf_counter() - start:.1f}s", file=sys.stderr)
+        key = f"@{topics}"
+        slug = "topic-000000"
+
+        # Index absent (premier lancement / index supprimé) puis index à jour
+        def drop_index(_i) -> None:
+            index_path(base).unlink(missing_ok=True)
+
+        results["list_topics_cold" + key] = measure(lambda _i: list_topics(base), budget=budget,
+                                                    min_runs=1, setup=drop_index)
+        list_topics(base)
+        results["list_topics_warm" + key] = measure(lambda _i: list_topics(base), budget=budget)
+
+        def touch_dir(_i) -> None:  # mtime du dossier changé : le planning en cache est invalidé
+            tmp_file = base / "exercises" / slug / "x.tmp"
+            tmp_file.touch()
+            tmp_file.unlink()
+
+        results["build_schedule_cold" + key] = measure(lambda _i: build_schedule(base, slug), budget=budget,
+                                                       setup=touch_dir)
+        results["build_schedule_warm" + key] = measure(lambda _i: build_schedule(base, slug), budget=budget)
+
+        # Écritures d'index d'un seul sujet (chaque génération) : ne doivent pas croître avec le nombre de sujets
+        list_topics(base)
+        results["update_topic" + key] = measure(lambda i: update_topic(base, slug, exercises=i), budget=budget)
+        for t in range(topics):  # plannings en cache pour tous les sujets
+            build_schedule(base, f"topic-{t:06d}")
+        results["update_schedule" + key] = measure(
+            lambda i: update_schedule(base, slug, float(i), {"2026-01-05": [f"2026-01-05-ex{i % 99 + 1:02d}.md"]}),
+            budget=budget)
+
+        results["ensure_dirs_existing" + key] = measure(lambda _i: ensure_dirs(base, slug), budget=budget)
+        results["ensure_dirs_new" + key] = measure(lambda i: ensure_dirs(base, f"new-{i:06d}"), budget=budget)
+
+        ex_dir = base / "exercises" / slug
+        results["create_exercise_files_5" + key] = measure(
+            lambda i: create_exercise_files(ex_dir, f"2027-{i // 28 % 12 + 1:02d}-{i % 28 + 1:02d}", 5, None),
+            budget=budget, max_runs=300)
+        results["create_launcher_script_same" + key] = measure(
+            lambda _i: create_launcher_script(ex_dir, slug), budget=budget)
+        results["create_launcher_script_new" + key] = measure(
+            lambda i: create_launcher_script(ex_dir, f"{slug}-{i}"), budget=budget)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--sizes", default="10,1000", help="Nombres de sujets, séparés par des virgules (ex. 10,1000,100000)")
+    ap.add_argument("--files", type=int, default=8, help="Exercices par sujet")
+    ap.add_argument("--budget", type=float, default=0.5, help="Temps de mesure par benchmark (s)")
+    ap.add_argument("--out", type=Path, default=None, help="Écrit les résultats JSON")
+    ap.add_argument("--compare", type=Path, default=None, help="Résultats de référence (JSON)")
+    ap.add_argument("--tolerance", type=float, default=0.2, help="Hausse de p50 tolérée (0.2 = 20 %%)")
+    args = ap.parse_args()
+
+    results: dict[str, dict] = {}
+    for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+        bench_size(results, size, args.files, args.budget)
+
+    print_table(results)
+    params = {k: v for k, v in vars(args).items() if k not in ("out", "compare")}
+    if args.out:
+        save(args.out, "fs", params, results)
+    if args.compare:
+        regressions = compare(results, args.compare, tolerance=args.tolerance)
+        for line in regressions:
+            print(f"RÉGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
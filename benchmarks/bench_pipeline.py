@@ -0,0 +1,123 @@
+"""
+Bout en bout contre le LLM factice (api.mock) : cours, cheat sheet, exercices, batch
+et découpage des exercices. Aucune clé ni réseau (--http : vrai SDK + serveur local).
+
+    python -m benchmarks.bench_pipeline --out bench.json
+    python -m benchmarks.bench_pipeline --compare bench.json   # code 1 si régression
+"""
+from __future__ import annotations
+import argparse
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from api.mock import MockConfig, MockResponder, make_server
+from benchmarks.common import compare, print_table, repeat, save, summarize
+from services.batch_service import run_batch
+from services.cheatsheet_service import generate_cheatsheet
+from services.course_service import generate_course
+from services.exercises_service import generate_exercises
+from utils.exercise_splitter import ExerciseSplitter
+
+
+def _client(args, mock: MockConfig):
+    if not args.http:
+        return MockResponder(mock), None
+    server = make_server(mock, port=0)
+    threading.Thread(target=server.serve_forever, name="mock-llm", daemon=True).start()
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    os.environ.setdefault("OPENAI_API_KEY", "mock")
+    from api.openai import OpenAIConfig, OpenAIResponder
+    return OpenAIResponder(OpenAIConfig()), server
+
+
+def _split_corpus(n: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    words = "cache index verrou thread disque réseau quota trace".split()
+    blocks = []
+    for i in range(1, n + 1):
+        body = "\n".join(" ".join(rng.choice(words) for _ in range(12)) for _ in range(15))
+        blocks.append(f"### EX{i % 100:02d} — Quête {i}\n**Objectif (1 phrase) :**\n{body}")
+    return "\n\n".join(blocks)
+
+
+def bench_split(results: dict, runs: int) -> None:
+    text = _split_corpus(2000)
+    mb = len(text.encode("utf-8")) / 1e6
+
+    def whole(_i):
+        s = ExerciseSplitter()
+        s.feed(text)
+        s.close()
+
+    def streamed(_i):
+        s = ExerciseSplitter()
+        for k in range(0, len(text), 16):  # deltas de la taille d'un token ou deux
+            s.feed(text[k:k + 16])
+        s.close()
+
+    for name, fn in (("split_whole", whole), ("split_stream_16c", streamed)):
+        samples = repeat(fn, runs)
+        results[name] = summarize(samples, mb_per_s=round(mb / (sum(samples) / len(samples)), 1))
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--runs", type=int, default=10, help="Répétitions par scénario")
+    ap.add_argument("--latency", type=float, default=0.05, help="Latence simulée avant le 1er token (s)")
+    ap.add_argument("--jitter", type=float, default=0.2)
+    ap.add_argument("--tps", type=float, default=4000.0, help="Débit simulé (tokens/s)")
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--batch-topics", type=int, default=20)
+    ap.add_argument("--jobs", type=int, default=4)
+    ap.add_argument("--http", action="store_true", help="Passe par le SDK openai et le serveur HTTP factice")
+    ap.add_argument("--out", type=Path, default=None, help="Écrit les résultats JSON")
+    ap.add_argument("--compare", type=Path, default=None, help="Résultats de référence (JSON)")
+    ap.add_argument("--tolerance", type=float, default=0.2, help="Hausse de p50 tolérée (0.2 = 20 %%)")
+    args = ap.parse_args()
+    logging.basicConfig(level=logging.ERROR)  # doublons / squelettes : bruit hors sujet ici
+
+    mock = MockConfig(latency=args.latency, jitter=args.jitter, tokens_per_sec=args.tps,
+                      error_rate=args.error_rate, seed=1)
+    client, server = _client(args, mock)
+    results: dict[str, dict] = {}
+    with tempfile.TemporaryDirectory(prefix="pyreto-bench-") as tmp:
+        base = Path(tmp)
+        results["course"] = summarize(repeat(lambda i: generate_course(base, f"course {i}", client=client), args.runs))
+        results["cheatsheet"] = summarize(
+            repeat(lambda i: generate_cheatsheet(base, f"cheat {i}", client=client), args.runs))
+        results["cheatsheet_stream"] = summarize(repeat(
+            lambda i: generate_cheatsheet(base, f"stream {i}", client=client, on_delta=lambda d: None), args.runs))
+        results["exercises_5"] = summarize(
+            repeat(lambda i: generate_exercises(base, f"ex5 {i}", n=5, client=client), args.runs))
+        results["exercises_12_sharded"] = summarize(
+            repeat(lambda i: generate_exercises(base, f"ex12 {i}", n=12, client=client), args.runs))
+
+        topics = [f"batch {i}" for i in range(args.batch_topics)]
+        start = time.perf_counter()
+        report = run_batch(base, topics, client=client, n=5, jobs=args.jobs)
+        elapsed = time.perf_counter() - start
+        results["batch"] = {**summarize([elapsed]), "topics_per_min": round(report.topics_per_min, 1),
+                            "failed": len(report.failed)}
+    bench_split(results, args.runs)
+    if server:
+        server.shutdown()
+
+    print_table(results)
+    params = {k: v for k, v in vars(args).items() if k not in ("out", "compare")}
+    if args.out:
+        save(args.out, "pipeline", params, results)
+    if args.compare:
+        regressions = compare(results, args.compare, tolerance=args.tolerance)
+        for line in regressions:
+            print(f"RÉGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,68 @@
+"""Mesures, résumé (percentiles) et comparaison de résultats JSON entre deux runs."""
+from __future__ import annotations
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+
+def percentile(values: List[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def summarize(samples_s: List[float], **extra) -> dict:
+    """Latences (s) -> ms : p50/p95/p99/moyenne, plus les champs extra (débit…)."""
+    ms = [s * 1000 for s in samples_s]
+    return {
+        "n": len(ms),
+        "p50_ms": round(percentile(ms, 0.50), 3),
+        "p95_ms": round(percentile(ms, 0.95), 3),
+        "p99_ms": round(percentile(ms, 0.99), 3),
+        "mean_ms": round(sum(ms) / len(ms), 3),
+        **extra,
+    }
+
+
+def repeat(fn: Callable[[int], object], runs: int) -> List[float]:
+    """Durées (s) de fn(i) pour i in range(runs)."""
+    samples = []
+    for i in range(runs):
+        start = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def meta(**params) -> dict:
+    return {"ts": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": sys.version.split()[0],
+            "platform": platform.platform(), **params}
+
+
+def save(path: Path, suite: str, params: dict, results: Dict[str, dict]) -> None:
+    path.write_text(json.dumps({"suite": suite, "meta": meta(**params), "results": results},
+                               ensure_ascii=False, indent=1), encoding="utf-8")
+
+
+def compare(results: Dict[str, dict], baseline_path: Path, *, tolerance: float = 0.2,
+            metric: str = "p50_ms") -> List[str]:
+    """Régressions : metric en hausse de plus de tolerance (20 %) par rapport à la référence."""
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))["results"]
+    regressions = []
+    for name, res in results.items():
+        old, new = (baseline.get(name) or {}).get(metric), res.get(metric)
+        if old and new is not None and new > old * (1 + tolerance):
+            regressions.append(f"{name}: {metric} {old:.3f} -> {new:.3f} (+{(new / old - 1):.0%})")
+    return regressions
+
+
+def print_table(results: Dict[str, dict]) -> None:
+    cols = ["n", "p50_ms", "p95_ms", "p99_ms", "mean_ms"]
+    extra = sorted({k for r in results.values() for k in r} - set(cols))
+    header = ["bench"] + cols + extra
+    rows = [[name] + [str(r.get(c, "")) for c in cols + extra] for name, r in results.items()]
+    widths = [max(len(h), *(len(row[i]) for row in rows)) for i, h in enumerate(header)]
+    for row in [header] + rows:
+        print("  ".join(cell.ljust(w) for cell, w in zip(row, widths)))
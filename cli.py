@@ -3,16 +3,15 @@
 from __future__ import annotations
 import argparse
 from pathlib import Path
-from rich.console import Console
+from typing import TYPE_CHECKING
 
 from menu import MenuChoice, parse_menu_choice
-from views.rich_ui import RichUI
-from services.openai_factory import build_openai_client
 from app_state import AppState, PATH_DIR, header, ask_topic
-from handlers import (
-    handle_course, handle_cheatsheet, handle_exercises,
-    handle_topics, handle_schedule,
-)
+
+# Démarrage rapide : Rich, le SDK OpenAI, handlers, vues et contrôleurs
+# sont importés au premier usage (cf. --profile-startup).
+if TYPE_CHECKING:
+    from views.rich_ui import RichUI
 
 # ---------------- Args ----------------
 
@@ -25,6 +24,41 @@ def parse_args() -> argparse.Namespace:
         default=Path.home() / PATH_DIR,
         help="Répertoire racine des sujets",
     )
+    ap.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore le cache disque des réponses LLM",
+    )
+    ap.add_argument(
+        "--structured",
+        action="store_true",
+        help="Exercices en sortie JSON structurée, rendus en Markdown localement (PYRETO_STRUCTURED=1)",
+    )
+    ap.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Affiche le temps d'import par module avant le premier menu (ou la sous-commande)",
+    )
+    sub = ap.add_subparsers(dest="command")
+
+    bp = sub.add_parser("batch", help="Génère cheat sheets + exercices pour une liste de sujets (non interactif)")
+    bp.add_argument("topics_file", type=Path, help="Fichier texte : un sujet par ligne")
+    bp.add_argument("-j", "--jobs", type=int, default=4, help="Nombre de workers parallèles")
+    bp.add_argument("-n", "--exercises", type=int, default=5, help="Exercices par sujet")
+    bp.add_argument("-m", "--model", default=None, help="Modèle OpenAI (défaut : config/env, sinon gpt-5-nano)")
+
+    sp = sub.add_parser("search", help="Recherche plein texte dans les cheat sheets et exercices")
+    sp.add_argument("query", nargs="+", help="Mots recherchés (tous requis, le dernier en préfixe)")
+    sp.add_argument("-t", "--topic", default=None, help="Limiter à un sujet (slug)")
+    sp.add_argument("-k", "--kind", choices=["cheat", "ex"], default=None, help="Limiter au type de fichier")
+    sp.add_argument("-l", "--limit", type=int, default=20, help="Nombre max de résultats")
+    sp.add_argument("--reindex", action="store_true", help="Rattrape d'abord les fichiers modifiés hors de pyreto")
+
+    vp = sub.add_parser("serve", help="API HTTP/JSON locale (un process, un client LLM partagé)")
+    vp.add_argument("--host", default="127.0.0.1", help="Adresse d'écoute")
+    vp.add_argument("-p", "--port", type=int, default=8420, help="Port d'écoute (0 = libre)")
+    vp.add_argument("-j", "--workers", type=int, default=4, help="Générations simultanées")
+    vp.add_argument("-m", "--model", default=None, help="Modèle OpenAI (défaut : config/env, sinon gpt-5-nano)")
     return ap.parse_args()
 
 # ------------- Routing helpers -------------
@@ -66,6 +100,8 @@ def dispatch_choice(ui: RichUI, state: AppState, choice: MenuChoice) -> bool:
         MenuChoice.SCHEDULE,
     }
 
+    import handlers  # import paresseux : coût payé au premier choix, pas au démarrage
+
     if choice in needs_topic:
         topic = ask_topic(ui, state)
         if not topic:
@@ -73,28 +109,36 @@ def dispatch_choice(ui: RichUI, state: AppState, choice: MenuChoice) -> bool:
             return True
 
         if choice is MenuChoice.COURSE:
-            handle_course(ui, state, topic)
+            handlers.handle_course(ui, state, topic)
             return True
 
         if choice is MenuChoice.CHEATSHEET:
-            handle_cheatsheet(ui, state, topic)
+            handlers.handle_cheatsheet(ui, state, topic)
             return True
 
         if choice is MenuChoice.EXERCISES:
             n = ui.ask_int("Combien d'exercices ?", 5, minimum=1, maximum=50)
-            handle_exercises(ui, state, topic, n)
+            handlers.handle_exercises(ui, state, topic, n)
             return True
 
         if choice is MenuChoice.SCHEDULE:
-            handle_schedule(ui, state, topic)
+            handlers.handle_schedule(ui, state, topic)
             return True
 
     if choice is MenuChoice.TOPICS:
-        handle_topics(ui, state)
+        handlers.handle_topics(ui, state)
         return True
 
     if choice is MenuChoice.PRACTICE:
-        ui.console.print("[yellow]Mode pratique : handler à implémenter.[/yellow]")
+        handlers.handle_practice(ui, state)
+        return True
+
+    if choice is MenuChoice.STATS:
+        handlers.handle_stats(ui, state)
+        return True
+
+    if choice is MenuChoice.SEARCH:
+        handlers.handle_search(ui, state)
         return True
 
     if choice is MenuChoice.QUIT:
@@ -127,15 +171,107 @@ def run_interactive(ui: RichUI, state: AppState) -> int:
         if not dispatch_choice(ui, state, choice):
             return 0
 
+# ------------- Batch (non interactif) -------------
+
+
+def run_batch_command(ui: RichUI, args: argparse.Namespace) -> int:
+    from controllers.batch_controller import BatchController
+    from views.batch_view import BatchView
+    from services.openai_factory import build_openai_client_from_env
+
+    try:
+        client = build_openai_client_from_env(args.model, args.base_dir / ".pyreto",
+                                              use_cache=not args.no_cache)
+    except Exception as e:
+        ui.console.print(f"[red]Client OpenAI non initialisé:[/red] {e}")
+        return 2
+    return BatchController(ui, BatchView(ui), client=client).run(
+        args.base_dir, args.topics_file, jobs=args.jobs, n=args.exercises)
+
+
+def run_search_command(ui: RichUI, args: argparse.Namespace) -> int:
+    import time
+    from services.search_service import ensure_index, search, sync
+    from views.search_view import SearchView
+
+    view = SearchView(ui)
+    if args.reindex:
+        view.show_sync(sync(args.base_dir))
+    else:
+        ensure_index(args.base_dir)
+    query = " ".join(args.query)
+    start = time.perf_counter()
+    hits = search(args.base_dir, query, limit=args.limit, topic=args.topic, kind=args.kind)
+    view.show_results(query, hits, (time.perf_counter() - start) * 1000)
+    for i, hit in enumerate(hits, 1):
+        ui.console.print(f"[dim]{i:>2}. {hit.path}[/dim]", highlight=False)
+    return 0 if hits else 1
+
+# ------------- Serveur HTTP -------------
+
+
+def run_serve_command(ui: RichUI, args: argparse.Namespace) -> int:
+    import asyncio
+    from server import PyretoServer, serve
+    from services.openai_factory import build_openai_client_from_env
+
+    try:
+        client = build_openai_client_from_env(args.model, args.base_dir / ".pyreto",
+                                              use_cache=not args.no_cache)
+    except Exception as e:
+        ui.console.print(f"[red]Client OpenAI non initialisé:[/red] {e}")
+        return 2
+    server = PyretoServer(args.base_dir, client, workers=args.workers)
+
+    def ready(host: str, port: int) -> None:
+        ui.console.print(f"[green]Pyreto à l'écoute sur[/green] http://{host}:{port} "
+                         f"({server.workers} workers, base {args.base_dir}) — Ctrl-C pour arrêter")
+
+    try:
+        asyncio.run(serve(server, args.host, args.port, on_ready=ready))
+    except KeyboardInterrupt:
+        ui.console.print("\n[bold]Serveur arrêté.[/bold]")
+    finally:
+        server.close()
+    return 0
+
 # ---------------- Main ----------------
 
 
 def main() -> int:
     args = parse_args()
+    if args.structured:
+        import os
+        os.environ["PYRETO_STRUCTURED"] = "1"  # lu par exercises_service (interactif comme batch)
+    profiler = None
+    if args.profile_startup:
+        from utils.import_profile import ImportProfiler
+        profiler = ImportProfiler().install()
+
+    from rich.console import Console
+    from views.rich_ui import RichUI
     ui = RichUI(Console())
 
-    client = build_openai_client(ui)
-    state = AppState(base=args.base_dir, client=client)
+    if args.command is None:
+        from services.openai_factory import start_openai_client
+    if profiler:
+        # arrêté avant le thread d'init (ses imports ne bloquent pas le menu) et avant
+        # toute sous-commande : le hook ne reste pas installé pendant un batch ou un serveur
+        profiler.uninstall()
+        ui.show_import_profile(profiler.top())
+        if args.command is None:
+            ui.ask_text("Entrée pour continuer", "")
+
+    if args.command == "batch":
+        return run_batch_command(ui, args)
+    if args.command == "search":
+        return run_search_command(ui, args)
+    if args.command == "serve":
+        return run_serve_command(ui, args)
+
+    # Le client se construit en arrière-plan pendant que le menu est utilisable
+    pending = start_openai_client(ui, args.base_dir / ".pyreto", use_cache=not args.no_cache)
+    state = AppState(base=args.base_dir, client_future=pending)
 
     return run_interactive(ui, state)
 
@@ -144,5 +280,6 @@ if __name__ == "__main__":
     try:
         raise SystemExit(main())
     except KeyboardInterrupt:
+        from rich.console import Console
         Console().print("\n[red]Interrompu.[/red]")
         raise
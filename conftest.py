@@ -0,0 +1 @@
+# Racine du dépôt sur sys.path : les tests importent api/, services/, utils/ comme cli.py.
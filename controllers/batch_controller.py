@@ -0,0 +1,20 @@
+from pathlib import Path
+from services.batch_service import BatchReport, read_topics, run_batch
+
+
+class BatchController:
+    def __init__(self, ui, view, client=None):  # view = BatchView
+        self.ui, self.view, self.client = ui, view, client
+
+    def run(self, base: Path, topics_file: Path, *, jobs: int = 4, n: int = 5) -> int:
+        topics = read_topics(topics_file)
+        self.view.show_start(len(topics), jobs)
+        report = BatchReport()
+        try:
+            run_batch(base, topics, client=self.client, n=n, jobs=jobs,
+                      on_progress=self.view.show_progress, report=report)
+        except KeyboardInterrupt:
+            self.view.show_summary(report)  # bilan partiel : relancer la même commande reprend
+            raise
+        self.view.show_summary(report)
+        return 1 if report.failed else 0
@@ -0,0 +1,25 @@
+import time
+from services.srs_service import SRSEngine
+
+
+class PracticeController:
+    def __init__(self, ui, view, open_file):  # view = PracticeView
+        self.ui, self.view, self.open_file = ui, view, open_file
+
+    def run(self, engine: SRSEngine) -> None:
+        while True:
+            nxt = engine.next_due()
+            if nxt is None:
+                self.view.show_empty(engine.next_due_at())
+                return
+            slug, name = nxt
+            path = engine.exercise_path(slug, name)
+            self.view.show_next(slug, name, engine.due_count())
+            start = time.monotonic()
+            if path.exists():
+                self.open_file(path)
+            status = self.ui.ask_choice("Résultat (pass/fail/skip)", ["pass", "fail", "skip"], "pass")
+            card = engine.record(slug, name, status, duration_sec=int(time.monotonic() - start))
+            self.view.show_reviewed(card)
+            if not self.ui.ask_confirm("Exercice suivant ?", True):
+                return
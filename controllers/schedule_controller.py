@@ -1,10 +1,13 @@
-from services.schedule_service import build_schedule
+from services.attempts_service import last_attempts
+from services.schedule_service import build_schedule, schedule_this_week
+from utils.helpers import safe_slug
 
 
 class ScheduleController:
     def __init__(self, ui, view):  # view = ScheduleView
         self.ui, self.view = ui, view
 
-    def run(self, ex_dir, slug: str):
-        sched = build_schedule(ex_dir)
-        self.view.show(sched, slug)
+    def run(self, base, slug: str):
+        sched = build_schedule(base, slug)
+        self.view.show(sched, slug, last_attempts(base, safe_slug(slug)))
+        self.view.show_week(schedule_this_week(base))
@@ -0,0 +1,24 @@
+import time
+from services.search_service import search, sync
+
+
+class SearchController:
+    def __init__(self, ui, view, open_file):  # view = SearchView
+        self.ui, self.view, self.open_file = ui, view, open_file
+
+    def run(self, base, *, refresh: bool = True) -> None:
+        if refresh:
+            # rattrape les fichiers modifiés hors de pyreto (stat seulement, relit le nécessaire)
+            with self.ui.spinner("Mise à jour de l'index…"):
+                self.view.show_sync(sync(base))
+        while True:
+            query = self.ui.ask_text("Recherche (vide = retour)", "").strip()
+            if not query:
+                return
+            start = time.perf_counter()
+            hits = search(base, query)
+            self.view.show_results(query, hits, (time.perf_counter() - start) * 1000)
+            if hits:
+                i = self.ui.ask_int("Ouvrir (0 = aucun)", default=0, minimum=0, maximum=len(hits))
+                if i:
+                    self.open_file(hits[i - 1].path)
@@ -0,0 +1,15 @@
+from services.stats_service import summarize_metrics
+
+
+class StatsController:
+    def __init__(self, ui, view):  # view = StatsView
+        self.ui, self.view = ui, view
+
+    def run(self, base, client=None):
+        self.view.show(summarize_metrics(base))
+        cache = getattr(client, "cache", None)
+        if cache is not None:
+            self.view.show_cache(cache.stats())
+        limiter = getattr(client, "limiter", None)
+        if limiter is not None and limiter.enabled:
+            self.view.show_limiter(limiter.stats())
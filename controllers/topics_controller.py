@@ -1,4 +1,5 @@
-from services.topics_service import list_topics
+from services.attempts_service import practiced_topics, success_rate
+from services.topics_service import list_topic_entries
 
 
 class TopicsController:
@@ -6,5 +7,6 @@ class TopicsController:
         self.ui, self.view = ui, view
 
     def run(self, base):
-        topics = list_topics(base)
-        self.view.show(topics)
+        topics = list_topic_entries(base)
+        rates = {slug: success_rate(base, slug) for slug in practiced_topics(base)}
+        self.view.show(topics, rates)
@@ -1,15 +1,9 @@
 # handlers.py
 from __future__ import annotations
 from pathlib import Path
-from views.course_view import CourseView
-from views.topics_view import TopicsView
-from views.schedule_view import ScheduleView
-from controllers.course_controller import CourseController
-from controllers.topics_controller import TopicsController
-from controllers.schedule_controller import ScheduleController
-from services.cheatsheet_service import generate_cheatsheet
-from services.exercises_service import generate_exercises
-from utils.helpers import safe_slug
+
+# Vues, contrôleurs et services sont importés dans chaque handler :
+# un écran ne coûte son import qu'à sa première ouverture.
 
 
 def _open_in_editor(path: Path) -> None:
@@ -20,25 +14,38 @@ def _open_in_editor(path: Path) -> None:
 
 
 def handle_course(ui, state, topic: str) -> None:
-    controller = CourseController(ui, CourseView(ui), client=state.client)
+    from controllers.course_controller import CourseController
+    from views.course_view import CourseView
+    controller = CourseController(ui, CourseView(ui), client=state.get_client(ui))
     with ui.spinner("Génération du cours…"):
         controller.run(state.base, topic)
     state.last_action = "course"
 
 
 def handle_cheatsheet(ui, state, topic: str) -> None:
-    with ui.spinner("Génération cheat sheet…"):
-        path = generate_cheatsheet(state.base, topic, client=state.client)
-    ui.console.print(f"[green]Cheat sheet:[/green] {path}")
-    ui.preview_markdown(path, limit_chars=1800)
+    from services.cheatsheet_service import generate_cheatsheet
+    client = state.get_client(ui)
+    if hasattr(client, "stream"):
+        # Aperçu live pendant la génération : pas de re-lecture du fichier
+        with ui.live_markdown(limit_chars=1800) as push:
+            path = generate_cheatsheet(state.base, topic, client=client, on_delta=push)
+        ui.console.print(f"[green]Cheat sheet:[/green] {path}")
+    else:
+        with ui.spinner("Génération cheat sheet…"):
+            path = generate_cheatsheet(state.base, topic, client=client)
+        ui.console.print(f"[green]Cheat sheet:[/green] {path}")
+        ui.preview_markdown(path, limit_chars=1800)
     if ui.ask_confirm("Ouvrir dans l'éditeur ?", True):
         _open_in_editor(path)
     state.last_action = "cheat"
 
 
 def handle_exercises(ui, state, topic: str, n: int) -> None:
+    from services.exercises_service import generate_exercises
+    client = state.get_client(ui)
     with ui.spinner("Génération exercices…"):
-        files, launcher = generate_exercises(state.base, topic, n=n, client=state.client)
+        files, launcher = generate_exercises(state.base, topic, n=n, client=client,
+                                             on_file=lambda p: ui.console.print(f" [green]✓[/green] {p.name}"))
     ui.console.print(f"[green]{len(files)} fichier(s)[/green] dans {files[0].parent if files else '(aucun)'}")
     if launcher:
         ui.console.print(f" Lanceur: {launcher}")
@@ -50,9 +57,38 @@ def handle_exercises(ui, state, topic: str, n: int) -> None:
 
 
 def handle_topics(ui, state) -> None:
+    from controllers.topics_controller import TopicsController
+    from views.topics_view import TopicsView
     TopicsController(ui, TopicsView(ui)).run(state.base)
 
 
 def handle_schedule(ui, state, topic: str) -> None:
-    ex_dir = state.base / "exercises" / safe_slug(topic)
-    ScheduleController(ui, ScheduleView(ui)).run(ex_dir, topic)
+    from controllers.schedule_controller import ScheduleController
+    from views.schedule_view import ScheduleView
+    ScheduleController(ui, ScheduleView(ui)).run(state.base, topic)
+
+
+def handle_practice(ui, state) -> None:
+    from controllers.practice_controller import PracticeController
+    from views.practice_view import PracticeView
+    from services.srs_service import SRSEngine
+    if state.srs is None:
+        state.srs = SRSEngine.load(state.base)
+    else:
+        state.srs.sync()  # prend en compte les exercices générés depuis
+    PracticeController(ui, PracticeView(ui), _open_in_editor).run(state.srs)
+
+
+def handle_stats(ui, state) -> None:
+    from controllers.stats_controller import StatsController
+    from views.stats_view import StatsView
+    # pas d'attente sur le client en cours d'init : seul son cache nous intéresse ici
+    StatsController(ui, StatsView(ui)).run(state.base, state.client)
+
+
+def handle_search(ui, state) -> None:
+    from controllers.search_controller import SearchController
+    from views.search_view import SearchView
+    # index rafraîchi depuis le disque une fois par session, puis tenu à jour par les services
+    SearchController(ui, SearchView(ui), _open_in_editor).run(state.base, refresh=not state.search_synced)
+    state.search_synced = True
@@ -9,6 +9,8 @@ class MenuChoice(Enum):
     TOPICS = 5
     SCHEDULE = 6
     QUIT = 7
+    STATS = 8
+    SEARCH = 9
 
 
 def parse_menu_choice(raw: str) -> MenuChoice:
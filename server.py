@@ -0,0 +1,231 @@
+# server.py — `cli.py serve` : API HTTP/JSON locale au-dessus des services
+#
+#   GET  /health                  état du pool et du limiteur de débit
+#   GET  /topics                  sujets + métadonnées de l'index
+#   GET  /schedule?topic=<sujet>  exercices groupés par date
+#   POST /cheatsheet  {"topic"}
+#   POST /exercises   {"topic", "n"?}
+#   POST /course      {"topic"}
+#
+# Un seul process sert toute l'équipe : un client LLM partagé (cache disque, coalescence
+# des appels identiques, limiteur RPM/TPM) et un pool de workers borné. Les services
+# restent synchrones ; la boucle asyncio ne fait que l'E/S HTTP. Champ optionnel
+# "lane": "batch" (POST) : passe derrière les appels interactifs dans le limiteur.
+from __future__ import annotations
+import asyncio
+import contextvars
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from api.metrics import tagged
+from api.ratelimit import LANES
+
+log = logging.getLogger(__name__)
+
+MAX_BODY = 1 << 20  # 1 Mio : les requêtes ne portent qu'un sujet et quelques options
+MAX_EXERCISES = 50  # même borne que le menu interactif
+IDLE_TIMEOUT = 30.0  # connexion keep-alive sans requête : fermée
+
+
+class BadRequest(Exception):
+    def __init__(self, message: str, status: int = 400) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def _topic(params: dict) -> str:
+    topic = params.get("topic")
+    if not isinstance(topic, str) or not topic.strip():
+        raise BadRequest("champ 'topic' requis (texte non vide)")
+    return topic.strip()
+
+
+def _lane(params: dict) -> str:
+    lane = params.get("lane", LANES[0])
+    if lane not in LANES:
+        raise BadRequest(f"'lane' doit valoir {' ou '.join(LANES)}")
+    return lane
+
+
+class PyretoServer:
+    """Routes -> services, exécutés dans un pool partagé avec le client LLM du process."""
+
+    def __init__(self, base: Path, client: Optional[object], *, workers: int = 4) -> None:
+        self.base = base
+        self.client = client
+        self.workers = max(1, workers)
+        self.pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="serve")
+        self.pending = 0  # travaux soumis au pool et non terminés (modifié depuis la boucle seulement)
+        self._routes: Dict[Tuple[str, str], Callable] = {
+            ("GET", "/health"): self.health,
+            ("GET", "/topics"): self.topics,
+            ("GET", "/schedule"): self.schedule,
+            ("POST", "/cheatsheet"): self.cheatsheet,
+            ("POST", "/exercises"): self.exercises,
+            ("POST", "/course"): self.course,
+        }
+
+    async def _run(self, fn: Callable, *args, lane: str = LANES[0], **kwargs) -> Any:
+        """fn dans le pool, avec les étiquettes de la requête (voie du limiteur)."""
+        def call():
+            with tagged(lane=lane):
+                return fn(*args, **kwargs)
+
+        ctx = contextvars.copy_context()
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.pool, ctx.run, call)
+        finally:
+            self.pending -= 1
+
+    # ---------- Routes ----------
+
+    async def health(self, params: dict) -> dict:
+        limiter = getattr(self.client, "limiter", None)
+        return {
+            "ok": True, "llm": self.client is not None,
+            "workers": self.workers, "pending": self.pending,
+            "limiter": limiter.stats() if limiter is not None and limiter.enabled else None,
+        }
+
+    async def topics(self, params: dict) -> dict:
+        from services.topics_service import list_topic_entries
+        entries = await self._run(list_topic_entries, self.base)
+        return {"topics": [
+            {"slug": slug, "cheatsheet": str(cheat), "ex_dir": str(ex_dir) if ex_dir else None,
+             **{k: v for k, v in meta.items() if k not in ("schedule", "ex_dir")}}
+            for slug, cheat, ex_dir, meta in entries
+        ]}
+
+    async def schedule(self, params: dict) -> dict:
+        from services.schedule_service import build_schedule
+        buckets = await self._run(build_schedule, self.base, _topic(params))
+        return {"schedule": [{"date": day, "files": files} for day, files in buckets]}
+
+    async def cheatsheet(self, params: dict) -> dict:
+        from services.cheatsheet_service import generate_cheatsheet
+        path = await self._run(generate_cheatsheet, self.base, _topic(params), client=self.client,
+                               lane=_lane(params))
+        return {"cheatsheet": str(path)}
+
+    async def exercises(self, params: dict) -> dict:
+        from services.exercises_service import generate_exercises
+        n = params.get("n", 5)
+        if not isinstance(n, int) or isinstance(n, bool) or not 1 <= n <= MAX_EXERCISES:
+            raise BadRequest(f"'n' doit être un entier entre 1 et {MAX_EXERCISES}")
+        files, launcher = await self._run(generate_exercises, self.base, _topic(params), n=n,
+                                          client=self.client, lane=_lane(params))
+        return {"files": [str(p) for p in files], "launcher": str(launcher)}
+
+    async def course(self, params: dict) -> dict:
+        from services.course_service import generate_course
+        result = await self._run(generate_course, self.base, _topic(params), client=self.client,
+                                 lane=_lane(params))
+        return {k: str(v) if v is not None else None for k, v in result.items()}
+
+    # ---------- HTTP ----------
+
+    async def dispatch(self, method: str, target: str, body: bytes) -> Tuple[int, dict]:
+        url = urlsplit(target)
+        route = self._routes.get((method, url.path))
+        if route is None:
+            known = any(path == url.path for _m, path in self._routes)
+            return (405 if known else 404), {"error": f"{method} {url.path} non pris en charge"}
+        params: dict = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        if body:
+            try:
+                payload = json.loads(body)
+            except ValueError:
+                return 400, {"error": "corps JSON invalide"}
+            if not isinstance(payload, dict):
+                return 400, {"error": "le corps doit être un objet JSON"}
+            params.update(payload)
+        try:
+            return 200, await route(params)
+        except BadRequest as e:
+            return e.status, {"error": str(e)}
+        except Exception as e:
+            log.exception("%s %s", method, url.path)
+            return 500, {"error": f"{type(e).__name__}: {e}"}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Une connexion : requêtes HTTP/1.1 successives (keep-alive), corps JSON."""
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(_read_request(reader), IDLE_TIMEOUT)
+                except BadRequest as e:
+                    await _write(writer, e.status, {"error": str(e)}, keep_alive=False)
+                    break
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                if request is None:
+                    break
+                method, target, headers, body = request
+                status, payload = await self.dispatch(method, target, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await _write(writer, status, payload, keep_alive=keep_alive)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass  # client parti pendant la génération : le travail lancé va quand même au bout
+        finally:
+            writer.close()
+
+    def close(self) -> None:
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, dict, bytes]]:
+    """(méthode, cible, en-têtes en minuscules, corps) ; None si la connexion est fermée."""
+    try:
+        line = await reader.readline()
+        if not line:
+            return None
+        parts = line.decode("latin-1").split()
+        if len(parts) != 3 or not parts[2].startswith("HTTP/"):
+            raise BadRequest("ligne de requête invalide")
+        headers: dict = {}
+        while True:
+            raw = await reader.readline()
+            if raw in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = raw.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+    except ValueError:  # ligne plus longue que la limite du StreamReader
+        raise BadRequest("en-têtes trop longs", 431) from None
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise BadRequest("Content-Length invalide") from None
+    if length > MAX_BODY:
+        raise BadRequest("corps trop volumineux", 413)
+    body = await reader.readexactly(length) if length > 0 else b""
+    return parts[0].upper(), parts[1], headers, body
+
+
+async def _write(writer: asyncio.StreamWriter, status: int, payload: dict, *, keep_alive: bool) -> None:
+    data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(data)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    writer.write(head.encode("latin-1") + data)
+    await writer.drain()
+
+
+async def serve(server: PyretoServer, host: str = "127.0.0.1", port: int = 8420,
+                on_ready: Optional[Callable[[str, int], None]] = None) -> None:
+    """Sert jusqu'à annulation (Ctrl-C) ; on_ready(host, port) une fois à l'écoute."""
+    listener = await asyncio.start_server(server.handle, host, port)
+    if on_ready:
+        on_ready(*listener.sockets[0].getsockname()[:2])
+    async with listener:
+        await listener.serve_forever()
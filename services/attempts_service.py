@@ -0,0 +1,157 @@
+from __future__ import annotations
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+from utils.helpers import atomic_open
+
+# Au-delà de ce volume non compacté, record_attempt replie la queue du journal dans le snapshot
+COMPACT_BYTES = 256 * 1024
+_lock = threading.Lock()
+_offsets: Dict[Path, int] = {}  # offset du snapshot par journal (évite de le relire à chaque ajout)
+
+
+def attempts_log_path(base: Path, slug: str) -> Path:
+    return base / ".pyreto" / "attempts" / f"{slug}.jsonl"
+
+
+def snapshot_path(base: Path, slug: str) -> Path:
+    return base / ".pyreto" / "attempts" / f"{slug}.snapshot.json"
+
+
+def record_attempt(base: Path, slug: str, exercise: str, status: str,
+                   duration_sec: Optional[int] = None, notes: Optional[str] = None, **extra) -> Path:
+    """Journal append-only (JSONL) des tentatives : une ligne par essai. status ∈ pass|fail|skip."""
+    entry = {
+        "ts": datetime.now().isoformat(timespec="seconds"),
+        "exercise": exercise,
+        "status": status,
+        "duration_sec": duration_sec,
+        "notes": notes,
+        **extra,
+    }
+    log = attempts_log_path(base, slug)
+    log.parent.mkdir(parents=True, exist_ok=True)
+    with _lock:
+        with log.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            size = f.tell()
+        if log not in _offsets:
+            _offsets[log] = _load_snapshot(base, slug)["offset"]
+        if size - _offsets[log] > COMPACT_BYTES:
+            _compact_locked(base, slug)
+    return log
+
+
+def iter_attempts(base: Path, slug: str, *, offset: int = 0) -> Iterator[dict]:
+    """
+    Lecture en flux du journal à partir d'un offset (octets).
+    Les lignes corrompues ou incomplètes (écriture interrompue) sont ignorées.
+    """
+    for _end, row in _iter_from(attempts_log_path(base, slug), offset):
+        yield row
+
+
+def _iter_from(log: Path, offset: int) -> Iterator[tuple[int, dict]]:
+    """Produit (offset de fin de ligne, entrée) pour chaque ligne complète après offset."""
+    try:
+        f = log.open("rb")
+    except OSError:
+        return
+    with f:
+        f.seek(offset)
+        pos = offset
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break  # ligne en cours d'écriture
+            pos += len(raw)
+            line = raw.strip()
+            if not line:
+                continue
+            try:
+                yield pos, json.loads(line)
+            except ValueError:
+                continue
+
+
+# ---------- Snapshot & agrégats ----------
+
+def _empty_snapshot() -> dict:
+    return {"offset": 0, "exercises": {}}
+
+
+def _load_snapshot(base: Path, slug: str) -> dict:
+    try:
+        snap = json.loads(snapshot_path(base, slug).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return _empty_snapshot()
+    # journal remplacé/tronqué depuis : on repart de zéro
+    try:
+        if snap.get("offset", 0) > attempts_log_path(base, slug).stat().st_size:
+            return _empty_snapshot()
+    except OSError:
+        return _empty_snapshot()
+    return snap
+
+
+def _fold(exercises: dict, row: dict) -> None:
+    name = row.get("exercise", "")
+    status = row.get("status", "")
+    agg = exercises.setdefault(name, {"attempts": 0, "pass": 0, "fail": 0, "skip": 0,
+                                      "last_ts": None, "last_status": None})
+    agg["attempts"] += 1
+    if status in ("pass", "fail", "skip"):
+        agg[status] += 1
+    agg["last_ts"] = row.get("ts")
+    agg["last_status"] = status
+
+
+def summarize(base: Path, slug: str) -> dict:
+    """Snapshot + queue du journal non compactée : {"offset", "exercises": {nom: agrégats}}."""
+    snap = _load_snapshot(base, slug)
+    offset = snap["offset"]
+    for offset, row in _iter_from(attempts_log_path(base, slug), offset):
+        _fold(snap["exercises"], row)
+    snap["offset"] = offset
+    return snap
+
+
+def _compact_locked(base: Path, slug: str) -> dict:
+    snap = summarize(base, slug)
+    path = snapshot_path(base, slug)
+    with atomic_open(path) as f:
+        json.dump(snap, f, ensure_ascii=False, separators=(",", ":"))
+    _offsets[attempts_log_path(base, slug)] = snap["offset"]
+    return snap
+
+
+def compact(base: Path, slug: str) -> dict:
+    """Replie le journal dans le snapshot ; les lectures suivantes ne parsent que la nouvelle queue."""
+    with _lock:
+        return _compact_locked(base, slug)
+
+
+def last_attempts(base: Path, slug: str) -> Dict[str, dict]:
+    """Dernière tentative par exercice : {nom: {"ts", "status"}}."""
+    return {name: {"ts": agg["last_ts"], "status": agg["last_status"]}
+            for name, agg in summarize(base, slug)["exercises"].items()}
+
+
+def success_rate(base: Path, slug: str) -> Optional[float]:
+    """Part de « pass » parmi les tentatives pass/fail ; None si aucune."""
+    aggs = summarize(base, slug)["exercises"].values()
+    passed = sum(a["pass"] for a in aggs)
+    graded = passed + sum(a["fail"] for a in aggs)
+    return passed / graded if graded else None
+
+
+def practiced_topics(base: Path) -> list[str]:
+    """Slugs ayant un journal de tentatives (un seul scandir)."""
+    root = base / ".pyreto" / "attempts"
+    try:
+        with os.scandir(root) as it:
+            return sorted(e.name[:-6] for e in it if e.name.endswith(".jsonl"))
+    except OSError:
+        return []
@@ -0,0 +1,125 @@
+from __future__ import annotations
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, List, Optional
+from api.metrics import tagged
+from services.cheatsheet_service import generate_cheatsheet
+from services.exercises_service import generate_exercises
+from utils.helpers import safe_slug
+
+
+@dataclass
+class BatchReport:
+    done: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+    elapsed: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+    pending: list[str] = field(default_factory=list)  # non traités (interruption)
+
+    @property
+    def topics_per_min(self) -> float:
+        return len(self.done) / self.elapsed * 60 if self.elapsed else 0.0
+
+
+def read_topics(path: Path) -> List[str]:
+    """Un sujet par ligne ; lignes vides et commentaires (#) ignorés, doublons (même slug) retirés."""
+    topics: list[str] = []
+    seen: set[str] = set()
+    for line in path.read_text(encoding="utf-8").splitlines():
+        topic = line.strip()
+        if not topic or topic.startswith("#"):
+            continue
+        slug = safe_slug(topic)
+        if slug and slug not in seen:
+            seen.add(slug)
+            topics.append(topic)
+    return topics
+
+
+def _cheatsheet_done(base: Path, slug: str) -> bool:
+    """Fiche présente et réelle : ni placeholder (pas de client) ni fiche vide (réponse LLM vide)."""
+    path = base / "cheatsheets" / slug / f"{slug}.md"
+    try:
+        with path.open(encoding="utf-8") as f:
+            first = f.readline().strip()
+    except OSError:
+        return False
+    return bool(first) and "PLACEHOLDER" not in first and not first.endswith("— Cheat Sheet (vide)")
+
+
+def _exercises_done(base: Path, slug: str, n: int) -> bool:
+    ex_dir = base / "exercises" / slug
+    return ex_dir.is_dir() and sum(1 for _ in ex_dir.glob("*-ex[0-9][0-9].md")) >= n
+
+
+def is_topic_complete(base: Path, topic: str, n: int = 5) -> bool:
+    slug = safe_slug(topic)
+    return _cheatsheet_done(base, slug) and _exercises_done(base, slug, n)
+
+
+def _generate_topic(base: Path, topic: str, n: int, client: object) -> None:
+    # Reprise fine : on ne régénère que la partie manquante
+    slug = safe_slug(topic)
+    with tagged(lane="batch"):  # le limiteur de débit fait passer les appels interactifs devant
+        if not _cheatsheet_done(base, slug):
+            generate_cheatsheet(base, topic, client=client)
+        if not _exercises_done(base, slug, n):
+            generate_exercises(base, topic, n=n, client=client)
+
+
+def run_batch(base: Path, topics: List[str], *, client: object, n: int = 5, jobs: int = 4,
+              on_progress: Optional[Callable[[str, str], None]] = None,
+              report: Optional[BatchReport] = None) -> BatchReport:
+    """
+    Génère cheat sheet + exercices pour chaque sujet via un pool borné à `jobs` workers.
+    Les sujets déjà complets sont sautés (reprise après interruption).
+    on_progress(topic, status) est appelé avec status ∈ {"skip", "ok", "fail"}.
+    Ctrl-C : les sujets en file sont annulés (seuls ceux en cours vont au bout), report
+    (fourni par l'appelant) est complété avec les sujets restants, puis l'interruption est relevée.
+    """
+    report = report if report is not None else BatchReport()
+    notify = on_progress or (lambda topic, status: None)
+    usage0 = dict(getattr(client, "usage", {}))
+    start = time.perf_counter()
+
+    todo: list[str] = []
+    for topic in topics:
+        if is_topic_complete(base, topic, n):
+            report.skipped.append(topic)
+            notify(topic, "skip")
+        else:
+            todo.append(topic)
+
+    pool = ThreadPoolExecutor(max_workers=max(1, jobs), thread_name_prefix="batch")
+    try:
+        futures = {pool.submit(_generate_topic, base, t, n, client): t for t in todo}
+        for fut in as_completed(futures):
+            topic = futures[fut]
+            err = fut.exception()
+            if err is None:
+                report.done.append(topic)
+                notify(topic, "ok")
+            else:
+                report.failed[topic] = f"{type(err).__name__}: {err}"
+                notify(topic, "fail")
+    except KeyboardInterrupt:
+        pool.shutdown(wait=False, cancel_futures=True)
+        report.pending = [t for t in todo if t not in report.done and t not in report.failed]
+        _finish(report, client, usage0, start)
+        raise
+    pool.shutdown()
+    return _finish(report, client, usage0, start)
+
+
+def _finish(report: BatchReport, client: object, usage0: dict, start: float) -> BatchReport:
+    report.elapsed = time.perf_counter() - start
+    usage = getattr(client, "usage", {})
+    report.input_tokens = usage.get("input_tokens", 0) - usage0.get("input_tokens", 0)
+    report.output_tokens = usage.get("output_tokens", 0) - usage0.get("output_tokens", 0)
+    report.cached_tokens = usage.get("cached_tokens", 0) - usage0.get("cached_tokens", 0)
+    return report
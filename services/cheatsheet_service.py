@@ -1,28 +1,63 @@
 from __future__ import annotations
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
+from api.metrics import recording_models, tagged
 from api.prompt import build_cheatsheet_prompt
+from services.index_service import model_of, update_topic
+from services.search_service import index_files
 from utils.helpers import ensure_dirs, safe_slug, write_text
+from utils.locks import topic_lock
 
 
-def generate_cheatsheet(base: Path, topic: str, *, client: Optional[object] = None) -> Path:
+def generate_cheatsheet(base: Path, topic: str, *, client: Optional[object] = None,
+                        on_delta: Optional[Callable[[str], None]] = None) -> Path:
     """
     Crée <base>/cheatsheets/<slug>/<slug>.md.
     Si client est fourni, génère via LLM, sinon placeholder.
+    Avec on_delta (et un client qui sait streamer), chaque morceau est transmis à
+    on_delta au fil des deltas ; le fichier est écrit une fois le flux terminé.
     """
     slug = safe_slug(topic)
     dirs = ensure_dirs(base, slug)  # doit créer base/cheatsheets/<slug> et base/exercises/<slug>
     path = dirs["cheats"] / f"{slug}.md"
 
     prompt = build_cheatsheet_prompt(topic)
-    if client:
-        content = (client.generate(input_text=prompt) or "").strip()
-        if not content:
-            content = f"# {topic} — Cheat Sheet (vide)\n"
-    else:
-        content = (
-            f"# {topic} — Cheat Sheet Pareto (PLACEHOLDER)\n"
-            f"> OpenAI non configuré. Utilise ce prompt :\n\n```\n{prompt}\n```\n"
-        )
-    write_text(path, content.rstrip() + "\n")
+    with tagged(topic=slug, task="cheatsheet"), recording_models() as used:
+        if client and on_delta is not None and hasattr(client, "stream"):
+            content = _stream_text(client.stream(input_text=prompt), on_delta)
+        elif client:
+            content = (client.generate(input_text=prompt) or "").strip()
+        else:
+            content = (
+                f"# {topic} — Cheat Sheet Pareto (PLACEHOLDER)\n"
+                f"> OpenAI non configuré. Utilise ce prompt :\n\n```\n{prompt}\n```\n"
+            )
+    if not content:
+        content = f"# {topic} — Cheat Sheet (vide)\n"
+    # appel LLM hors verrou : seules les écritures d'un même sujet sont sérialisées
+    with topic_lock(base, slug, "cheat"):
+        write_text(path, content.rstrip() + "\n")
+        update_topic(base, slug, size=path.stat().st_size, model=model_of(client, used), ex_dir=True)
+        index_files(base, [path])
     return path
+
+
+def _stream_text(deltas, on_delta: Callable[[str], None]) -> str:
+    """
+    Transmet les deltas à on_delta au fur et à mesure (équivalent streaming de strip()) et
+    retourne le texte complet : le fichier n'est écrit qu'une fois le flux terminé, sous le
+    verrou du sujet (une coupure ne laisse pas de fiche tronquée).
+    Les blancs de fin sont retenus jusqu'au prochain texte. Retourne "" si rien n'a été reçu.
+    """
+    parts: list[str] = []
+    pending = ""
+    for delta in deltas:
+        buf = pending + delta
+        head = buf.rstrip()
+        pending = buf[len(head):]
+        if not parts:
+            head = head.lstrip()
+        if head:
+            parts.append(head)
+            on_delta(head)
+    return "".join(parts)
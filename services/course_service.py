@@ -1,4 +1,6 @@
 from __future__ import annotations
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Dict, Any
 from services.cheatsheet_service import generate_cheatsheet
@@ -7,10 +9,21 @@ from services.exercises_service import generate_exercises
 
 def generate_course(base: Path, topic: str, *, client: Optional[object] = None) -> Dict[str, Any]:
     """
-    Génère cheat + exos. Retourne {"cheatsheet": Path, "ex_dir": Path | None }
+    Génère cheat + exos en parallèle. Retourne {"cheatsheet": Path, "ex_dir": Path | None }
     (manifest None si tu ne le gères pas encore).
+    Les deux générations sont isolées : l'échec de l'une n'interrompt pas l'autre,
+    la première erreur est relevée une fois les deux terminées.
     """
-    cheat = generate_cheatsheet(base, topic, client=client)
-    files, _launcher = generate_exercises(base, topic, n=5, client=client)
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="course") as pool:
+        # contexte copié : les étiquettes de l'appelant (voie du limiteur…) suivent les deux tâches
+        cheat_fut = pool.submit(contextvars.copy_context().run, generate_cheatsheet, base, topic, client=client)
+        ex_fut = pool.submit(contextvars.copy_context().run, generate_exercises, base, topic, n=5, client=client)
+    # le bloc `with` attend la fin des deux tâches
+    errors = [e for e in (cheat_fut.exception(), ex_fut.exception()) if e is not None]
+    if errors:
+        raise errors[0]
+
+    cheat = cheat_fut.result()
+    files, _launcher = ex_fut.result()
     ex_dir = files[0].parent if files else None
     return {"cheatsheet": cheat, "ex_dir": ex_dir}
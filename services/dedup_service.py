@@ -0,0 +1,117 @@
+from __future__ import annotations
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from utils.helpers import atomic_open
+from utils.minhash import signature, similarity
+
+# Similarité de Jaccard estimée (3-shingles de mots) au-delà de laquelle une quête est un doublon
+DUP_SIMILARITY = 0.5
+_SKELETON_MARK = "[Titre court façon mission]"  # squelettes : identiques par construction, ignorés
+
+
+def fingerprints_path(base: Path, slug: str) -> Path:
+    return base / ".pyreto" / "fingerprints" / f"{slug}.json"
+
+
+def _title(text: str) -> str:
+    first = text.lstrip().split("\n", 1)[0]
+    return first.split("—", 1)[-1].strip("# ").strip()
+
+
+class FingerprintIndex:
+    """
+    Signatures MinHash des exercices d'un sujet, persistées par fichier (mtime) :
+    seuls les fichiers nouveaux ou modifiés sont relus et re-signés.
+    check() compare une nouvelle quête à l'existant et aux quêtes acceptées du même lot.
+    """
+
+    def __init__(self, base: Path, slug: str) -> None:
+        self.path = fingerprints_path(base, slug)
+        self.entries: Dict[str, dict] = {}  # nom -> {"mtime", "title", "sig"}
+        self._pending: List[Tuple[str, str, List[int]]] = []  # (étiquette, titre, signature)
+
+    @classmethod
+    def load(cls, base: Path, slug: str, ex_dir: Path, *, exclude: Iterable[str] = ()) -> "FingerprintIndex":
+        """exclude : fichiers sur le point d'être réécrits (même date), hors comparaison."""
+        index = cls(base, slug)
+        try:
+            index.entries = json.loads(index.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            index.entries = {}
+        index.refresh(ex_dir)
+        for name in exclude:
+            index.entries.pop(name, None)
+        return index
+
+    def refresh(self, ex_dir: Path) -> bool:
+        """Aligne l'index sur le dossier ; True si quelque chose a changé."""
+        seen: Dict[str, float] = {}
+        try:
+            with os.scandir(ex_dir) as it:
+                for e in it:
+                    if e.name.endswith(".md") and "-ex" in e.name:
+                        seen[e.name] = e.stat().st_mtime
+        except OSError:
+            pass
+        changed = False
+        for name in list(self.entries):
+            if name not in seen:
+                del self.entries[name]
+                changed = True
+        for name, mtime in seen.items():
+            entry = self.entries.get(name)
+            if entry and entry["mtime"] == mtime:
+                continue
+            try:
+                text = (ex_dir / name).read_text(encoding="utf-8")
+            except OSError:
+                continue
+            if _SKELETON_MARK in text:
+                self.entries.pop(name, None)
+            else:
+                self.entries[name] = {"mtime": mtime, "title": _title(text), "sig": signature(text)}
+            changed = True
+        return changed
+
+    def commit(self, ex_dir: Path) -> None:
+        """Après écriture : les quêtes acceptées (étiquette = nom de fichier) rejoignent l'index, puis save()."""
+        for name, title, sig in self._pending:
+            try:
+                mtime = (ex_dir / name).stat().st_mtime
+            except OSError:
+                continue
+            self.entries[name] = {"mtime": mtime, "title": title, "sig": sig}
+        self._pending = []
+        self.refresh(ex_dir)
+        self.save()
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with atomic_open(self.path, durability="none") as f:  # reconstructible depuis les fichiers
+            json.dump(self.entries, f, separators=(",", ":"))
+
+    def nearest(self, sig: List[int]) -> Optional[Tuple[str, float]]:
+        best: Optional[Tuple[str, float]] = None
+        candidates = [(name, e["sig"]) for name, e in self.entries.items()]
+        candidates += [(label, s) for label, _t, s in self._pending]
+        for name, other in candidates:
+            sim = similarity(sig, other)
+            if best is None or sim > best[1]:
+                best = (name, sim)
+        return best
+
+    def check(self, label: str, text: str) -> Optional[Tuple[str, float]]:
+        """None si la quête est nouvelle (elle rejoint alors le lot), sinon (doublon de, similarité)."""
+        sig = signature(text)
+        best = self.nearest(sig)
+        if best and best[1] >= DUP_SIMILARITY:
+            return best
+        self._pending.append((label, _title(text), sig))
+        return None
+
+    def titles(self, limit: int = 30) -> List[str]:
+        """Titres déjà couverts (les plus récents d'abord), pour orienter une régénération."""
+        existing = [e["title"] for _n, e in sorted(self.entries.items(), reverse=True)]
+        return ([t for _l, t, _s in reversed(self._pending)] + existing)[:limit]
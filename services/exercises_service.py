@@ -1,23 +1,291 @@
 from __future__ import annotations
+import contextvars
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Tuple, List
-from api.prompt import build_exercises_prompt
-from utils.helpers import ensure_dirs, safe_slug, create_exercise_files, create_launcher_script
+from typing import Callable, Optional, Tuple, List
+from api.metrics import recording_models, tagged
+from api.prompt import EXERCISE_FIELDS, EXERCISE_TYPES, EXERCISES_SCHEMA, build_exercises_prompt
+from services.dedup_service import FingerprintIndex
+from services.index_service import model_of, update_topic
+from services.schedule_service import record_exercise_files
+from services.search_service import index_files
+from utils.exercise_splitter import ExerciseChunk, ExerciseSplitter, iter_exercises
+from utils.helpers import (
+    ensure_dirs, safe_slug, create_exercise_files, create_launcher_script,
+    exercise_file_name, render_exercise, renumber_exercise, write_text,
+)
+from utils.locks import topic_lock
 
+log = logging.getLogger(__name__)
 
-def generate_exercises(base: Path, topic: str, n: int = 5, *, client: Optional[object] = None) -> Tuple[List[Path], Path]:
+EX_SHARD_SIZE = 5  # au-delà, la génération est découpée en lots parallèles
+SHARD_ATTEMPTS = 2
+_BANDS = ("débutant", "intermédiaire", "avancé", "expert")
+
+
+def generate_exercises(base: Path, topic: str, n: int = 5, *, client: Optional[object] = None,
+                       on_file: Optional[Callable[[Path], None]] = None,
+                       structured: Optional[bool] = None, dedup: bool = True) -> Tuple[List[Path], Path]:
     """
     Crée des fichiers sous <base>/exercises/<slug> et un lanceur.
+    Si le client sait streamer, chaque exercice est écrit dès qu'il est complet
+    (puis transmis à on_file) ; les manquants deviennent des squelettes à la fin.
+    structured (défaut : PYRETO_STRUCTURED) : réponse JSON rendue en Markdown localement,
+    données brutes dans <date>-exercises.json.
+    dedup : une quête quasi identique à un exercice existant du sujet (MinHash) est
+    régénérée une fois, puis écartée si elle reste un doublon.
     """
+    if structured is None:
+        structured = os.getenv("PYRETO_STRUCTURED", "") not in ("", "0")
     slug = safe_slug(topic)
     dirs = ensure_dirs(base, slug)
+    before_mtime = dirs["ex"].stat().st_mtime
     date_str = datetime.now().strftime("%Y-%m-%d")
 
-    content: Optional[str] = None
-    if client:
-        content = (client.generate(input_text=build_exercises_prompt(topic, n)) or "").strip()
+    chunks: Optional[List[Optional[str]]] = None
+    data: List[Optional[dict]] = []
+    written: List[int] = []
+    dups: List[int] = []
+    dropped: List[int] = []
+    streamed = False
+    index = None
+    if client and dedup:
+        # les fichiers du jour qui vont être réécrits ne comptent pas comme existants
+        index = FingerprintIndex.load(base, slug, dirs["ex"],
+                                      exclude=[exercise_file_name(date_str, i) for i in range(1, n + 1)])
+    # même prompt qu'un jour précédent : la réponse en cache ne contiendrait que des quêtes
+    # déjà écrites (toutes en doublon). Hors cache dès que le sujet a des exercices.
+    use_cache = index is None or not index.entries
+    with tagged(topic=slug, task="exercises", size=n), recording_models() as used:
+        if client and structured:
+            data = _generate_structured(client, topic, n, use_cache)
+            chunks = [render_exercise(ex, i) if ex else None for i, ex in enumerate(data, 1)]
+        elif client and n > EX_SHARD_SIZE:
+            chunks = _generate_sharded(client, topic, n, use_cache)
+        elif client and hasattr(client, "stream"):
+            streamed = True
+            chunks, written, dups = _generate_streamed(client, topic, n, base, dirs["ex"], date_str,
+                                                       on_file, index, use_cache)
+        elif client:
+            splitter = ExerciseSplitter()
+            kwargs = {} if use_cache else {"use_cache": False}
+            content = client.generate(input_text=build_exercises_prompt(topic, n), **kwargs) or ""
+            chunks = [_numbered(c) for c in splitter.feed(content) + splitter.close()]
+            _report(topic, splitter)
+
+        if index is not None and chunks is not None:
+            if not streamed:  # en streaming, chaque quête est vérifiée avant écriture
+                for i, chunk in enumerate(chunks, 1):
+                    if chunk and _is_dup(index, topic, exercise_file_name(date_str, i), chunk):
+                        chunks[i - 1] = None
+                        dups.append(i)
+            for i, text in zip(dups, _regenerate_all(client, topic, dups, index.titles())):
+                if text and not _is_dup(index, topic, exercise_file_name(date_str, i), text):
+                    chunks[i - 1] = text
+                else:
+                    dropped.append(i)
+            if dropped:
+                log.warning("%s : %d doublon(s) écarté(s)", topic, len(dropped))
+
+    if chunks is not None:
+        missing = sum(1 for i in range(n) if (i >= len(chunks) or not chunks[i]) and i + 1 not in dropped)
+        if missing:
+            log.warning("%s : %d exercice(s) manquant(s) dans la réponse, squelettes utilisés", topic, missing)
+
+    # appels LLM terminés : seule la phase d'écriture est sérialisée par sujet
+    # (fichiers du jour, empreintes, lanceur et index cohérents entre deux lots simultanés)
+    with topic_lock(base, slug, "ex"):
+        removed = [exercise_file_name(date_str, i) for i in dropped]
+        for name in removed:  # pas de version périmée du même jour à la place du doublon
+            (dirs["ex"] / name).unlink(missing_ok=True)
+        kept = [(i, ex) for i, ex in enumerate(data, 1) if ex and i not in dups]
+        if kept:
+            write_text(dirs["ex"] / f"{date_str}-exercises.json", json.dumps(
+                [{**ex, "id": f"EX{i:02d}"} for i, ex in kept], ensure_ascii=False, indent=1), mkdir=False)
 
-    files = create_exercise_files(dirs["ex"], date_str, n, content)
-    launcher = create_launcher_script(dirs["ex"], slug)
+        files = create_exercise_files(dirs["ex"], date_str, n, None, chunks=chunks,
+                                      written=written, dropped=dropped)
+        if index is not None:
+            index.commit(dirs["ex"])
+        launcher = create_launcher_script(dirs["ex"], slug)
+        update_topic(base, slug, model=model_of(client, used), ex_dir=True,
+                     exercises=sum(1 for _ in dirs["ex"].glob("*-ex[0-9][0-9].md")))
+        record_exercise_files(base, slug, dirs["ex"], files, before_mtime, removed)
+        index_files(base, files)
     return files, launcher
+
+
+def _numbered(chunk: ExerciseChunk) -> str:
+    """Aligne l'en-tête EXnn sur la position (le fichier porte le numéro de position)."""
+    return chunk.text if chunk.number == chunk.index else renumber_exercise(chunk.text, chunk.index)
+
+
+def _report(topic: str, splitter: ExerciseSplitter) -> None:
+    for issue in splitter.issues:
+        log.warning("%s : %s", topic, issue)
+
+
+def _is_dup(index: FingerprintIndex, topic: str, name: str, text: str) -> bool:
+    match = index.check(name, text)
+    if match:
+        log.warning("%s : %s doublon de %s (similarité %.2f)", topic, name, match[0], match[1])
+    return match is not None
+
+
+def _regenerate(client: object, topic: str, i: int, avoid: List[str]) -> Optional[str]:
+    """Une seule quête EXi (hors cache), en signalant les titres déjà couverts."""
+    prompt = build_exercises_prompt(topic, 1, start=i, avoid=avoid)
+    splitter = ExerciseSplitter(start=i)
+    content = client.generate(input_text=prompt, use_cache=False) or ""
+    chunks = splitter.feed(content) + splitter.close()
+    return renumber_exercise(chunks[0].text, i) if chunks else None
+
+
+def _regenerate_all(client: object, topic: str, numbers: List[int], avoid: List[str]) -> List[Optional[str]]:
+    """Régénérations en parallèle (une quête par appel), dans l'ordre de numbers."""
+    if not numbers:
+        return []
+    contexts = [contextvars.copy_context() for _ in numbers]
+    with ThreadPoolExecutor(max_workers=min(len(numbers), 8), thread_name_prefix="exercises") as pool:
+        return list(pool.map(lambda ctx, i: ctx.run(_regenerate, client, topic, i, avoid), contexts, numbers))
+
+
+def _generate_streamed(client: object, topic: str, n: int, base: Path, ex_dir: Path, date_str: str,
+                       on_file: Optional[Callable[[Path], None]], index: Optional[FingerprintIndex],
+                       use_cache: bool = True) -> Tuple[List[Optional[str]], List[int], List[int]]:
+    """
+    Écrit EX01..EXnn au fil du flux ; un doublon n'est pas écrit.
+    Retourne (blocs, numéros déjà écrits, numéros en doublon).
+    """
+    splitter = ExerciseSplitter()
+    chunks: List[Optional[str]] = []
+    written: List[int] = []
+    dups: List[int] = []
+    kwargs = {} if use_cache else {"use_cache": False}
+    deltas = client.stream(input_text=build_exercises_prompt(topic, n), **kwargs)
+    for chunk in iter_exercises(deltas, splitter):
+        if chunk.index > n:
+            splitter.issues.append(f"EX{chunk.number:02d} : au-delà des {n} demandés, ignoré")
+            continue
+        text = _numbered(chunk)
+        path = ex_dir / exercise_file_name(date_str, chunk.index)
+        if index is not None and _is_dup(index, topic, path.name, text):
+            chunks.append(None)
+            dups.append(chunk.index)
+            continue
+        chunks.append(text)
+        with topic_lock(base, ex_dir.name, "ex"):  # verrou le temps d'une écriture, pas du flux
+            write_text(path, text + "\n", mkdir=False)
+        written.append(chunk.index)
+        if on_file:
+            on_file(path)
+    _report(topic, splitter)
+    return chunks, written, dups
+
+
+def _shards(n: int, size: int = EX_SHARD_SIZE) -> List[Tuple[int, int, str]]:
+    """Découpe 1..n en lots (start, count, niveau) de difficulté croissante."""
+    starts = list(range(1, n + 1, size))
+    return [
+        (start, min(size, n - start + 1), _BANDS[i * len(_BANDS) // len(starts)])
+        for i, start in enumerate(starts)
+    ]
+
+
+def _generate_shard(client: object, topic: str, start: int, count: int, band: str,
+                    use_cache: bool = True) -> List[str]:
+    prompt = build_exercises_prompt(topic, count, start=start, band=band)
+    chunks: List[str] = []
+    for attempt in range(SHARD_ATTEMPTS):
+        # Une réponse tronquée serait resservie par le cache : on le contourne au retry
+        kwargs = {"use_cache": False} if attempt or not use_cache else {}
+        splitter = ExerciseSplitter(start=start)
+        content = client.generate(input_text=prompt, **kwargs) or ""
+        chunks = [c.text for c in splitter.feed(content) + splitter.close()]
+        if len(chunks) >= count:
+            break
+    _report(topic, splitter)
+    return chunks[:count]
+
+
+def _generate_sharded(client: object, topic: str, n: int, use_cache: bool = True) -> List[Optional[str]]:
+    """
+    Génère les lots en parallèle puis recoud EX01..EXnn dans l'ordre.
+    Un exercice manquant d'un lot laisse un trou (None) sans décaler les suivants.
+    """
+    shards = _shards(n)
+    # un contexte copié par lot : les étiquettes de métriques suivent dans les threads
+    contexts = [contextvars.copy_context() for _ in shards]
+    with ThreadPoolExecutor(max_workers=len(shards), thread_name_prefix="exercises") as pool:
+        results = list(pool.map(lambda ctx, s: ctx.run(_generate_shard, client, topic, *s, use_cache),
+                                contexts, shards))
+    slots: List[Optional[str]] = [None] * n
+    for (start, _count, _band), shard_chunks in zip(shards, results):
+        for k, chunk in enumerate(shard_chunks):
+            slots[start - 1 + k] = renumber_exercise(chunk, start + k)
+    return slots
+
+
+def _valid_exercise(ex: object) -> bool:
+    if not isinstance(ex, dict) or any(k not in ex for k in EXERCISE_FIELDS):
+        return False
+    for key, spec in EXERCISE_FIELDS.items():
+        value = ex[key]
+        if spec["type"] == "array":
+            if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+                return False
+        elif not isinstance(value, str):
+            return False
+    return ex["type"] in EXERCISE_TYPES and all(ex[k].strip() for k in ("title", "objective", "input"))
+
+
+def _parse_structured(text: str, count: int) -> List[Optional[dict]]:
+    """count emplacements ; None pour une quête absente ou invalide (JSON tronqué compris)."""
+    try:
+        items = json.loads(text)["exercises"]
+    except (ValueError, TypeError, KeyError):
+        items = []
+    if not isinstance(items, list):
+        items = []
+    slots: List[Optional[dict]] = [None] * count
+    for k, ex in enumerate(items[:count]):
+        if _valid_exercise(ex):
+            slots[k] = ex
+    return slots
+
+
+def _structured_shard(client: object, topic: str, start: int, count: int, band: Optional[str],
+                      use_cache: bool = True) -> List[Optional[dict]]:
+    prompt = build_exercises_prompt(topic, count, start=start, band=band, structured=True)
+    kwargs = {} if use_cache else {"use_cache": False}
+    return _parse_structured(client.generate(input_text=prompt, schema=EXERCISES_SCHEMA, **kwargs) or "", count)
+
+
+def _generate_structured(client: object, topic: str, n: int, use_cache: bool = True) -> List[Optional[dict]]:
+    """
+    Lots JSON en parallèle, puis retry ciblé : seule une quête absente ou invalide
+    est redemandée (lot d'une quête, hors cache), pas le lot entier.
+    """
+    shards = _shards(n)
+    if len(shards) == 1:
+        shards = [(1, n, None)]  # pas de niveau imposé sans découpage (comme le mode texte)
+    band_of = {start + k: band for start, count, band in shards for k in range(count)}
+
+    def run(calls):
+        contexts = [contextvars.copy_context() for _ in calls]
+        with ThreadPoolExecutor(max_workers=len(calls), thread_name_prefix="exercises") as pool:
+            return list(pool.map(lambda ctx, c: ctx.run(_structured_shard, client, topic, *c), contexts, calls))
+
+    slots = [ex for shard in run([(*s, use_cache) for s in shards]) for ex in shard]
+    for _attempt in range(SHARD_ATTEMPTS):
+        bad = [i for i, ex in enumerate(slots, 1) if ex is None]
+        if not bad:
+            break
+        log.warning("%s : %d quête(s) JSON invalide(s), nouvel essai ciblé", topic, len(bad))
+        for i, shard in zip(bad, run([(i, 1, band_of[i], False) for i in bad])):
+            slots[i - 1] = shard[0]
+    return slots
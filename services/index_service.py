@@ -0,0 +1,154 @@
+from __future__ import annotations
+import json
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict
+from utils.helpers import atomic_open
+from utils.locks import file_lock, topic_lock
+
+INDEX_VERSION = 1
+
+
+def index_path(base: Path) -> Path:
+    return base / ".pyreto" / "topics.json"
+
+
+def _transaction(base: Path):
+    """Verrou exclusif (threads + process) autour d'un read-modify-write de l'index."""
+    return file_lock(index_path(base).with_suffix(".lock"))
+
+
+def load_index(base: Path) -> Dict[str, Any]:
+    try:
+        data = json.loads(index_path(base).read_text(encoding="utf-8"))
+        if data.get("version") == INDEX_VERSION:
+            return data
+    except (OSError, ValueError):
+        pass
+    return {"version": INDEX_VERSION, "cheats_mtime": None, "topics": {}}
+
+
+def _save_index(base: Path, data: Dict[str, Any]) -> None:
+    path = index_path(base)
+    with atomic_open(path) as f:
+        # dumps puis write : l'encodeur C (json.dump vers un fichier passe par l'encodeur Python, ~10x plus lent)
+        f.write(json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _scan_topic(base: Path, slug: str) -> Dict[str, Any]:
+    """Métadonnées reconstruites depuis le disque (sujet apparu hors de pyreto)."""
+    cheat = base / "cheatsheets" / slug / f"{slug}.md"
+    ex_dir = base / "exercises" / slug
+    try:
+        st = cheat.stat()
+        size, created = st.st_size, datetime.fromtimestamp(st.st_mtime).isoformat(timespec="seconds")
+    except OSError:
+        size, created = 0, None
+    return {
+        "created": created,
+        "updated": created,
+        "model": None,
+        "exercises": sum(1 for _ in ex_dir.glob("*-ex[0-9][0-9].md")) if ex_dir.is_dir() else 0,
+        "size": size,
+        "ex_dir": ex_dir.is_dir(),
+    }
+
+
+def update_topic(base: Path, slug: str, **meta) -> Dict[str, Any]:
+    """
+    Insère/met à jour l'entrée d'un sujet (created conservé, updated rafraîchi).
+    Réécrit tout topics.json sous un verrou global : O(nombre de sujets) par appel
+    (~7 ms à 1000 sujets, cf. benchmarks.bench_fs) ; les plannings, eux, sont par sujet.
+    """
+    with _transaction(base):
+        data = load_index(base)
+        entry = data["topics"].get(slug) or {"created": _now(), "model": None,
+                                             "exercises": 0, "size": 0, "ex_dir": False}
+        entry.update({k: v for k, v in meta.items() if v is not None})
+        entry.pop("schedule", None)  # ancien format : planning désormais dans schedules/<slug>.json
+        entry["updated"] = _now()
+        data["topics"][slug] = entry
+        _save_index(base, data)
+    return entry
+
+
+def reconcile(base: Path) -> Dict[str, Any]:
+    """
+    Retourne l'index à jour. Si le mtime de base/cheatsheets n'a pas bougé, aucun scan :
+    une seule stat + une lecture. Sinon seuls les sujets ajoutés/supprimés sont traités.
+    """
+    data = load_index(base)
+    root = base / "cheatsheets"
+    try:
+        mtime = root.stat().st_mtime
+    except OSError:
+        return data
+    if data.get("cheats_mtime") == mtime:
+        return data
+
+    with _transaction(base):
+        data = load_index(base)
+        on_disk = {p.name for p in root.iterdir() if p.is_dir()}
+        topics = data["topics"]
+        for slug in set(topics) - on_disk:
+            del topics[slug]
+            schedule_path(base, slug).unlink(missing_ok=True)
+        for slug in on_disk - set(topics):
+            topics[slug] = _scan_topic(base, slug)
+        data["cheats_mtime"] = mtime
+        _save_index(base, data)
+    return data
+
+
+def model_of(client: object | None, used: list[str] | None = None) -> str | None:
+    """
+    Modèle à enregistrer : celui qui a réellement répondu (used, cf. recording_models ;
+    le plus fréquent après un repli partiel), sinon le modèle configuré du client.
+    """
+    if used:
+        return Counter(used).most_common(1)[0][0]
+    model = getattr(getattr(client, "cfg", None), "model", None)
+    return getattr(model, "value", model)
+
+
+def schedule_path(base: Path, slug: str) -> Path:
+    return base / ".pyreto" / "schedules" / f"{slug}.json"
+
+
+def load_schedule(base: Path, slug: str) -> Dict[str, Any] | None:
+    """Planning en cache d'un sujet : {"mtime", "buckets"} ou None."""
+    try:
+        data = json.loads(schedule_path(base, slug).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) and "buckets" in data else None
+
+
+def update_schedule(base: Path, slug: str, mtime: float, buckets: Dict[str, list],
+                    *, merge_if_mtime: float | None = None) -> Dict[str, list]:
+    """
+    Enregistre le planning (date -> fichiers) d'un sujet avec le mtime du dossier d'exercices.
+    Un fichier et un verrou par sujet, hors de topics.json : écrire le planning d'un sujet
+    ne coûte pas O(nombre de sujets) et ne bloque pas les autres sujets.
+    merge_if_mtime : fusionne buckets dans le cache existant s'il était valide à ce mtime
+    (ajout incrémental après create_exercise_files), sinon remplace.
+    """
+    path = schedule_path(base, slug)
+    with topic_lock(base, slug, "schedule"):
+        cached = load_schedule(base, slug)
+        if merge_if_mtime is not None and cached and cached.get("mtime") == merge_if_mtime:
+            merged = {day: set(names) for day, names in cached["buckets"].items()}
+            for day, names in buckets.items():
+                merged.setdefault(day, set()).update(names)
+            buckets = {day: sorted(names) for day, names in merged.items()}
+        elif merge_if_mtime is not None:
+            return {}  # cache absent/périmé : recalcul complet à la prochaine lecture
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with atomic_open(path) as f:
+            f.write(json.dumps({"mtime": mtime, "buckets": buckets}, ensure_ascii=False, separators=(",", ":")))
+    return buckets
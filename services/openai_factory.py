@@ -1,23 +1,106 @@
+import json
+import os
+import threading
+from concurrent.futures import Future
+from pathlib import Path
 from typing import Optional
+from api.cache import ResponseCache
+from api.metrics import MetricsSink
 from api.openai import OpenAIResponder, OpenAIConfig
 
+# Source non interactive : fichier JSON {"model", "instructions", "prompt_id", "prompt_version",
+# "prompt_vars", "enabled", "check", "routes", "budgets", "rpm", "tpm"} et/ou variables PYRETO_MODEL /
+# PYRETO_INSTRUCTIONS. model = "auto" active le routage par tâche (api.routing).
+# rpm / tpm : quotas du compte (requêtes / tokens par minute), respectés côté client (api.ratelimit).
+# "mock" (true ou options de api.mock.MockConfig) / PYRETO_MOCK=1 : LLM factice, sans clé ni réseau.
+CONFIG_PATH = Path.home() / ".config" / "pyreto" / "config.json"
+_CONFIG_KEYS = ("model", "instructions", "prompt_id", "prompt_version", "prompt_vars")
 
-def build_openai_client(self) -> Optional[OpenAIResponder]:
+
+def load_openai_settings(config_path: Optional[Path] = None) -> Optional[dict]:
+    """Réglages OpenAI sans prompt (fichier puis env) ; None si aucune source n'est définie."""
+    path = config_path or Path(os.getenv("PYRETO_CONFIG") or CONFIG_PATH)
+    settings: dict = {}
+    try:
+        settings.update(json.loads(path.read_text(encoding="utf-8")))
+    except (OSError, ValueError):
+        pass
+    for key in ("model", "instructions"):
+        if os.getenv(f"PYRETO_{key.upper()}"):
+            settings[key] = os.getenv(f"PYRETO_{key.upper()}")
+    if os.getenv("PYRETO_MOCK", "") not in ("", "0"):
+        settings.setdefault("mock", True)
+    return settings or None
+
+
+def ask_openai_settings(self) -> Optional[dict]:
     if not self.ask_confirm("Configurer OpenAI maintenant ? (sinon placeholders)", True):
         return None
+    return {
+        "model": self.ask_text("Modèle OpenAI (auto = routage par tâche)", "gpt-5-nano"),
+        "instructions": self.ask_text("Instructions globales", "Tu es concis, précis, et technique."),
+    }
 
-    model = self.ask_text("Modèle OpenAI", "gpt-5-nano")
-    instructions = self.ask_text("Instructions globales", "Tu es concis, précis, et technique.")
-    prompt_id = prompt_version = None
-    prompt_vars = None
 
-    try:
-        return OpenAIResponder(OpenAIConfig(
-            model=model, instructions=instructions,
-            prompt_id=prompt_id, prompt_version=prompt_version, prompt_vars=prompt_vars
-        ))
-
-    except Exception as e:
-        self.console.print(f"[yellow]Client OpenAI non initialisé:[/yellow] {e}\n"
-                           "[yellow]Le script créera des placeholders.[/yellow]")
-        return None
+def _make_client(settings: dict, data_dir: Optional[Path], use_cache: bool) -> OpenAIResponder:
+    """data_dir (<base>/.pyreto) : cache de réponses + journal de métriques."""
+    cache = ResponseCache(data_dir / "cache", enabled=use_cache) if data_dir else None
+    metrics = MetricsSink(data_dir / "metrics.jsonl") if data_dir else None
+    router = None
+    if settings.get("model") == "auto":
+        from api.openai import ModelOPENAI
+        from api.routing import ModelRouter
+        routes = {task: ModelOPENAI(m) for task, m in (settings.get("routes") or {}).items()}
+        router = ModelRouter(routes, settings.get("budgets"))
+        settings = {k: v for k, v in settings.items() if k != "model"}
+    limiter = None
+    if settings.get("rpm") or settings.get("tpm"):
+        from api.ratelimit import RateLimiter
+        limiter = RateLimiter(settings.get("rpm"), settings.get("tpm"))
+    cfg = OpenAIConfig(**{k: settings[k] for k in _CONFIG_KEYS if settings.get(k) is not None})
+    if settings.get("mock"):
+        from api.mock import MockConfig, MockResponder
+        options = settings["mock"] if isinstance(settings["mock"], dict) else {}
+        return MockResponder(MockConfig(**options), cfg, cache=cache, metrics=metrics, router=router,
+                             limiter=limiter)
+    return OpenAIResponder(cfg, cache=cache, metrics=metrics, router=router, limiter=limiter)
+
+
+def start_openai_client(self, data_dir: Optional[Path] = None, *, use_cache: bool = True,
+                        config_path: Optional[Path] = None) -> "Future[Optional[OpenAIResponder]]":
+    """
+    Lance la construction du client en arrière-plan (clé, import du SDK, vérification
+    optionnelle du modèle si "check": true) et retourne un Future.
+    Les questions ne sont posées que si aucune config non interactive n'existe.
+    """
+    settings = load_openai_settings(config_path)
+    if settings is None:
+        settings = ask_openai_settings(self)
+
+    fut: Future = Future()
+    if settings is None or settings.get("enabled") is False:
+        fut.set_result(None)
+        return fut
+
+    def build() -> None:
+        try:
+            client = _make_client(settings, data_dir, use_cache)
+            sdk = client.client  # import du SDK + pool HTTP, hors du thread UI
+            if settings.get("check"):
+                sdk.models.retrieve(getattr(client.cfg.model, "value", client.cfg.model))
+            fut.set_result(client)
+        except BaseException as e:
+            fut.set_exception(e)
+
+    # Thread démon : une vérification réseau bloquée n'empêche pas de quitter
+    threading.Thread(target=build, name="openai-init", daemon=True).start()
+    return fut
+
+
+def build_openai_client_from_env(model: Optional[str] = None, data_dir: Optional[Path] = None,
+                                 *, use_cache: bool = True) -> OpenAIResponder:
+    """Variante non interactive (batch) : lève RuntimeError si la clé API est absente."""
+    settings = load_openai_settings() or {}
+    if model:
+        settings["model"] = model
+    return _make_client(settings, data_dir, use_cache)
@@ -1,22 +1,92 @@
 from __future__ import annotations
+from datetime import date, timedelta
+import os
 from pathlib import Path
 import re
-from typing import List, Tuple
+from typing import Collection, Dict, List, Optional, Tuple
+from services.index_service import load_schedule, reconcile, update_schedule
+from utils.helpers import safe_slug
+
+_EX_NAME = re.compile(r"(\d{4}-\d{2}-\d{2})-ex\d{2}\.(?:md|txt)$")
+
+
+def scan_schedule(ex_dir: Path) -> Dict[str, list[str]]:
+    """Un seul passage scandir : date -> noms (.md prioritaire sur un .txt de même nom)."""
+    buckets: dict[str, set[str]] = {}
+    with os.scandir(ex_dir) as it:
+        for e in it:
+            m = _EX_NAME.match(e.name)
+            if m:
+                buckets.setdefault(m.group(1), set()).add(e.name)
+    out: dict[str, list[str]] = {}
+    for day, names in buckets.items():
+        out[day] = sorted(n for n in names
+                          if n.endswith(".md") or n[:-4] + ".md" not in names)
+    return out
 
 
 def build_schedule(base: Path, topic: str) -> List[Tuple[str, list[str]]]:
     """
     Regroupe <base>/exercises/<slug>/* par date dans le nom: YYYY-MM-DD-exNN.md|txt
+    Le résultat est mis en cache par sujet, invalidé par le mtime du dossier.
+    """
+    return topic_schedule(base, safe_slug(topic))
+
+
+def topic_schedule(base: Path, slug: str) -> List[Tuple[str, list[str]]]:
+    """
+    Planning d'un sujet : le cache n'est servi que si le mtime du dossier n'a pas bougé
+    (un stat), sinon un scandir le recalcule.
     """
-    from utils.helpers import safe_slug
-    slug = safe_slug(topic)
     ex_dir = base / "exercises" / slug
-    if not ex_dir.exists():
+    try:
+        mtime = ex_dir.stat().st_mtime
+    except OSError:
         return []
+    cached = load_schedule(base, slug)
+    if cached and cached.get("mtime") == mtime:
+        buckets = cached["buckets"]
+    else:
+        buckets = scan_schedule(ex_dir)
+        update_schedule(base, slug, mtime, buckets)
+    return sorted((k, list(v)) for k, v in buckets.items())
+
+
+def record_exercise_files(base: Path, slug: str, ex_dir: Path, files: List[Path],
+                          before_mtime: Optional[float], removed: Collection[str] = ()) -> None:
+    """
+    Ajoute des fichiers fraîchement créés au planning en cache, sans rescanner le dossier.
+    Si le cache n'était pas à jour avant l'écriture (dossier modifié à la main…) ou si des
+    fichiers ont été supprimés (removed : la fusion ne sait qu'ajouter), un scandir complet
+    le remplace : il ne reste jamais de planning périmé dans l'index.
+    """
     buckets: dict[str, list[str]] = {}
-    files = sorted(ex_dir.glob("*.md")) or sorted(ex_dir.glob("*.txt"))
     for f in files:
-        m = re.match(r"(\d{4}-\d{2}-\d{2})-ex\d{2}\.(?:md|txt)$", f.name)
+        m = _EX_NAME.match(f.name)
         if m:
             buckets.setdefault(m.group(1), []).append(f.name)
-    return sorted((k, sorted(v)) for k, v in buckets.items())
+    mtime = ex_dir.stat().st_mtime
+    if removed or not update_schedule(base, slug, mtime, buckets, merge_if_mtime=before_mtime):
+        update_schedule(base, slug, mtime, scan_schedule(ex_dir))
+
+
+def schedule_between(base: Path, start: date, end: date) -> List[Tuple[str, str, list[str]]]:
+    """
+    Planning tous sujets confondus entre start et end inclus : [(date, slug, fichiers)].
+    Lit l'index, puis un stat et le planning en cache de chaque sujet ; seuls les sujets dont
+    le dossier a changé sont rescannés.
+    """
+    lo, hi = start.isoformat(), end.isoformat()
+    rows: list[tuple[str, str, list[str]]] = []
+    for slug, meta in reconcile(base)["topics"].items():
+        if not meta.get("ex_dir"):
+            continue
+        items = topic_schedule(base, slug)
+        rows.extend((day, slug, list(names)) for day, names in items if lo <= day <= hi)
+    return sorted(rows)
+
+
+def schedule_this_week(base: Path, today: Optional[date] = None) -> List[Tuple[str, str, list[str]]]:
+    today = today or date.today()
+    monday = today - timedelta(days=today.weekday())
+    return schedule_between(base, monday, monday + timedelta(days=6))
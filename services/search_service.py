@@ -0,0 +1,194 @@
+from __future__ import annotations
+import logging
+import os
+import re
+import sqlite3
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+log = logging.getLogger(__name__)
+
+# Index plein texte (SQLite FTS5) des fiches et exercices, dans <base>/.pyreto/search.db.
+# docs garde (mtime, taille) par fichier : sync() ne relit que ce qui a changé sur disque.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL, topic TEXT, kind TEXT,
+    mtime REAL, size INTEGER
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS fts USING fts5(
+    title, body, tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+_KINDS = {"cheatsheets": "cheat", "exercises": "ex"}
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+# Marqueurs de surlignage des extraits (convertis en style par la vue)
+HL_START, HL_END = "\x02", "\x03"
+
+
+@dataclass
+class SearchHit:
+    path: Path
+    topic: str
+    kind: str  # "cheat" | "ex"
+    title: str
+    snippet: str
+    score: float
+
+
+def search_db_path(base: Path) -> Path:
+    return base / ".pyreto" / "search.db"
+
+
+def _connect(base: Path) -> sqlite3.Connection:
+    path = search_db_path(base)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=10)
+    conn.execute("PRAGMA journal_mode=WAL")  # lectures non bloquées par l'écriture d'un batch
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _describe(base: Path, path: Path) -> Optional[tuple[str, str]]:
+    """(topic, kind) d'un fichier de base/cheatsheets|exercises/<slug>/… ; None hors périmètre."""
+    try:
+        kind_dir, topic = path.relative_to(base).parts[:2]
+    except ValueError:
+        return None
+    kind = _KINDS.get(kind_dir)
+    return (topic, kind) if kind and path.suffix == ".md" else None
+
+
+def _title(text: str, fallback: str) -> str:
+    for line in text.splitlines():
+        if line.startswith("#") and line.strip("# =").strip():
+            return line.lstrip("#").strip()
+    return fallback
+
+
+def _upsert(conn: sqlite3.Connection, base: Path, path: Path, st: os.stat_result) -> None:
+    described = _describe(base, path)
+    if described is None:
+        return
+    try:
+        text = path.read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return
+    row = conn.execute("SELECT id FROM docs WHERE path = ?", (str(path),)).fetchone()
+    if row:
+        conn.execute("UPDATE docs SET mtime = ?, size = ? WHERE id = ?", (st.st_mtime, st.st_size, row[0]))
+        conn.execute("DELETE FROM fts WHERE rowid = ?", (row[0],))
+        doc_id = row[0]
+    else:
+        doc_id = conn.execute("INSERT INTO docs (path, topic, kind, mtime, size) VALUES (?, ?, ?, ?, ?)",
+                              (str(path), *described, st.st_mtime, st.st_size)).lastrowid
+    conn.execute("INSERT INTO fts (rowid, title, body) VALUES (?, ?, ?)",
+                 (doc_id, _title(text, path.stem), text))
+
+
+def _delete(conn: sqlite3.Connection, doc_id: int) -> None:
+    conn.execute("DELETE FROM fts WHERE rowid = ?", (doc_id,))
+    conn.execute("DELETE FROM docs WHERE id = ?", (doc_id,))
+
+
+def index_files(base: Path, paths: Iterable[Path]) -> None:
+    """
+    Mise à jour incrémentale après écriture (appelée par les services).
+    Une erreur SQLite est journalisée sans faire échouer la génération : sync() rattrapera.
+    """
+    try:
+        with closing(_connect(base)) as conn, conn:
+            for p in paths:
+                try:
+                    st = p.stat()
+                except OSError:
+                    continue
+                _upsert(conn, base, p, st)
+    except sqlite3.Error as e:
+        log.warning("Index de recherche non mis à jour : %s", e)
+
+
+def _scan(base: Path) -> dict[str, os.stat_result]:
+    """Fichiers .md sous cheatsheets/ et exercises/ (scandir, un niveau de sujets)."""
+    found: dict[str, os.stat_result] = {}
+    for kind_dir in _KINDS:
+        root = base / kind_dir
+        try:
+            with os.scandir(root) as it:
+                topics = [e.path for e in it if e.is_dir()]
+        except OSError:
+            continue
+        for topic in topics:
+            with os.scandir(topic) as it:
+                for e in it:
+                    if e.name.endswith(".md") and e.is_file():
+                        found[e.path] = e.stat()
+    return found
+
+
+def sync(base: Path) -> dict[str, int]:
+    """Rattrape les fichiers ajoutés, modifiés (mtime/taille) ou supprimés hors de pyreto."""
+    on_disk = _scan(base)
+    added = updated = removed = 0
+    with closing(_connect(base)) as conn, conn:
+        known = {path: (doc_id, mtime, size)
+                 for doc_id, path, mtime, size in conn.execute("SELECT id, path, mtime, size FROM docs")}
+        for path, (doc_id, mtime, size) in known.items():
+            if path not in on_disk:
+                _delete(conn, doc_id)
+                removed += 1
+        for path, st in on_disk.items():
+            prev = known.get(path)
+            if prev and prev[1] == st.st_mtime and prev[2] == st.st_size:
+                continue
+            _upsert(conn, base, Path(path), st)
+            if prev:
+                updated += 1
+            else:
+                added += 1
+    return {"added": added, "updated": updated, "removed": removed, "total": len(on_disk)}
+
+
+def ensure_index(base: Path) -> None:
+    """Construit l'index au premier usage (base existante, jamais indexée)."""
+    with closing(_connect(base)) as conn:
+        empty = conn.execute("SELECT 1 FROM docs LIMIT 1").fetchone() is None
+    if empty:
+        sync(base)
+
+
+def _fts_query(query: str) -> str:
+    """Saisie libre -> requête FTS5 sûre : tous les mots (ET), le dernier en préfixe."""
+    tokens = _TOKEN.findall(query)
+    if not tokens:
+        return ""
+    terms = [f'"{t}"' for t in tokens[:-1]] + [f'"{tokens[-1]}"*']
+    return " ".join(terms)
+
+
+def search(base: Path, query: str, *, limit: int = 20, topic: Optional[str] = None,
+           kind: Optional[str] = None) -> List[SearchHit]:
+    """Résultats classés par BM25 (titre pondéré x5), avec extrait surligné (HL_START/HL_END)."""
+    match = _fts_query(query)
+    if not match:
+        return []
+    sql = (
+        "SELECT d.path, d.topic, d.kind, fts.title, "
+        f"snippet(fts, 1, '{HL_START}', '{HL_END}', '…', 12), bm25(fts, 5.0, 1.0) AS score "
+        "FROM fts JOIN docs d ON d.id = fts.rowid WHERE fts MATCH ?"
+    )
+    params: list = [match]
+    if topic:
+        sql += " AND d.topic = ?"
+        params.append(topic)
+    if kind:
+        sql += " AND d.kind = ?"
+        params.append(kind)
+    sql += " ORDER BY score LIMIT ?"
+    params.append(limit)
+    with closing(_connect(base)) as conn:
+        rows = conn.execute(sql, params).fetchall()
+    return [SearchHit(Path(p), t, k, title, " ".join(snip.split()), -score)
+            for p, t, k, title, snip, score in rows]
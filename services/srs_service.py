@@ -0,0 +1,130 @@
+from __future__ import annotations
+import heapq
+import json
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from services.attempts_service import record_attempt
+from services.index_service import reconcile
+from services.schedule_service import topic_schedule
+from utils.helpers import atomic_open
+
+DAY = 24 * 3600
+# Statuts de tentative -> qualité SM-2 (0..5) ; "skip" ne fait que reporter d'un jour
+QUALITY = {"pass": 4, "fail": 1}
+
+
+@dataclass
+class Card:
+    ef: float = 2.5       # facteur de facilité SM-2
+    interval: int = 0     # en jours
+    reps: int = 0         # répétitions réussies consécutives
+    due: float = 0.0      # timestamp de prochaine révision
+
+
+def review(card: Card, status: str, now: float) -> Card:
+    """Applique une tentative à une carte (SM-2)."""
+    if status not in QUALITY:
+        return Card(card.ef, card.interval, card.reps, now + DAY)
+    q = QUALITY[status]
+    if q < 3:
+        reps, interval = 0, 1
+    else:
+        reps = card.reps + 1
+        interval = 1 if reps == 1 else 6 if reps == 2 else round(card.interval * card.ef)
+    ef = max(1.3, card.ef + 0.1 - (5 - q) * (0.08 + (5 - q) * 0.02))
+    return Card(ef, interval, reps, now + interval * DAY)
+
+
+class SRSEngine:
+    """
+    Cartes de révision pour tous les exercices de tous les sujets.
+    État persistant : <base>/.pyreto/srs.json ; file de priorité (heap) sur l'échéance,
+    « qu'est-ce qui est dû ? » = O(log n) par pop. Suppression paresseuse des entrées périmées.
+    """
+
+    def __init__(self, base: Path) -> None:
+        self.base = base
+        self.cards: Dict[str, Card] = {}
+        self._heap: List[Tuple[float, str]] = []
+
+    @property
+    def path(self) -> Path:
+        return self.base / ".pyreto" / "srs.json"
+
+    @classmethod
+    def load(cls, base: Path) -> "SRSEngine":
+        eng = cls(base)
+        try:
+            raw = json.loads(eng.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            raw = {}
+        eng.cards = {key: Card(**c) for key, c in raw.get("cards", {}).items()}
+        eng.sync()
+        return eng
+
+    def sync(self) -> int:
+        """Ajoute les exercices inconnus (via l'index / planning en cache), dus à leur date de création."""
+        added = 0
+        for slug, meta in reconcile(self.base)["topics"].items():
+            if not meta.get("ex_dir"):
+                continue
+            for day, names in topic_schedule(self.base, slug):
+                created = time.mktime(time.strptime(day, "%Y-%m-%d"))
+                for name in names:
+                    key = f"{slug}/{name}"
+                    if key not in self.cards:
+                        self.cards[key] = Card(due=created)
+                        added += 1
+        self._heap = [(c.due, key) for key, c in self.cards.items()]
+        heapq.heapify(self._heap)
+        if added:
+            self.save()
+        return added
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"cards": {key: asdict(c) for key, c in self.cards.items()}}
+        with atomic_open(self.path) as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+
+    def _top(self) -> Optional[Tuple[float, str]]:
+        while self._heap:
+            due, key = self._heap[0]
+            card = self.cards.get(key)
+            if card is not None and card.due == due:
+                return due, key
+            heapq.heappop(self._heap)  # entrée périmée (carte revue depuis)
+        return None
+
+    def next_due(self, now: Optional[float] = None) -> Optional[Tuple[str, str]]:
+        """(slug, fichier) le plus en retard si dû à `now`, sinon None."""
+        top = self._top()
+        if top is None or top[0] > (now if now is not None else time.time()):
+            return None
+        slug, name = top[1].split("/", 1)
+        return slug, name
+
+    def next_due_at(self) -> Optional[float]:
+        top = self._top()
+        return top[0] if top else None
+
+    def due_count(self, now: Optional[float] = None) -> int:
+        now = now if now is not None else time.time()
+        return sum(1 for c in self.cards.values() if c.due <= now)
+
+    def exercise_path(self, slug: str, name: str) -> Path:
+        return self.base / "exercises" / slug / name
+
+    def record(self, slug: str, name: str, status: str, *, duration_sec: Optional[int] = None,
+               now: Optional[float] = None) -> Card:
+        now = now if now is not None else time.time()
+        key = f"{slug}/{name}"
+        card = review(self.cards.get(key, Card(due=now)), status, now)
+        self.cards[key] = card
+        heapq.heappush(self._heap, (card.due, key))
+        record_attempt(self.base, slug, name, status, duration_sec=duration_sec,
+                       ef=round(card.ef, 3), interval=card.interval)
+        self.save()
+        return card
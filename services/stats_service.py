@@ -0,0 +1,52 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Dict, Iterable, List
+from api.metrics import MetricsSink
+
+
+def metrics_path(base: Path) -> Path:
+    return base / ".pyreto" / "metrics.jsonl"
+
+
+def _percentile(values: List[float], q: float) -> float | None:
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def _aggregate(rows: Iterable[dict], key: str) -> Dict[str, dict]:
+    groups: dict[str, dict] = {}
+    for r in rows:
+        g = groups.setdefault(r.get(key) or "-", {
+            "calls": 0, "errors": 0, "hits": 0, "latencies": [], "ttfts": [], "queues": [],
+            "input_tokens": 0, "output_tokens": 0, "reasoning_tokens": 0, "cached_tokens": 0,
+        })
+        g["calls"] += 1
+        g["errors"] += 1 if r.get("error") else 0
+        g["hits"] += 1 if r.get("cache") == "hit" else 0
+        if r.get("cache") != "hit" and not r.get("error"):
+            g["latencies"].append(r.get("latency_s") or 0.0)
+            if r.get("ttft_s") is not None:
+                g["ttfts"].append(r["ttft_s"])
+        if r.get("queue_s") is not None:
+            g["queues"].append(r["queue_s"])
+        for k in ("input_tokens", "output_tokens", "reasoning_tokens", "cached_tokens"):
+            g[k] += r.get(k) or 0
+    for g in groups.values():
+        lat, ttft, queue = g.pop("latencies"), g.pop("ttfts"), g.pop("queues")
+        g["p50_s"] = _percentile(lat, 0.5)
+        g["p95_s"] = _percentile(lat, 0.95)
+        g["ttft_p50_s"] = _percentile(ttft, 0.5)
+        g["queue_p95_s"] = _percentile(queue, 0.95)  # attente du limiteur de débit
+        g["hit_rate"] = g["hits"] / g["calls"] if g["calls"] else 0.0
+    return groups
+
+
+def summarize_metrics(base: Path) -> Dict[str, Dict[str, dict]]:
+    """Agrégats des appels LLM par modèle, par sujet et par voie (latences hors hits de cache)."""
+    rows = list(MetricsSink(metrics_path(base)).read())
+    for r in rows:
+        r.setdefault("lane", "interactive")
+    return {"model": _aggregate(rows, "model"), "topic": _aggregate(rows, "topic"),
+            "lane": _aggregate(rows, "lane")}
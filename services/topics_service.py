@@ -1,6 +1,20 @@
 from __future__ import annotations
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Any, Dict, List, Tuple, Optional
+from services.index_service import reconcile
+
+
+def list_topic_entries(base: Path) -> List[Tuple[str, Path, Optional[Path], Dict[str, Any]]]:
+    """
+    Comme list_topics, avec les métadonnées de l'index (created, updated, model, exercises, size).
+    Lu depuis <base>/.pyreto/topics.json, réconcilié sur le mtime de base/cheatsheets.
+    """
+    topics = reconcile(base)["topics"]
+    return [
+        (slug, base / "cheatsheets" / slug / f"{slug}.md",
+         base / "exercises" / slug if meta.get("ex_dir") else None, meta)
+        for slug, meta in sorted(topics.items())
+    ]
 
 
 def list_topics(base: Path) -> List[Tuple[str, Path, Optional[Path]]]:
@@ -8,13 +22,4 @@ def list_topics(base: Path) -> List[Tuple[str, Path, Optional[Path]]]:
     Retourne [(slug, cheat_path, ex_dir_or_None)] en Paths.
     Convention: cheat = base/cheatsheets/<slug>/<slug>.md, ex_dir = base/exercises/<slug>
     """
-    results: list[tuple[str, Path, Optional[Path]]] = []
-    root = base / "cheatsheets"
-    if not root.exists():
-        return results
-    for tdir in sorted(p for p in root.iterdir() if p.is_dir()):
-        slug = tdir.name
-        cheat = tdir / f"{slug}.md"
-        ex_dir = base / "exercises" / slug
-        results.append((slug, cheat, ex_dir if ex_dir.exists() else None))
-    return results
+    return [(slug, cheat, ex_dir) for slug, cheat, ex_dir, _meta in list_topic_entries(base)]
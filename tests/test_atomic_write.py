@@ -0,0 +1,53 @@
+import os
+import stat
+
+import pytest
+
+from utils import helpers
+from utils.helpers import atomic_open, set_durability, write_many, write_text
+
+
+def _mode(path):
+    return stat.S_IMODE(path.stat().st_mode)
+
+
+def test_failed_write_keeps_previous_content_and_no_temp(tmp_path):
+    path = tmp_path / "fiche.md"
+    write_text(path, "v1\n")
+    with pytest.raises(RuntimeError):
+        with atomic_open(path) as f:
+            f.write("v2 partiel")
+            raise RuntimeError("coupure")
+    assert path.read_text(encoding="utf-8") == "v1\n"
+    assert os.listdir(tmp_path) == ["fiche.md"]
+
+
+def test_new_file_follows_umask(tmp_path):
+    old = os.umask(0o027)
+    try:
+        write_text(tmp_path / "a.md", "x")
+    finally:
+        os.umask(old)
+    assert _mode(tmp_path / "a.md") == 0o640
+
+
+def test_rewrite_keeps_target_mode(tmp_path):
+    path = tmp_path / "run.sh"
+    write_text(path, "#!/bin/sh\n")
+    path.chmod(0o755)
+    write_text(path, "#!/bin/sh\necho ok\n")
+    assert _mode(path) == 0o755
+
+
+@pytest.mark.parametrize("level, file_syncs, dir_syncs", [("none", 0, 0), ("file", 3, 0), ("full", 3, 1)])
+def test_durability_levels(tmp_path, monkeypatch, level, file_syncs, dir_syncs):
+    fsyncs, dir_fsyncs = [], []
+    monkeypatch.setattr(helpers.os, "fsync", fsyncs.append)
+    monkeypatch.setattr(helpers, "_fsync_dir", dir_fsyncs.append)
+    write_many(tmp_path, [(f"ex{i}.md", "x") for i in range(3)], durability=level)
+    assert (len(fsyncs), len(dir_fsyncs)) == (file_syncs, dir_syncs)
+
+
+def test_unknown_durability_is_rejected():
+    with pytest.raises(ValueError):
+        set_durability("disque")
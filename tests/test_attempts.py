@@ -0,0 +1,66 @@
+import threading
+
+from services import attempts_service
+from services.attempts_service import (
+    attempts_log_path, compact, iter_attempts, last_attempts, practiced_topics, record_attempt,
+    snapshot_path, success_rate, summarize,
+)
+
+
+def _record(base, statuses, slug="git", exercise="ex01.md"):
+    for status in statuses:
+        record_attempt(base, slug, exercise, status)
+
+
+def test_summary_aggregates_per_exercise(tmp_path):
+    _record(tmp_path, ["fail", "fail", "pass"])
+    _record(tmp_path, ["skip"], exercise="ex02.md")
+    exercises = summarize(tmp_path, "git")["exercises"]
+    assert {k: v for k, v in exercises["ex01.md"].items() if k != "last_ts"} == {
+        "attempts": 3, "pass": 1, "fail": 2, "skip": 0, "last_status": "pass"}
+    assert last_attempts(tmp_path, "git")["ex02.md"]["status"] == "skip"
+    assert success_rate(tmp_path, "git") == 1 / 3
+    assert success_rate(tmp_path, "sql") is None
+
+
+def test_compaction_keeps_the_same_summary_and_reads_only_the_tail(tmp_path):
+    _record(tmp_path, ["pass", "fail"])
+    snap = compact(tmp_path, "git")
+    assert snap["offset"] == attempts_log_path(tmp_path, "git").stat().st_size
+    _record(tmp_path, ["pass"])
+    assert list(iter_attempts(tmp_path, "git", offset=snap["offset"]))[0]["status"] == "pass"
+    assert summarize(tmp_path, "git")["exercises"]["ex01.md"]["attempts"] == 3
+
+
+def test_record_compacts_past_the_threshold(tmp_path, monkeypatch):
+    monkeypatch.setattr(attempts_service, "COMPACT_BYTES", 500)
+    _record(tmp_path, ["pass"] * 10)
+    assert snapshot_path(tmp_path, "git").exists()
+    assert summarize(tmp_path, "git")["exercises"]["ex01.md"]["pass"] == 10
+
+
+def test_truncated_log_invalidates_the_snapshot(tmp_path):
+    _record(tmp_path, ["pass"] * 3)
+    compact(tmp_path, "git")
+    attempts_log_path(tmp_path, "git").write_text("", encoding="utf-8")  # journal remplacé
+    _record(tmp_path, ["fail"])
+    assert summarize(tmp_path, "git")["exercises"]["ex01.md"]["attempts"] == 1
+
+
+def test_corrupt_and_partial_lines_are_skipped(tmp_path):
+    _record(tmp_path, ["pass"])
+    with attempts_log_path(tmp_path, "git").open("a", encoding="utf-8") as f:
+        f.write("{pas du json\n")
+        f.write('{"exercise": "ex01.md", "status": "fail"')  # écriture interrompue
+    assert [row["status"] for row in iter_attempts(tmp_path, "git")] == ["pass"]
+
+
+def test_concurrent_records_are_all_kept(tmp_path, monkeypatch):
+    monkeypatch.setattr(attempts_service, "COMPACT_BYTES", 2000)
+    threads = [threading.Thread(target=_record, args=(tmp_path, ["pass"] * 25)) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert summarize(tmp_path, "git")["exercises"]["ex01.md"]["pass"] == 100
+    assert practiced_topics(tmp_path) == ["git"]
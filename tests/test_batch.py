@@ -0,0 +1,32 @@
+import pytest
+
+from api.mock import MockConfig, MockResponder
+from services.batch_service import is_topic_complete, run_batch
+from services.cheatsheet_service import generate_cheatsheet
+
+
+def _cheat(base, slug="git"):
+    return base / "cheatsheets" / slug / f"{slug}.md"
+
+
+@pytest.mark.parametrize("header", [
+    "# git — Cheat Sheet Pareto (PLACEHOLDER)",
+    "# git — Cheat Sheet (vide)",
+    "",
+])
+def test_unfinished_cheatsheet_is_not_done(tmp_path, header):
+    _cheat(tmp_path).parent.mkdir(parents=True)
+    _cheat(tmp_path).write_text(header + "\n", encoding="utf-8")
+    assert not is_topic_complete(tmp_path, "git", n=0)
+
+
+def test_empty_llm_answer_is_retried_by_the_next_batch(tmp_path):
+    empty = MockResponder(MockConfig(latency=0, canned={"cheat sheet Pareto": ""}))
+    generate_cheatsheet(tmp_path, "git", client=empty)
+    assert _cheat(tmp_path).read_text(encoding="utf-8") == "# git — Cheat Sheet (vide)\n"
+
+    client = MockResponder(MockConfig(latency=0))
+    report = run_batch(tmp_path, ["git"], client=client, n=1, jobs=1)
+    assert report.done == ["git"]
+    assert "(vide)" not in _cheat(tmp_path).read_text(encoding="utf-8")
+    assert is_topic_complete(tmp_path, "git", n=1)
@@ -0,0 +1,85 @@
+import os
+import time
+
+import pytest
+
+from api.cache import ResponseCache
+
+
+def _disk_size(cache):
+    return sum(p.stat().st_size for p in cache.root.glob("*/*.json"))
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.delenv("PYRETO_NO_CACHE", raising=False)
+    return ResponseCache(tmp_path / "cache")
+
+
+def test_put_then_get_counts_hits_and_misses(cache):
+    key = ResponseCache.make_key(model="m", input="bonjour")
+    assert cache.get(key) is None
+    cache.put(key, "salut", model="m")
+    assert cache.get(key) == "salut"
+    assert cache.stats() == {"hits": 1, "misses": 1, "enabled": True}
+
+
+def test_make_key_ignores_argument_order():
+    assert ResponseCache.make_key(a=1, b=2) == ResponseCache.make_key(b=2, a=1)
+    assert ResponseCache.make_key(a=1) != ResponseCache.make_key(a=2)
+
+
+def test_expired_entry_is_a_miss_and_is_removed(cache, monkeypatch):
+    cache.ttl = 60
+    cache.put("ab" * 32, "vieux")
+    path = cache._path("ab" * 32)
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+    assert cache.get("ab" * 32) is None
+    assert not path.exists()
+    assert cache._size == _disk_size(cache) == 0
+
+
+def test_eviction_drops_least_recently_used(cache):
+    keys = [f"{i:02d}" * 32 for i in range(5)]
+    for i, key in enumerate(keys):
+        cache.put(key, "x" * 1000)
+        os.utime(cache._path(key), (time.time() - 100 + i,) * 2)
+    cache.get(keys[0])  # hit : redevient le plus récent
+    cache.max_bytes = 4 * cache._path(keys[0]).stat().st_size  # ~90 % : 3 entrées gardées
+    cache.put("ff" * 32, "x" * 1000)
+    assert [cache._path(k).exists() for k in keys] == [True, False, False, False, True]
+    assert cache._size == _disk_size(cache) <= cache.max_bytes
+
+
+def test_size_tracks_rewrites_of_the_same_key(cache):
+    for i in range(20):
+        cache.put("cd" * 32, "y" * (100 + i))
+    assert cache._size == _disk_size(cache)
+
+
+def test_lazy_size_tolerates_entries_vanishing(cache, monkeypatch):
+    cache.put("aa" * 32, "un")
+    cache._size = None  # autre instance / process : taille à recalculer
+    gone = cache.root / "zz" / ("zz" * 32 + ".json")
+    listed = cache._entries
+    monkeypatch.setattr(cache, "_entries", lambda: listed() + [gone])
+    cache.put("bb" * 32, "deux")
+    assert cache._size == cache._path("aa" * 32).stat().st_size + cache._path("bb" * 32).stat().st_size
+
+
+def test_failed_replace_leaves_no_temp_file(cache, monkeypatch):
+    def fail(src, dst):
+        raise OSError("disque plein")
+
+    monkeypatch.setattr(os, "replace", fail)
+    with pytest.raises(OSError):
+        cache.put("ee" * 32, "perdu")
+    assert list(cache.root.rglob("*.tmp")) == []
+
+
+def test_disabled_cache_is_a_bypass(tmp_path):
+    cache = ResponseCache(tmp_path / "cache", enabled=False)
+    cache.put("ab" * 32, "rien")
+    assert cache.get("ab" * 32) is None
+    assert not (tmp_path / "cache").exists()
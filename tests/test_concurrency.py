@@ -0,0 +1,75 @@
+import threading
+import time
+
+import pytest
+
+from api.mock import MockConfig, MockResponder
+from services.cheatsheet_service import generate_cheatsheet
+from services.course_service import generate_course
+from services.index_service import load_index
+
+LATENCY = 0.4
+
+
+@pytest.fixture
+def client():
+    return MockResponder(MockConfig(latency=LATENCY, jitter=0, tokens_per_sec=0))
+
+
+def test_course_runs_cheatsheet_and_exercises_in_parallel(tmp_path, client):
+    start = time.perf_counter()
+    result = generate_course(tmp_path, "git", client=client)
+    elapsed = time.perf_counter() - start
+    assert result["cheatsheet"].exists()
+    assert elapsed < 1.6 * LATENCY  # en série : ≥ 2 × latence
+    assert client.llm.calls == 2
+
+
+def test_identical_concurrent_cheatsheets_share_one_llm_call(tmp_path, client):
+    barrier = threading.Barrier(2)
+
+    def run():
+        barrier.wait()
+        generate_cheatsheet(tmp_path, "git", client=client)
+
+    threads = [threading.Thread(target=run) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert client.llm.calls == 1
+    assert client._flights.shared == 1
+    assert (tmp_path / "cheatsheets" / "git" / "git.md").read_text(encoding="utf-8").strip()
+
+
+def test_identical_concurrent_streamed_cheatsheets_share_one_llm_call(tmp_path):
+    client = MockResponder(MockConfig(latency=LATENCY, jitter=0, tokens_per_sec=2000))
+    barrier = threading.Barrier(2)
+    received = [[], []]
+
+    def run(k):
+        barrier.wait()
+        generate_cheatsheet(tmp_path, "git", client=client, on_delta=received[k].append)
+
+    threads = [threading.Thread(target=run, args=(k,)) for k in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert client.llm.calls == 1
+    assert "".join(received[0]) == "".join(received[1])  # le suiveur reçoit le texte en un morceau
+    path = tmp_path / "cheatsheets" / "git" / "git.md"
+    assert path.read_text(encoding="utf-8") == "".join(received[0]) + "\n"
+    assert load_index(tmp_path)["topics"]["git"]["size"] == path.stat().st_size
+
+
+def test_abandoned_stream_releases_followers():
+    client = MockResponder(MockConfig(latency=0, tokens_per_sec=2000))
+    stream = client.stream(input_text="bonjour")
+    next(stream)
+    fut, leader = client._flights.begin(client._request_key(client._build_kwargs("bonjour")))
+    assert not leader
+    stream.close()
+    with pytest.raises(RuntimeError):
+        fut.result(timeout=1)
+    assert "".join(client.stream(input_text="bonjour"))
@@ -0,0 +1,65 @@
+from datetime import date
+
+from api.mock import MockConfig, MockResponder
+from services.dedup_service import DUP_SIMILARITY, FingerprintIndex
+from services.exercises_service import generate_exercises
+from utils.helpers import ensure_dirs
+from utils.minhash import signature, similarity, tokens
+
+QUEST = (
+    "### EX01 — Rebase interactif\n**Objectif (1 phrase) :**\n"
+    "Réécrire les trois derniers commits d'une branche de fonctionnalité avant la revue.\n\n"
+    "**Contexte (3–6 lignes) :**\nLa branche contient des commits de correction à fusionner, "
+    "un message à reformuler et un fichier de debug ajouté par erreur à retirer."
+)
+OTHER = (
+    "### EX01 — Bisect\n**Objectif (1 phrase) :**\n"
+    "Trouver le commit qui a cassé la suite de tests parmi les deux cents derniers.\n\n"
+    "**Contexte (3–6 lignes) :**\nLa régression est apparue entre deux versions publiées ; "
+    "un script de test automatique renvoie un code de sortie non nul en cas d'échec."
+)
+
+
+def test_tokens_ignore_template_numbering_and_accents():
+    assert tokens("### EX07 — Étape\n**Objectif (1 phrase) :** Réécrire") == ["etape", "reecrire"]
+
+
+def test_similarity_separates_near_duplicates_from_distinct_quests():
+    near = QUEST.replace("EX01", "EX04").replace("trois", "quatre")
+    assert similarity(signature(QUEST), signature(QUEST)) == 1.0
+    assert similarity(signature(QUEST), signature(near)) >= DUP_SIMILARITY
+    assert similarity(signature(QUEST), signature(OTHER)) < 0.2
+
+
+def test_index_flags_existing_files_and_the_current_batch(tmp_path):
+    ex_dir = ensure_dirs(tmp_path, "git")["ex"]
+    (ex_dir / "2020-01-01-ex01.md").write_text(QUEST, encoding="utf-8")
+    (ex_dir / "2020-01-01-ex02.md").write_text("### EX02 — [Titre court façon mission]\n", encoding="utf-8")
+    index = FingerprintIndex.load(tmp_path, "git", ex_dir)
+    assert list(index.entries) == ["2020-01-01-ex01.md"]  # squelettes ignorés
+
+    assert index.check("today-ex01.md", QUEST)[0] == "2020-01-01-ex01.md"
+    assert index.check("today-ex02.md", OTHER) is None
+    assert index.check("today-ex03.md", OTHER)[0] == "today-ex02.md"  # doublon dans le même lot
+    assert index.titles() == ["Bisect", "Rebase interactif"]
+
+
+def test_index_is_persisted_and_excluded_files_do_not_count(tmp_path):
+    ex_dir = ensure_dirs(tmp_path, "git")["ex"]
+    (ex_dir / "2020-01-01-ex01.md").write_text(QUEST, encoding="utf-8")
+    FingerprintIndex.load(tmp_path, "git", ex_dir).save()
+    reloaded = FingerprintIndex.load(tmp_path, "git", ex_dir)
+    assert reloaded.refresh(ex_dir) is False  # mtime inchangé : rien n'est relu
+    excluded = FingerprintIndex.load(tmp_path, "git", ex_dir, exclude=["2020-01-01-ex01.md"])
+    assert excluded.check("x", QUEST) is None
+
+
+def test_duplicate_quest_is_regenerated_once(tmp_path):
+    ex_dir = ensure_dirs(tmp_path, "git")["ex"]
+    (ex_dir / "2020-01-01-ex01.md").write_text(QUEST, encoding="utf-8")
+    # régénération (titres à éviter dans le prompt) : une autre quête ; sinon toujours QUEST
+    client = MockResponder(MockConfig(latency=0, canned={"à ne PAS reprendre": OTHER, 'Sujet : "git"': QUEST}))
+    files, _ = generate_exercises(tmp_path, "git", n=1, client=client)
+    assert client.llm.calls == 2
+    assert [f.name for f in files] == [f"{date.today().isoformat()}-ex01.md"]
+    assert files[0].read_text(encoding="utf-8").startswith("### EX01 — Bisect")
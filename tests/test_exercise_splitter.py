@@ -0,0 +1,69 @@
+import pytest
+
+from utils.exercise_splitter import ExerciseSplitter, iter_exercises
+from utils.helpers import renumber_exercise, split_exercise_chunks
+
+TEXT = (
+    "### EX01 — Premier\n**Objectif (1 phrase) :**\nA\n\n"
+    "### EX02 — Deuxième\n**Objectif (1 phrase) :**\nB\n\n"
+    "#### EX03 — Troisième\ncontenu C"
+)
+
+
+def _split(text, start=1):
+    s = ExerciseSplitter(start=start)
+    chunks = s.feed(text) + s.close()
+    return chunks, s.issues
+
+
+def test_whole_text_is_split_in_order():
+    chunks, issues = _split(TEXT)
+    assert [(c.index, c.number) for c in chunks] == [(1, 1), (2, 2), (3, 3)]
+    assert chunks[0].text == "### EX01 — Premier\n**Objectif (1 phrase) :**\nA"
+    assert chunks[2].text.endswith("contenu C")
+    assert issues == []
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 64])
+def test_streamed_deltas_match_whole_text(size):
+    whole, _ = _split(TEXT)
+    deltas = [TEXT[i:i + size] for i in range(0, len(TEXT), size)]
+    assert [c.text for c in iter_exercises(deltas)] == [c.text for c in whole]
+
+
+def test_chunk_is_emitted_as_soon_as_next_header_is_complete():
+    s = ExerciseSplitter()
+    assert s.feed("### EX01 — A\nligne\n### EX0") == []
+    done = s.feed("2 — B\n")
+    assert [c.number for c in done] == [1]
+    assert [c.number for c in s.close()] == [2]
+
+
+def test_preamble_is_ignored_and_reported_once():
+    chunks, issues = _split("Voici les quêtes :\nbla\n" + TEXT)
+    assert len(chunks) == 3
+    assert issues == ["texte avant le premier exercice ignoré"]
+
+
+def test_numbering_anomalies_are_reported():
+    chunks, issues = _split("### EX01 — A\nx\n### EX03 — C\ny\n### EX04 — D")
+    assert [(c.index, c.number) for c in chunks] == [(1, 1), (2, 3), (3, 4)]
+    assert "EX03 trouvé en position 2 (attendu EX02)" in issues
+    assert "EX04 trouvé en position 3 (attendu EX03)" in issues
+    assert "EX04 : en-tête sans contenu" in issues
+
+
+def test_start_offset_for_shards():
+    chunks, issues = _split("### EX06 — F\nx\n### EX07 — G\ny", start=6)
+    assert [c.number for c in chunks] == [6, 7]
+    assert issues == []
+
+
+def test_no_header_yields_nothing():
+    assert split_exercise_chunks("pas d'exercice ici") == []
+    assert split_exercise_chunks(None) == []
+
+
+def test_renumber_rewrites_only_the_header():
+    text = "### EX03 — Titre\nvoir EX03 plus haut"
+    assert renumber_exercise(text, 12) == "### EX12 — Titre\nvoir EX03 plus haut"
@@ -0,0 +1,61 @@
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from utils import locks
+from utils.locks import file_lock, topic_lock
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_threads_are_mutually_excluded(tmp_path):
+    path = tmp_path / "x.lock"
+    inside, overlaps = [], []
+
+    def work():
+        for _ in range(20):
+            with file_lock(path):
+                inside.append(1)
+                if len(inside) > 1:
+                    overlaps.append(1)
+                time.sleep(0.001)
+                inside.pop()
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert overlaps == []
+
+
+def test_topic_locks_are_per_topic_and_kind(tmp_path):
+    with topic_lock(tmp_path, "git", "cheat"):
+        # autre sort ou autre sujet : pas de blocage (sinon ce test ne finirait pas)
+        with topic_lock(tmp_path, "git", "ex"), topic_lock(tmp_path, "svn", "cheat"):
+            pass
+    names = sorted(p.name for p in (tmp_path / ".pyreto" / "locks").iterdir())
+    assert names == ["git.cheat.lock", "git.ex.lock", "svn.cheat.lock"]
+
+
+@pytest.mark.skipif(locks.fcntl is None, reason="flock indisponible")
+def test_other_process_waits_for_the_lock(tmp_path):
+    path = tmp_path / "x.lock"
+    child = subprocess.Popen(
+        [sys.executable, "-c",
+         "import sys, time; from pathlib import Path; from utils.locks import file_lock\n"
+         "with file_lock(Path(sys.argv[1])):\n"
+         "    print('pris', flush=True); time.sleep(0.5)\n", str(path)],
+        cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    try:
+        assert child.stdout.readline().strip() == "pris"
+        start = time.perf_counter()
+        with file_lock(path):
+            waited = time.perf_counter() - start
+    finally:
+        child.wait(timeout=10)
+    assert waited > 0.2
@@ -0,0 +1,93 @@
+import threading
+import time
+
+from api.ratelimit import RateLimiter
+
+TPM = 6000  # 100 tokens/s : un appel de 10 tokens attend ~0.1 s sur un seau vide
+
+
+def _drained(tpm=TPM):
+    limiter = RateLimiter(tpm=tpm)
+    limiter.acquire(tpm)
+    return limiter
+
+
+def _depth(limiter):
+    return sum(lane["depth"] for lane in limiter.stats()["lanes"].values())
+
+
+def _enqueue(limiter, order, name, lane, tokens=10):
+    """Lance un appel et attend qu'il soit dans la file (ordre d'arrivée déterministe)."""
+    before = _depth(limiter)
+    t = threading.Thread(target=lambda: (limiter.acquire(tokens, lane), order.append(name)))
+    t.start()
+    while _depth(limiter) == before:
+        time.sleep(0.001)
+    return t
+
+
+def test_disabled_limiter_never_waits():
+    limiter = RateLimiter()
+    assert not limiter.enabled
+    assert limiter.acquire(10**9) == 0.0
+
+
+def test_interactive_lane_preempts_queued_batch_and_lanes_are_fifo():
+    limiter, order = _drained(), []
+    threads = [_enqueue(limiter, order, f"b{k}", "batch", tokens=20) for k in range(3)]
+    threads.append(_enqueue(limiter, order, "i0", "interactive"))
+    threads.append(_enqueue(limiter, order, "i1", "interactive"))
+    for t in threads:
+        t.join()
+    assert order == ["i0", "i1", "b0", "b1", "b2"]
+    stats = limiter.stats()
+    assert stats["lanes"]["batch"]["calls"] == 3
+    assert stats["lanes"]["interactive"]["calls"] == 3  # dont l'appel qui a vidé le seau
+    assert stats["max_depth"] == 5
+    assert stats["lanes"]["batch"]["wait_max_s"] > stats["lanes"]["interactive"]["wait_max_s"]
+
+
+def test_rpm_bucket_spaces_requests():
+    limiter = RateLimiter(rpm=600)  # 10 requêtes/s
+    for _ in range(600):
+        limiter.acquire(0)
+    waited = limiter.acquire(0)
+    assert 0.05 < waited < 0.3
+
+
+def test_settle_charges_real_usage_as_debt():
+    limiter = RateLimiter(tpm=60_000)  # 1000 tokens/s
+    limiter.acquire(100)
+    limiter.settle(100, 60_100)  # la réponse a consommé tout le quota et plus
+    waited = limiter.acquire(100)
+    assert 0.15 < waited < 0.6
+
+
+def test_settle_refund_is_capped_at_capacity():
+    limiter = RateLimiter(tpm=TPM)
+    limiter.acquire(10)
+    limiter.settle(10_000, 10)  # sur-estimation : remboursée, sans dépasser la capacité
+    limiter.acquire(TPM)
+    assert limiter.acquire(10) > 0.05
+
+
+def test_oversized_request_passes_alone_on_a_full_bucket():
+    limiter = RateLimiter(tpm=60_000)  # 1000 tokens/s
+    assert limiter.acquire(60_300) < 0.05  # borné à la capacité : pas de blocage éternel
+    assert 0.2 < limiter.acquire(10) < 0.6  # mais la dette est due avant l'appel suivant
+
+
+def test_responder_uses_the_lane_tag_and_skips_cache_hits(tmp_path):
+    from api.cache import ResponseCache
+    from api.metrics import tagged
+    from api.mock import MockConfig, MockResponder
+
+    limiter = RateLimiter(rpm=600)
+    client = MockResponder(MockConfig(latency=0, jitter=0), limiter=limiter,
+                           cache=ResponseCache(tmp_path / "cache"))
+    with tagged(lane="batch"):
+        client.generate(input_text="bonjour")
+        client.generate(input_text="bonjour")  # hit : pas de quota consommé
+    client.generate(input_text="autre")
+    lanes = limiter.stats()["lanes"]
+    assert (lanes["batch"]["calls"], lanes["interactive"]["calls"]) == (1, 1)
@@ -0,0 +1,39 @@
+from api.metrics import recording_models, tagged
+from api.mock import MockConfig, MockResponder
+from api.ratelimit import RateLimiter
+from api.routing import ModelRouter
+from services.cheatsheet_service import generate_cheatsheet
+from services.index_service import load_index
+
+# mini (route des cheat sheets) dépasse son budget : repli sur nano, sans limite de temps
+ROUTER_BUDGET = {"cheatsheet": 0.05}
+
+
+def _client(**kwargs):
+    return MockResponder(MockConfig(latency=0.2, jitter=0), router=ModelRouter(budgets=ROUTER_BUDGET), **kwargs)
+
+
+def test_index_records_the_model_that_answered(tmp_path):
+    client = _client()
+    generate_cheatsheet(tmp_path, "git", client=client)
+    assert client.llm.calls == 2
+    assert load_index(tmp_path)["topics"]["git"]["model"] == "gpt-5-nano"
+
+
+def test_streamed_and_shared_calls_record_their_model(tmp_path):
+    client = _client()
+    with tagged(task="cheatsheet"), recording_models() as used:
+        "".join(client.stream(input_text="bonjour"))
+        client.generate(input_text="bonjour")  # hit de cache : même modèle
+    assert used == ["gpt-5-nano", "gpt-5-nano"]
+
+
+def test_timed_out_attempt_is_refunded_to_the_limiter(tmp_path):
+    limiter = RateLimiter(tpm=600_000)
+    client = _client(limiter=limiter)
+    with tagged(task="cheatsheet"):
+        client.generate(input_text="bonjour " * 1000)
+    bucket = limiter._buckets[1]
+    bucket.refill(bucket.stamp)  # niveau courant, sans remplissage depuis
+    # seul l'appel nano reste prélevé (usage réel), pas l'estimation de l'essai mini
+    assert bucket.capacity - bucket.level == client.usage["input_tokens"] + client.usage["output_tokens"]
@@ -0,0 +1,55 @@
+import shutil
+from datetime import date
+
+from api.mock import MockConfig, MockResponder
+from services.exercises_service import generate_exercises
+from services.index_service import index_path, load_schedule, reconcile, schedule_path, update_topic
+from services.schedule_service import build_schedule
+from utils.helpers import ensure_dirs
+
+QUEST = (
+    "### EX01 — Rebase interactif\n**Objectif (1 phrase) :**\n"
+    "Réécrire les trois derniers commits d'une branche de fonctionnalité avant la revue.\n\n"
+    "**Contexte (3–6 lignes) :**\nLa branche contient des commits de correction à fusionner, "
+    "un message à reformuler et un fichier de debug ajouté par erreur à retirer."
+)
+
+
+def test_dropped_duplicate_is_removed_from_cached_schedule(tmp_path):
+    client = MockResponder(MockConfig(latency=0, canned={'Sujet : "git"': QUEST}))
+    today = date.today().isoformat()
+    ex_dir = ensure_dirs(tmp_path, "git")["ex"]
+
+    generate_exercises(tmp_path, "git", n=1, client=client, dedup=False)
+    assert build_schedule(tmp_path, "git") == [(today, [f"{today}-ex01.md"])]
+
+    # même quête un autre jour : celle du jour devient un doublon, écartée et supprimée
+    (ex_dir / f"{today}-ex01.md").rename(ex_dir / "2020-01-01-ex01.md")
+    generate_exercises(tmp_path, "git", n=1, client=client, dedup=False)
+    files, _ = generate_exercises(tmp_path, "git", n=1, client=client)
+    assert files == []
+    assert not (ex_dir / f"{today}-ex01.md").exists()
+    assert build_schedule(tmp_path, "git") == [("2020-01-01", ["2020-01-01-ex01.md"])]
+
+
+def test_schedule_is_stored_per_topic_outside_the_index(tmp_path):
+    for slug in ("git", "sql"):
+        ex_dir = ensure_dirs(tmp_path, slug)["ex"]
+        (ex_dir / "2026-01-05-ex01.md").write_text("x", encoding="utf-8")
+    update_topic(tmp_path, "git", size=1)
+    index_before = index_path(tmp_path).read_bytes()
+
+    assert build_schedule(tmp_path, "git") == [("2026-01-05", ["2026-01-05-ex01.md"])]
+    assert index_path(tmp_path).read_bytes() == index_before
+    assert load_schedule(tmp_path, "git")["buckets"] == {"2026-01-05": ["2026-01-05-ex01.md"]}
+    assert load_schedule(tmp_path, "sql") is None
+
+
+def test_removed_topic_drops_its_cached_schedule(tmp_path):
+    ex_dir = ensure_dirs(tmp_path, "git")["ex"]
+    (ex_dir / "2026-01-05-ex01.md").write_text("x", encoding="utf-8")
+    reconcile(tmp_path)
+    build_schedule(tmp_path, "git")
+    shutil.rmtree(tmp_path / "cheatsheets" / "git")
+    reconcile(tmp_path)
+    assert not schedule_path(tmp_path, "git").exists()
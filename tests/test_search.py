@@ -0,0 +1,70 @@
+import os
+
+import pytest
+
+from services.search_service import HL_END, HL_START, _fts_query, ensure_index, index_files, search, sync
+
+
+def _write(base, kind_dir, topic, name, text):
+    path = base / kind_dir / topic / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def base(tmp_path):
+    _write(tmp_path, "cheatsheets", "git", "git.md", "# Git\nrebase interactif, stash, bisect\n")
+    _write(tmp_path, "exercises", "git", "2026-01-05-ex01.md", "### EX01 — Rebase\nRéécrire l'historique avec rebase\n")
+    _write(tmp_path, "cheatsheets", "sql", "sql.md", "# SQL\njointures, index, requêtes préparées\n")
+    return tmp_path
+
+
+def test_build_then_search_ranks_and_highlights(base):
+    ensure_index(base)
+    hits = search(base, "rebase")
+    assert {h.topic for h in hits} == {"git"}
+    assert hits[0].kind == "ex" and hits[0].title == "EX01 — Rebase"  # titre pondéré x5
+    assert f"{HL_START}rebase{HL_END}" in hits[1].snippet
+
+
+def test_last_word_is_a_prefix_and_accents_are_ignored(base):
+    ensure_index(base)
+    assert [h.topic for h in search(base, "jointu")] == ["sql"]
+    assert [h.topic for h in search(base, "requetes preparees")] == ["sql"]
+    assert search(base, "git jointures") == []  # tous les mots requis
+
+
+def test_filters_by_topic_and_kind(base):
+    ensure_index(base)
+    assert [h.kind for h in search(base, "rebase", kind="cheat")] == ["cheat"]
+    assert search(base, "rebase", topic="sql") == []
+
+
+def test_sync_catches_changes_made_outside(base):
+    assert sync(base) == {"added": 3, "updated": 0, "removed": 0, "total": 3}
+    assert sync(base)["added"] == 0  # rien n'a changé : rien n'est relu
+    cheat = base / "cheatsheets" / "sql" / "sql.md"
+    cheat.write_text("# SQL\nfenêtres analytiques\n", encoding="utf-8")
+    os.utime(cheat, (1, 1))
+    (base / "cheatsheets" / "git" / "git.md").unlink()
+    assert sync(base) == {"added": 0, "updated": 1, "removed": 1, "total": 2}
+    assert search(base, "jointures") == []
+    assert [h.topic for h in search(base, "analytiques")] == ["sql"]
+
+
+def test_index_files_updates_one_document(base):
+    ensure_index(base)
+    path = _write(base, "exercises", "git", "2026-01-05-ex01.md", "### EX01 — Bisect\nTrouver le commit fautif\n")
+    index_files(base, [path, base / "ailleurs.md"])  # hors périmètre : ignoré
+    assert [h.title for h in search(base, "fautif")] == ["EX01 — Bisect"]
+    assert search(base, "historique") == []  # ancienne version retirée de l'index
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("git rebase", '"git" "rebase"*'),
+    ('a"b OR c', '"a" "b" "OR" "c"*'),  # opérateurs et guillemets neutralisés
+    ("  ", ""),
+])
+def test_free_text_becomes_a_safe_fts_query(query, expected):
+    assert _fts_query(query) == expected
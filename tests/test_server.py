@@ -0,0 +1,95 @@
+import asyncio
+import http.client
+import json
+import threading
+
+import pytest
+
+from api.mock import MockConfig, MockResponder
+from server import MAX_BODY, PyretoServer, serve
+
+
+@pytest.fixture
+def api(tmp_path):
+    """Serveur sur un port libre, dans sa propre boucle (thread) ; requête HTTP réelle."""
+    server = PyretoServer(tmp_path, MockResponder(MockConfig(latency=0)), workers=2)
+    ready = threading.Event()
+    loop = asyncio.new_event_loop()
+    address = {}
+
+    def on_ready(host, port):
+        address.update(host=host, port=port)
+        ready.set()
+
+    task = loop.create_task(serve(server, "127.0.0.1", 0, on_ready=on_ready))
+    thread = threading.Thread(target=lambda: loop.run_until_complete(asyncio.gather(task, return_exceptions=True)))
+    thread.start()
+    assert ready.wait(5)
+
+    def request(method, path, body=None, headers=None):
+        conn = http.client.HTTPConnection(address["host"], address["port"], timeout=10)
+        raw = body if isinstance(body, bytes) else (json.dumps(body).encode() if body is not None else None)
+        conn.request(method, path, body=raw, headers={"Content-Type": "application/json", **(headers or {})})
+        resp = conn.getresponse()
+        data = json.loads(resp.read() or b"null")
+        conn.close()
+        return resp.status, data
+
+    yield request
+    loop.call_soon_threadsafe(task.cancel)
+    thread.join(5)
+    loop.close()
+    server.close()
+
+
+def test_health_reports_pool_and_client(api):
+    status, body = api("GET", "/health")
+    assert status == 200
+    assert body == {"ok": True, "llm": True, "workers": 2, "pending": 0, "limiter": None}
+
+
+def test_generation_routes_write_files_listed_by_topics_and_schedule(api, tmp_path):
+    status, body = api("POST", "/course", {"topic": "git"})
+    assert status == 200 and body["cheatsheet"].endswith("git.md")
+    status, body = api("POST", "/exercises", {"topic": "sql", "n": 2, "lane": "batch"})
+    assert status == 200 and len(body["files"]) == 2
+    _, body = api("GET", "/topics")
+    assert sorted(t["slug"] for t in body["topics"]) == ["git", "sql"]
+    _, body = api("GET", "/schedule?topic=sql")
+    assert [len(day["files"]) for day in body["schedule"]] == [2]
+
+
+@pytest.mark.parametrize("method, path, body, status", [
+    ("GET", "/nulle-part", None, 404),
+    ("GET", "/cheatsheet", None, 405),
+    ("POST", "/cheatsheet", b"{pas du json", 400),
+    ("POST", "/cheatsheet", [1, 2], 400),
+    ("POST", "/cheatsheet", {"topic": "  "}, 400),
+    ("POST", "/cheatsheet", {"topic": "git", "lane": "vip"}, 400),
+    ("POST", "/exercises", {"topic": "git", "n": 0}, 400),
+    ("POST", "/exercises", {"topic": "git", "n": True}, 400),
+    ("GET", "/schedule", None, 400),
+])
+def test_bad_requests_get_json_errors(api, method, path, body, status):
+    got, payload = api(method, path, body)
+    assert got == status
+    assert payload["error"]
+
+
+def test_oversized_body_is_rejected_before_reading(api):
+    status, payload = api("POST", "/cheatsheet", b"{}", headers={"Content-Length": str(MAX_BODY + 1)})
+    assert status == 413 and payload["error"]
+
+
+def test_service_failure_is_a_500(tmp_path):
+    async def broken(params):
+        raise RuntimeError("panne")
+
+    server = PyretoServer(tmp_path, None, workers=1)
+    server._routes[("POST", "/cheatsheet")] = broken
+    try:
+        status, payload = asyncio.run(server.dispatch("POST", "/cheatsheet", b'{"topic": "git"}'))
+    finally:
+        server.close()
+    assert status == 500
+    assert payload == {"error": "RuntimeError: panne"}
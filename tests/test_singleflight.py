@@ -0,0 +1,72 @@
+import threading
+import time
+
+import pytest
+
+from api.singleflight import SingleFlight
+
+
+def _race(n, target):
+    barrier = threading.Barrier(n)
+    results = [None] * n
+
+    def run(k):
+        barrier.wait()
+        try:
+            results[k] = target()
+        except Exception as e:  # l'exception fait partie du résultat observé
+            results[k] = e
+
+    threads = [threading.Thread(target=run, args=(k,)) for k in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_concurrent_callers_share_one_call():
+    flights, calls = SingleFlight(), []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return "réponse"
+
+    results = _race(5, lambda: flights.do("k", slow))
+    assert len(calls) == 1
+    assert sorted(shared for _text, shared in results) == [False, True, True, True, True]
+    assert {text for text, _shared in results} == {"réponse"}
+    assert flights.shared == 4
+
+
+def test_error_reaches_every_follower_and_key_is_released():
+    flights, calls = SingleFlight(), []
+
+    def boom():
+        calls.append(1)
+        time.sleep(0.2)
+        raise RuntimeError("panne")
+
+    results = _race(3, lambda: flights.do("k", boom))
+    assert len(calls) == 1
+    assert all(isinstance(r, RuntimeError) and str(r) == "panne" for r in results)
+    # rien n'est gardé après le vol : un nouvel appel relance fn
+    assert flights.do("k", lambda: "ok") == ("ok", False)
+
+
+def test_distinct_keys_do_not_wait_on_each_other():
+    flights = SingleFlight()
+    start = time.perf_counter()
+    _race(3, lambda: flights.do(threading.current_thread().name, lambda: time.sleep(0.2)))
+    assert time.perf_counter() - start < 0.5
+    assert flights.shared == 0
+
+
+def test_sequential_calls_are_not_cached():
+    flights, calls = SingleFlight(), []
+    for _ in range(3):
+        flights.do("k", lambda: calls.append(1))
+    assert len(calls) == 3
+    with pytest.raises(ValueError):
+        flights.do("k", lambda: int("x"))
@@ -0,0 +1,34 @@
+from services.srs_service import DAY, Card, review
+
+NOW = 1_000_000.0
+
+
+def test_first_passes_follow_sm2_intervals():
+    card = review(Card(), "pass", NOW)
+    assert (card.reps, card.interval, card.due) == (1, 1, NOW + DAY)
+    card = review(card, "pass", NOW)
+    assert (card.reps, card.interval, card.due) == (2, 6, NOW + 6 * DAY)
+
+
+def test_pass_keeps_ease_and_third_interval_uses_previous_ease():
+    card = review(review(Card(), "pass", NOW), "pass", NOW)
+    assert card.ef == 2.5  # q = 4 : facteur inchangé
+    third = review(card, "pass", NOW)
+    assert third.interval == round(6 * 2.5)
+
+
+def test_fail_resets_and_lowers_ease_with_floor():
+    card = Card(ef=2.5, interval=15, reps=3, due=NOW)
+    failed = review(card, "fail", NOW)
+    assert (failed.reps, failed.interval, failed.due) == (0, 1, NOW + DAY)
+    assert failed.ef < 2.5
+    for _ in range(20):
+        failed = review(failed, "fail", NOW)
+    assert failed.ef == 1.3
+
+
+def test_skip_only_postpones_by_one_day():
+    card = Card(ef=2.1, interval=6, reps=2, due=NOW - DAY)
+    skipped = review(card, "skip", NOW)
+    assert (skipped.ef, skipped.interval, skipped.reps) == (2.1, 6, 2)
+    assert skipped.due == NOW + DAY
@@ -0,0 +1,47 @@
+import json
+
+from services.exercises_service import _parse_structured
+
+
+def _ex(i, **overrides):
+    ex = {
+        "id": f"EX{i:02d}", "title": f"Quête {i}", "objective": "Objectif.", "context": "Contexte.",
+        "type": "DIAGNOSTIC", "resources": "Doc.", "input": "entrée", "deliverables": ["a"],
+        "criteria": ["b"], "pitfalls": ["c"],
+    }
+    ex.update(overrides)
+    return ex
+
+
+def _payload(*items):
+    return json.dumps({"exercises": list(items)})
+
+
+def test_valid_response_fills_every_slot():
+    slots = _parse_structured(_payload(_ex(1), _ex(2)), 2)
+    assert [s["title"] for s in slots] == ["Quête 1", "Quête 2"]
+
+
+def test_invalid_items_leave_holes_in_place():
+    slots = _parse_structured(_payload(
+        _ex(1, type="INCONNU"),           # hors enum
+        _ex(2, criteria="pas une liste"),  # mauvais type
+        _ex(3, title="  "),                # champ requis vide
+        {k: v for k, v in _ex(4).items() if k != "pitfalls"},  # champ manquant
+        _ex(5),
+    ), 5)
+    assert slots[:4] == [None, None, None, None]
+    assert slots[4]["title"] == "Quête 5"
+
+
+def test_missing_and_extra_items():
+    assert _parse_structured(_payload(_ex(1)), 3)[1:] == [None, None]
+    assert len(_parse_structured(_payload(_ex(1), _ex(2), _ex(3)), 2)) == 2
+
+
+def test_truncated_or_malformed_json_gives_empty_slots():
+    text = _payload(_ex(1), _ex(2))
+    assert _parse_structured(text[:len(text) // 2], 2) == [None, None]
+    assert _parse_structured("", 1) == [None]
+    assert _parse_structured(json.dumps({"exercises": "x"}), 1) == [None]
+    assert _parse_structured(json.dumps([_ex(1)]), 1) == [None]
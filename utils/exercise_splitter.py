@@ -0,0 +1,83 @@
+"""Découpage incrémental d'une réponse LLM en exercices EXnn (texte complet ou flux de deltas)."""
+from __future__ import annotations
+import re
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+# En-tête d'exercice : "### EX01 — …" (ou "## EX01", "#### EX01"…), testé ligne par ligne
+HEADER_RE = re.compile(r"^(?:#{1,6}\s*)?###?\s*EX(\d{2})\b")
+
+
+@dataclass
+class ExerciseChunk:
+    index: int   # position dans la réponse (1..n)
+    number: int  # numéro lu dans l'en-tête EXnn
+    text: str
+
+
+class ExerciseSplitter:
+    """
+    Parseur en une passe : feed() consomme du texte (deltas de streaming compris) et
+    retourne les exercices terminés dès que l'en-tête suivant est vu ; close() livre le dernier.
+    Les anomalies (texte avant EX01, numérotation inattendue, bloc vide) vont dans issues.
+    """
+
+    def __init__(self, start: int = 1) -> None:
+        self.start = start  # numéro attendu pour le premier exercice
+        self.issues: list[str] = []
+        self._pending = ""  # ligne incomplète en attente du prochain delta
+        self._lines: list[str] = []
+        self._number: int | None = None
+        self._count = 0
+        self._preamble = False
+
+    def feed(self, text: str) -> list[ExerciseChunk]:
+        self._pending += text
+        if "\n" not in text:
+            return []
+        *lines, self._pending = self._pending.split("\n")
+        out: list[ExerciseChunk] = []
+        for line in lines:
+            self._line(line, out)
+        return out
+
+    def close(self) -> list[ExerciseChunk]:
+        out: list[ExerciseChunk] = []
+        if self._pending:
+            self._line(self._pending, out)
+            self._pending = ""
+        self._finish(out)
+        return out
+
+    def _line(self, line: str, out: list[ExerciseChunk]) -> None:
+        m = HEADER_RE.match(line)
+        if m:
+            self._finish(out)
+            self._number = int(m.group(1))
+            self._lines = [line]
+        elif self._number is not None:
+            self._lines.append(line)
+        elif line.strip() and not self._preamble:
+            self._preamble = True
+            self.issues.append("texte avant le premier exercice ignoré")
+
+    def _finish(self, out: list[ExerciseChunk]) -> None:
+        if self._number is None:
+            return
+        text = "\n".join(self._lines).strip()
+        number, self._number, self._lines = self._number, None, []
+        self._count += 1
+        expected = self.start + self._count - 1
+        if number != expected:
+            self.issues.append(f"EX{number:02d} trouvé en position {self._count} (attendu EX{expected:02d})")
+        if "\n" not in text:
+            self.issues.append(f"EX{number:02d} : en-tête sans contenu")
+        out.append(ExerciseChunk(self._count, number, text))
+
+
+def iter_exercises(deltas: Iterable[str], splitter: ExerciseSplitter | None = None) -> Iterator[ExerciseChunk]:
+    """Produit chaque exercice dès qu'il est complet dans le flux."""
+    splitter = splitter or ExerciseSplitter()
+    for delta in deltas:
+        yield from splitter.feed(delta)
+    yield from splitter.close()
@@ -1,8 +1,21 @@
 import os
 import re
+import secrets
+import stat
 import textwrap
 import subprocess
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Collection, Iterable
+
+from utils.exercise_splitter import ExerciseSplitter
+
+# Durabilité des écritures : "none" (tmp + rename atomique), "file" (+ fsync du fichier),
+# "full" (+ fsync du dossier). Réglable via PYRETO_DURABILITY ou set_durability().
+# Défaut "none" : le rename garde l'atomicité (jamais de fichier tronqué) sans payer un
+# fsync par écriture ; une coupure de courant peut perdre les dernières écritures.
+DURABILITY_LEVELS = ("none", "file", "full")
+_durability = os.getenv("PYRETO_DURABILITY", "none")
 
 
 def run_cmd(cmd: list[str], *, cwd: Path | None = None) -> str:
@@ -11,9 +24,89 @@ def run_cmd(cmd: list[str], *, cwd: Path | None = None) -> str:
     return res.stdout
 
 
-def write_text(path: Path, content: str) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(content, encoding="utf-8")
+def set_durability(level: str) -> None:
+    global _durability
+    if level not in DURABILITY_LEVELS:
+        raise ValueError(f"Durabilité inconnue: {level} (attendu: {', '.join(DURABILITY_LEVELS)})")
+    _durability = level
+
+
+def _fsync_dir(directory: Path) -> None:
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _create_temp(path: Path) -> tuple[int, str]:
+    """
+    Fichier temporaire voisin de path, avec les droits qu'aurait une écriture directe :
+    ceux de la cible si elle existe, sinon 0666 filtré par l'umask (appliqué par open).
+    """
+    for _ in range(100):
+        tmp = str(path.parent / f".{path.name}.{secrets.token_hex(4)}.tmp")
+        try:
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        except FileExistsError:
+            continue
+        try:
+            os.fchmod(fd, stat.S_IMODE(path.stat().st_mode))
+        except OSError:
+            pass  # cible absente : droits par défaut
+        return fd, tmp
+    raise FileExistsError(f"aucun nom temporaire libre pour {path}")
+
+
+@contextmanager
+def atomic_open(path: Path, *, durability: str | None = None, sync_dir: bool = True):
+    """
+    Écriture atomique : fichier temporaire dans le même dossier puis os.replace.
+    En cas d'exception, la cible garde son contenu précédent. Le dossier doit exister.
+    """
+    level = durability or _durability
+    fd, tmp = _create_temp(path)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            yield f
+            if level != "none":
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    if level == "full" and sync_dir:
+        _fsync_dir(path.parent)
+
+
+def write_text(path: Path, content: str, *, durability: str | None = None, mkdir: bool = True) -> None:
+    if mkdir:
+        path.parent.mkdir(parents=True, exist_ok=True)
+    with atomic_open(path, durability=durability) as f:
+        f.write(content)
+
+
+def write_many(directory: Path, items: Iterable[tuple[str, str]], *,
+               durability: str | None = None) -> list[Path]:
+    """
+    Écrit un lot de fichiers (nom, contenu) dans un même dossier : un seul mkdir,
+    chaque fichier atomique, un seul fsync du dossier en fin de lot (niveau "full").
+    """
+    level = durability or _durability
+    directory.mkdir(parents=True, exist_ok=True)
+    paths: list[Path] = []
+    for name, content in items:
+        p = directory / name
+        with atomic_open(p, durability=level, sync_dir=False) as f:
+            f.write(content)
+        paths.append(p)
+    if level == "full":
+        _fsync_dir(directory)
+    return paths
 
 
 def safe_slug(s: str) -> str:
@@ -28,18 +121,58 @@ def ensure_dirs(base: Path, topic_slug: str) -> dict[str, Path]:
     return {"cheats": cheats_dir, "ex": ex_dir}
 
 
-def create_exercise_files(ex_dir: Path, date_str: str, n: int, content: str | None) -> list[Path]:
-    paths: list[Path] = []
-    chunks: list[str] = []
-    if content:
-        # La regex ci-dessus peut avaler le préfixe; on re-split proprement si besoin :
-        chunks = [c.strip() for c in re.findall(r'(?ms)^(?:#{1,6}\s*)?###?\s*EX\d{2}\b.*?(?=^(?:#{1,6}\s*)?###?\s*EX\d{2}\b|\Z)', content)]
+def split_exercise_chunks(content: str | None) -> list[str]:
+    if not content:
+        return []
+    splitter = ExerciseSplitter()
+    return [c.text for c in splitter.feed(content) + splitter.close()]
+
+
+def exercise_file_name(date_str: str, i: int) -> str:
+    return f"{date_str}-ex{i:02d}.md"
+
+
+def renumber_exercise(chunk: str, i: int) -> str:
+    """Réécrit l'identifiant EXnn de l'en-tête d'un bloc (numérotation globale après lots)."""
+    return re.sub(r"^(\s*(?:#{1,6}\s*)?)EX\d{2}\b", rf"\g<1>EX{i:02d}", chunk, count=1)
+
+
+def render_exercise(ex: dict, i: int) -> str:
+    """Markdown d'une quête structurée (cf. api.prompt.EXERCISES_SCHEMA), au format des squelettes."""
+    def bullets(items: list[str]) -> list[str]:
+        return [f"- {item}" for item in items] or ["-"]
+
+    lines = [
+        f"### EX{i:02d} — {ex['title']}",
+        "**Objectif (1 phrase) :**", ex["objective"], "",
+        "**Contexte (3–6 lignes) :**", ex["context"], "",
+        f"**Type :** {ex['type']}",
+        f"**Ressources :** {ex['resources']}", "",
+        "**Entrée :**", "```text", ex["input"].strip("\n"), "```", "",
+        "**Livrables :**", *bullets(ex["deliverables"]), "",
+        "**Critères de victoire :**", *bullets(ex["criteria"]), "",
+        "**Pièges (troupes ennemies) :**", *bullets(ex["pitfalls"]),
+    ]
+    return "\n".join(lines)
+
+
+def create_exercise_files(ex_dir: Path, date_str: str, n: int, content: str | None,
+                          *, chunks: list[str | None] | None = None,
+                          written: Collection[int] = (), dropped: Collection[int] = ()) -> list[Path]:
+    """
+    chunks (déjà découpés, None = squelette) remplace le découpage de content.
+    written : numéros déjà écrits au fil du streaming, non réécrits.
+    dropped : numéros écartés (doublons) : ni fichier ni squelette.
+    """
+    items: list[tuple[str, str]] = []
+    if chunks is None:
+        chunks = split_exercise_chunks(content)
     for i in range(1, n + 1):
-        ident = f"ex{i:02d}"
-        fname = f"{date_str}-{ident}.md"
-        p = ex_dir / fname
-        if content and i <= len(chunks):
-            write_text(p, chunks[i - 1].rstrip() + "\n")
+        fname = exercise_file_name(date_str, i)
+        if i in written or i in dropped:
+            continue
+        if i <= len(chunks) and chunks[i - 1]:
+            items.append((fname, chunks[i - 1].rstrip() + "\n"))
         else:
             skeleton = textwrap.dedent(f"""\
             ### EX{i:02d} — [Titre court façon mission]
@@ -68,9 +201,9 @@ def create_exercise_files(ex_dir: Path, date_str: str, n: int, content: str | No
             - [erreur typique #1]
             - [erreur typique #2]
             """).rstrip() + "\n"
-            write_text(p, skeleton)
-        paths.append(p)
-    return paths
+            items.append((fname, skeleton))
+    write_many(ex_dir, items)
+    return [ex_dir / exercise_file_name(date_str, i) for i in range(1, n + 1) if i not in dropped]
 
 
 def create_launcher_script(ex_dir: Path, topic_slug: str) -> Path:
@@ -102,6 +235,11 @@ def create_launcher_script(ex_dir: Path, topic_slug: str) -> Path:
     echo "[INFO] Ouverture: ${{latest}}"
     {editor} "$latest"
     """).strip() + "\n"
-    write_text(sh, content)
-    sh.chmod(0o755)
+    try:
+        unchanged = sh.read_text(encoding="utf-8") == content
+    except OSError:
+        unchanged = False
+    if not unchanged:  # évite une réécriture (et un aller-retour réseau) à chaque génération
+        write_text(sh, content, mkdir=False)
+        sh.chmod(0o755)
     return sh
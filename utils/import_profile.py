@@ -0,0 +1,63 @@
+"""Chronométrage des imports au démarrage (cli.py --profile-startup)."""
+from __future__ import annotations
+import sys
+import time
+from importlib.abc import MetaPathFinder
+
+
+class _TimedLoader:
+    """Enveloppe un loader : mesure exec_module (temps cumulé et propre) du module."""
+
+    def __init__(self, loader, name: str, profiler: "ImportProfiler") -> None:
+        self._loader, self._name, self._profiler = loader, name, profiler
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module) -> None:
+        prof = self._profiler
+        prof._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            total = time.perf_counter() - start
+            children = prof._stack.pop()
+            if prof._stack:
+                prof._stack[-1] += total
+            prof.timings[self._name] = (total, total - children)
+
+
+class ImportProfiler(MetaPathFinder):
+    def __init__(self) -> None:
+        self.timings: dict[str, tuple[float, float]] = {}  # nom -> (cumulé, propre) en s
+        self._stack: list[float] = []
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, fullname, self)
+        return spec
+
+    def install(self) -> "ImportProfiler":
+        sys.meta_path.insert(0, self)
+        return self
+
+    def uninstall(self) -> None:
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def top(self, limit: int = 25) -> list[tuple[str, float, float]]:
+        """[(module, cumulé_ms, propre_ms)] triés par temps cumulé décroissant."""
+        rows = sorted(self.timings.items(), key=lambda kv: kv[1][0], reverse=True)[:limit]
+        return [(name, cum * 1000, own * 1000) for name, (cum, own) in rows]
@@ -0,0 +1,38 @@
+"""Verrous exclusifs threads + process (flock) sur un fichier de verrou."""
+from __future__ import annotations
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # pas de verrou inter-process hors POSIX
+    fcntl = None
+
+_guard = threading.Lock()
+_thread_locks: dict[Path, threading.Lock] = {}
+
+
+@contextmanager
+def file_lock(path: Path):
+    """Exclusion sur path (créé au besoin) : verrou de thread par chemin, puis flock pour les autres process."""
+    with _guard:
+        tlock = _thread_locks.setdefault(path, threading.Lock())
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tlock, open(path, "a") as lf:
+        if fcntl:
+            fcntl.flock(lf, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lf, fcntl.LOCK_UN)
+
+
+def topic_lock(base: Path, slug: str, kind: str):
+    """
+    Sérialise une phase d'écriture d'un sujet entre threads et process.
+    kind ("cheat", "ex") : fiche et exercices ont chacun leur verrou (un cours écrit les deux en parallèle).
+    À ne prendre qu'autour des écritures disque, jamais pendant un appel LLM.
+    """
+    return file_lock(base / ".pyreto" / "locks" / f"{slug}.{kind}.lock")
@@ -0,0 +1,38 @@
+"""Signatures MinHash (similarité de Jaccard estimée entre textes courts), en Python pur."""
+from __future__ import annotations
+import hashlib
+import random
+import re
+import unicodedata
+
+PERMS = 64  # écart-type de l'estimation ≈ 0.06
+_P = (1 << 61) - 1  # premier de Mersenne : h(x) = (a·x + b) mod P
+_rng = random.Random(0x5EED)  # graine fixe : signatures comparables d'une session à l'autre
+_COEFS = [(_rng.randrange(1, _P), _rng.randrange(0, _P)) for _ in range(PERMS)]
+
+_BOLD = re.compile(r"\*\*[^*\n]+\*\*")  # libellés du gabarit (**Objectif :** …), communs à tous
+_EX_ID = re.compile(r"\bEX\d{2}\b", re.IGNORECASE)
+_WORD = re.compile(r"\w+")
+
+
+def tokens(text: str) -> list[str]:
+    """Mots normalisés (minuscules, sans accents) hors gabarit et numérotation EXnn."""
+    text = _EX_ID.sub(" ", _BOLD.sub(" ", text))
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return _WORD.findall(text)
+
+
+def signature(text: str, k: int = 3) -> list[int]:
+    """MinHash des k-shingles de mots : PERMS minima de hachages indépendants."""
+    words = tokens(text)
+    xs = {
+        int.from_bytes(hashlib.blake2b(" ".join(words[i:i + k]).encode("utf-8"), digest_size=8).digest(), "big")
+        for i in range(max(1, len(words) - k + 1))
+    }
+    return [min((a * x + b) % _P for x in xs) for a, b in _COEFS]
+
+
+def similarity(a: list[int], b: list[int]) -> float:
+    """Estimation de la similarité de Jaccard des ensembles de shingles."""
+    return sum(x == y for x, y in zip(a, b)) / PERMS
@@ -0,0 +1,33 @@
+from rich.panel import Panel
+
+
+class BatchView:
+    _MARKS = {"ok": "[green]✔[/green]", "skip": "[dim]↷[/dim]", "fail": "[red]✘[/red]"}
+
+    def __init__(self, ui):
+        self.ui = ui
+
+    def show_start(self, total: int, jobs: int) -> None:
+        self.ui.console.print(f"[bold]Batch:[/bold] {total} sujet(s), {jobs} worker(s)")
+
+    def show_progress(self, topic: str, status: str) -> None:
+        self.ui.console.print(f" {self._MARKS.get(status, status)} {topic}")
+
+    def show_summary(self, report) -> None:
+        lines = [
+            f"[bold]Générés:[/bold] {len(report.done)}   "
+            f"[bold]Déjà complets:[/bold] {len(report.skipped)}   "
+            f"[bold]Échecs:[/bold] {len(report.failed)}",
+            f"[bold]Durée:[/bold] {report.elapsed:.1f}s   "
+            f"[bold]Débit:[/bold] {report.topics_per_min:.1f} sujets/min",
+            f"[bold]Tokens:[/bold] {report.input_tokens} in (dont {report.cached_tokens} en cache) "
+            f"/ {report.output_tokens} out",
+        ]
+        for topic, err in report.failed.items():
+            lines.append(f"[red]✘ {topic}[/red] — {err}")
+        if report.pending:
+            lines.append(f"[yellow]Interrompu : {len(report.pending)} sujet(s) non traité(s) "
+                         "(relancer la même commande pour reprendre)[/yellow]")
+        title = "📦 Batch interrompu" if report.pending else "📦 Batch terminé"
+        self.ui.console.print(Panel.fit("\n".join(lines), title=title,
+                                        border_style="red" if report.failed or report.pending else "green"))
@@ -0,0 +1,25 @@
+from datetime import datetime
+from rich.panel import Panel
+
+
+class PracticeView:
+    def __init__(self, ui):
+        self.ui = ui
+
+    def show_next(self, slug: str, name: str, due_count: int) -> None:
+        self.ui.console.print(Panel.fit(
+            f"[bold]Sujet:[/bold] {slug}\n[bold]Exercice:[/bold] {name}\n"
+            f"[dim]{due_count} révision(s) en attente[/dim]",
+            title="📚 Révision", border_style="cyan"))
+
+    def show_reviewed(self, card) -> None:
+        when = datetime.fromtimestamp(card.due).strftime("%Y-%m-%d")
+        self.ui.console.print(f"[green]Prochaine révision:[/green] {when} "
+                              f"[dim](intervalle {card.interval} j, EF {card.ef:.2f})[/dim]")
+
+    def show_empty(self, next_due_at: float | None) -> None:
+        if next_due_at is None:
+            self.ui.console.print("[yellow]Aucun exercice à réviser — génère des exercices d'abord.[/yellow]")
+            return
+        when = datetime.fromtimestamp(next_due_at).strftime("%Y-%m-%d %H:%M")
+        self.ui.console.print(f"[green]Rien à réviser maintenant.[/green] Prochaine échéance : {when}")
@@ -11,8 +11,7 @@ from rich import box
 from rich.prompt import Prompt
 from rich.console import Console
 from rich.prompt import IntPrompt, Confirm
-from rich.markdown import Markdown
-from rich.progress import Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
+# Markdown (markdown-it), Live et Progress : importés à la demande dans les méthodes
 
 
 class RichUI:
@@ -23,6 +22,7 @@ class RichUI:
 
     @contextmanager
     def spinner(self, desc: str):
+        from rich.progress import Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
         prog = Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"),
                         TimeElapsedColumn(), transient=True, console=self.console)
         prog.start()
@@ -50,12 +50,15 @@ class RichUI:
     def ask_confirm(self, prompt: str, default: bool = True) -> bool:
         return Confirm.ask(prompt, default=default)
 
+    def ask_choice(self, prompt: str, choices: list[str], default: str | None = None) -> str:
+        return Prompt.ask(prompt, choices=choices, default=default)
+
     def show_menu(self) -> str:
         self.console.clear()
 
         # --- Header
         title = Text("🎓 SYSTÈME D'APPRENTISSAGE — LOI DE PARETO", style="bold cyan")
-        subtitle = Text("Choisis un mode. Astuce: tape un chiffre (1–7) ou 'q' pour quitter.", style="dim")
+        subtitle = Text("Choisis un mode. Astuce: tape un chiffre (1–9) ou 'q' pour quitter.", style="dim")
 
         # --- Grid (3 colonnes, 2 rangées + ligne quitter)
         grid = Table.grid(padding=(0, 2), expand=False)
@@ -73,6 +76,11 @@ class RichUI:
             "[bold]5)[/bold] 📊 Sujets",
             "[bold]6)[/bold] 📅 Planning"
         )
+        grid.add_row(
+            "[bold]8)[/bold] 📈 Stats",
+            "[bold]9)[/bold] 🔎 Recherche",
+            ""
+        )
 
         quit_line = Text("7) ❌ Quitter", style="bold red")
 
@@ -94,12 +102,45 @@ class RichUI:
         self.console.print(Rule(style="dim"))
 
         # --- Saisie (avec alias 'q' -> '7')
-        choices = [str(i) for i in range(1, 8)] + ["q", "Q"]
+        choices = [str(i) for i in range(1, 10)] + ["q", "Q"]
         answer = Prompt.ask("Votre choix", choices=choices, default="7")
 
         if answer.lower() == "q":
             return "7"
         return answer
 
+    def pick_exercise(self, files: list[Path]) -> Path | None:
+        for i, f in enumerate(files, 1):
+            self.console.print(f" {i}) {f.name}")
+        i = self.ask_int("Numéro (0 = aucun)", default=1, minimum=0, maximum=len(files))
+        return files[i - 1] if i else None
+
     def preview_markdown(self, path: Path, limit_chars: int = 2000) -> None:
+        from rich.markdown import Markdown
         self.console.print(Markdown(path.read_text(encoding="utf-8")[:limit_chars]))
+
+    @contextmanager
+    def live_markdown(self, limit_chars: int = 2000):
+        """Aperçu Markdown mis à jour au fil du streaming ; yield une fonction push(delta)."""
+        from rich.live import Live
+        from rich.markdown import Markdown
+        buf: list[str] = []
+        size = 0
+        with Live(Markdown(""), console=self.console, refresh_per_second=8) as live:
+            def push(delta: str) -> None:
+                nonlocal size
+                if size >= limit_chars:
+                    return
+                buf.append(delta[:limit_chars - size])
+                size += len(buf[-1])
+                live.update(Markdown("".join(buf)))
+            yield push
+
+    def show_import_profile(self, rows: list[tuple[str, float, float]]) -> None:
+        table = Table(title="Imports au démarrage", box=box.SIMPLE_HEAVY)
+        table.add_column("Module", style="cyan")
+        table.add_column("Cumulé (ms)", justify="right")
+        table.add_column("Propre (ms)", justify="right")
+        for name, cum, own in rows:
+            table.add_row(name, f"{cum:.1f}", f"{own:.1f}")
+        self.console.print(table)
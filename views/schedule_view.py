@@ -6,7 +6,11 @@ class ScheduleView:
     def __init__(self, ui):
         self.ui = ui
 
-    def show(self, schedule: list[tuple[str, list[str]]], slug: str) -> None:
+    _MARKS = {"pass": " ✔", "fail": " ✘", "skip": " ↷"}
+
+    def show(self, schedule: list[tuple[str, list[str]]], slug: str, last: dict[str, dict] | None = None) -> None:
+        """last = dernière tentative par exercice (cf. attempts_service.last_attempts)."""
+        last = last or {}
         if not schedule:
             self.ui.console.print("[yellow]Aucun planning détecté (pas d'exercices datés).[/yellow]")
             return
@@ -14,5 +18,17 @@ class ScheduleView:
         table.add_column("Date", style="green")
         table.add_column("Exercices")
         for day, names in schedule:
-            table.add_row(day, ", ".join(names))
+            table.add_row(day, ", ".join(
+                n + self._MARKS.get((last.get(n) or {}).get("status"), "") for n in names))
+        self.ui.console.print(table)
+
+    def show_week(self, rows: list[tuple[str, str, list[str]]]) -> None:
+        if not rows:
+            return
+        table = Table(title="Cette semaine (tous sujets)", box=box.MINIMAL_DOUBLE_HEAD)
+        table.add_column("Date", style="green")
+        table.add_column("Sujet", style="cyan")
+        table.add_column("Exercices")
+        for day, slug, names in rows:
+            table.add_row(day, slug, ", ".join(names))
         self.ui.console.print(table)
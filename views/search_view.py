@@ -0,0 +1,39 @@
+from rich.table import Table
+from rich.text import Text
+from rich import box
+from services.search_service import HL_END, HL_START
+
+
+def _highlight(snippet: str) -> Text:
+    """Extrait FTS5 -> Text Rich (pas de markup : le contenu peut contenir des crochets)."""
+    text = Text()
+    for i, part in enumerate(snippet.replace(HL_END, HL_START).split(HL_START)):
+        text.append(part, style="bold yellow" if i % 2 else None)
+    return text
+
+
+class SearchView:
+    _KINDS = {"cheat": "📝", "ex": "💪"}
+
+    def __init__(self, ui):
+        self.ui = ui
+
+    def show_sync(self, stats: dict) -> None:
+        if stats["added"] or stats["updated"] or stats["removed"]:
+            self.ui.console.print(f"[dim]Index: +{stats['added']} ~{stats['updated']} "
+                                  f"-{stats['removed']} ({stats['total']} fichiers)[/dim]")
+
+    def show_results(self, query: str, hits, elapsed_ms: float) -> None:
+        if not hits:
+            self.ui.console.print(f"[yellow]Aucun résultat pour[/yellow] « {query} »")
+            return
+        table = Table(title=f"🔎 « {query} » — {len(hits)} résultat(s) en {elapsed_ms:.1f} ms",
+                      box=box.SIMPLE_HEAVY)
+        table.add_column("#", justify="right")
+        table.add_column("Sujet", style="cyan")
+        table.add_column("Titre", style="bold")
+        table.add_column("Extrait")
+        for i, hit in enumerate(hits, 1):
+            table.add_row(str(i), f"{self._KINDS.get(hit.kind, '')} {hit.topic}",
+                          Text(hit.title), _highlight(hit.snippet))
+        self.ui.console.print(table)
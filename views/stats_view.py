@@ -0,0 +1,47 @@
+from rich.table import Table
+from rich import box
+
+
+def _s(v: float | None) -> str:
+    return f"{v:.2f}" if v is not None else "-"
+
+
+class StatsView:
+    def __init__(self, ui):
+        self.ui = ui
+
+    def show(self, summary: dict[str, dict[str, dict]]) -> None:
+        if not summary["model"]:
+            self.ui.console.print("[yellow]Aucune métrique enregistrée (aucun appel LLM).[/yellow]")
+            return
+        for key, title in (("model", "Par modèle"), ("topic", "Par sujet"), ("lane", "Par voie")):
+            table = Table(title=f"📈 Appels LLM — {title}", box=box.SIMPLE_HEAVY)
+            table.add_column(title.split()[-1].capitalize(), style="cyan")
+            for col in ("Appels", "Err.", "Cache", "p50 (s)", "p95 (s)", "TTFT (s)", "File p95 (s)",
+                        "Tokens in", "dont cache", "Tokens out", "dont raison."):
+                table.add_column(col, justify="right")
+            groups = sorted(summary[key].items(),
+                            key=lambda kv: kv[1]["input_tokens"] + kv[1]["output_tokens"], reverse=True)
+            for name, g in groups:
+                table.add_row(name, str(g["calls"]), str(g["errors"]), f"{g['hit_rate']:.0%}",
+                              _s(g["p50_s"]), _s(g["p95_s"]), _s(g["ttft_p50_s"]), _s(g["queue_p95_s"]),
+                              str(g["input_tokens"]), str(g["cached_tokens"]),
+                              str(g["output_tokens"]), str(g["reasoning_tokens"]))
+            self.ui.console.print(table)
+
+    def show_limiter(self, stats: dict) -> None:
+        quotas = " / ".join(f"{v:g} {k.upper()}" for k, v in (("rpm", stats["rpm"]), ("tpm", stats["tpm"])) if v)
+        table = Table(title=f"🚦 Limiteur de débit (session) — {quotas}", box=box.SIMPLE_HEAVY)
+        table.add_column("Voie", style="cyan")
+        for col in ("En file", "Appels", "Attente p50 (s)", "p95 (s)", "max (s)"):
+            table.add_column(col, justify="right")
+        for lane, s in stats["lanes"].items():
+            table.add_row(lane, str(s["depth"]), str(s["calls"]),
+                          _s(s["wait_p50_s"]), _s(s["wait_p95_s"]), _s(s["wait_max_s"]))
+        self.ui.console.print(table)
+        self.ui.console.print(f"[dim]File la plus longue observée : {stats['max_depth']}[/dim]")
+
+    def show_cache(self, stats: dict) -> None:
+        state = "actif" if stats.get("enabled") else "désactivé"
+        self.ui.console.print(f"[bold]Cache (session):[/bold] {state} — "
+                              f"{stats.get('hits', 0)} hit(s) / {stats.get('misses', 0)} miss")
@@ -6,11 +6,23 @@ class TopicsView:
     def __init__(self, ui):
         self.ui = ui
 
-    def show(self, topics: list[tuple[str, str, str | None]]) -> None:
+    def show(self, topics: list[tuple], rates: dict[str, float | None] | None = None) -> None:
+        """topics = [(slug, cheat, ex_dir | None, meta)] (cf. list_topic_entries) ; rates = taux de réussite."""
+        rates = rates or {}
         table = Table(title="Sujets disponibles", box=box.SIMPLE_HEAVY)
         table.add_column("Topic", style="cyan", no_wrap=True)
         table.add_column("Cheat Sheet", overflow="fold")
         table.add_column("Exercices", overflow="fold")
-        for slug, cheat, ex_dir in topics:
-            table.add_row(slug, cheat, ex_dir or "-")
+        table.add_column("Exos", justify="right")
+        table.add_column("Créé", style="dim")
+        table.add_column("Modèle", style="dim")
+        table.add_column("Réussite", justify="right")
+        for slug, cheat, ex_dir, meta in topics:
+            table.add_row(slug, str(cheat), str(ex_dir) if ex_dir else "-",
+                          str(meta.get("exercises", 0)), (meta.get("created") or "-")[:10],
+                          meta.get("model") or "-", _rate(rates.get(slug)))
         self.ui.console.print(table)
+
+
+def _rate(rate: float | None) -> str:
+    return f"{rate:.0%}" if rate is not None else "-"